@@ -3,7 +3,7 @@ from pydantic import BaseModel
 import logging
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import List, Optional
 
 from chemprop_solvation.solvation_estimator import load_DirectML_Gsolv_estimator, load_DirectML_Hsolv_estimator, load_SoluteML_estimator
 from solvation_predictor.solubility.solubility_calculator import SolubilityCalculations
@@ -80,6 +80,33 @@ def _dHsolv_estimator(req: SolubilityRequest):
         "valid_indices": result[2]
     }
 
+class SolvationBatchRequest(BaseModel):
+    pairs: List[List[str]]  # [solvent_smiles, solute_smiles] pairs
+
+@app.post("/dGsolv_estimator_batch")
+def _dGsolv_estimator_batch(req: SolvationBatchRequest):
+    """
+    Estimate the solvation free energies of all of the solvent-solute pairs with one model invocation
+    """
+    result = dGsolv_estimator([list(pair) for pair in req.pairs])
+    return {
+        "avg_pred": result[0],
+        "epi_unc": result[1],
+        "valid_indices": result[2]
+    }
+
+@app.post("/dHsolv_estimator_batch")
+def _dHsolv_estimator_batch(req: SolvationBatchRequest):
+    """
+    Estimate the solvation enthalpies of all of the solvent-solute pairs with one model invocation
+    """
+    result = dHsolv_estimator([list(pair) for pair in req.pairs])
+    return {
+        "avg_pred": result[0],
+        "epi_unc": result[1],
+        "valid_indices": result[2]
+    }
+
 @app.post("/SoluteML_estimator")
 def _SoluteML_estimator(req: SolubilityRequest):
     result = SoluteML_estimator([[req.solute_smiles]])
@@ -66,6 +66,23 @@ def test_SoluteML_estimator_success():
     assert "valid_indices" in data
 
 
+def test_solvation_estimator_batch_success():
+    payload = {
+        "pairs": [[TEST_SOLVENT, TEST_SOLUTE], ["O", TEST_SOLUTE]]
+    }
+
+    for name in ["dGsolv", "dHsolv"]:
+        response = requests.post(f"{BASE_URL}/{name}_estimator_batch", json=payload)
+
+        assert response.status_code == 200
+
+        data = response.json()
+        single = requests.post(f"{BASE_URL}/{name}_estimator",
+                               json={"solvent_smiles": TEST_SOLVENT, "solute_smiles": TEST_SOLUTE}).json()
+        assert len(data["avg_pred"]) == 2
+        assert round(data["avg_pred"][0], 6) == round(single["avg_pred"][0], 6)
+
+
 def test_invalid_payload_fails():
     # Sending a bad type (like string instead of float for temperature)
     # should raise a 422 Unprocessable Entity from Pydantic
@@ -83,6 +83,34 @@ class ThermoSearchForm(forms.Form):
             errors_on_separate_row=False)
 
 
+class ThermoCompareForm(forms.Form):
+    """
+    This form provides a means of specifying several species, one SMILES
+    string per line, whose thermodynamic data are plotted together.
+    """
+    species = forms.CharField(label="Species SMILES", widget=forms.widgets.Textarea(attrs={'rows': 10, 'cols': 40}))
+
+    # The largest number of species that can be compared at once
+    max_species = 20
+
+    def clean_species(self):
+        """
+        Custom validation for the species field to ensure that each line is
+        a valid SMILES string. Returns the list of SMILES strings.
+        """
+        smiles_list = [line.strip() for line in self.cleaned_data['species'].splitlines() if line.strip()]
+        if not smiles_list:
+            raise forms.ValidationError('No species given.')
+        if len(smiles_list) > self.max_species:
+            raise forms.ValidationError('At most {0:d} species can be compared.'.format(self.max_species))
+        for smiles in smiles_list:
+            try:
+                Molecule().from_smiles(smiles)
+            except Exception:
+                raise forms.ValidationError('Invalid SMILES string "{0}".'.format(smiles))
+        return smiles_list
+
+
 class KineticsSearchForm(forms.Form):
     """
     This form provides a means of specifying a set of reactants to get
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+A management command rendering the image of every molecule and group
+structure in the database into the structure image cache, e.g.::
+
+    python manage.py prerenderstructures --processes 8
+
+The command can be interrupted and run again, which renders only the images
+that are still missing. When it finishes, the manifest of the cache lists
+every image, so pages link to the image files served from
+``settings.STRUCTURE_IMAGE_URL`` instead of rendering them on request.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from rmgweb.database.tools import database
+from rmgweb.main.groupimages import draw_group_images
+from rmgweb.main.imagecache import IMAGE_CONTENT_TYPES, ImageCache, get_image_key, image_cache, \
+                                   render_structure_image
+from rmgweb.main.tools import getItemStructures
+
+# Number of images rendered by a worker process at a time
+RENDER_CHUNK_SIZE = 50
+# Interval in seconds between saves of the manifest while rendering
+MANIFEST_SAVE_INTERVAL = 30
+
+
+def get_databases():
+    """
+    Return a list of every library, depository and group tree in the
+    loaded database.
+    """
+    databases = []
+    for component in [database.thermo, database.transport, database.solvation, database.statmech]:
+        for section in ['depository', 'libraries', 'groups']:
+            databases.extend((getattr(component, section, None) or {}).values())
+    databases.extend(database.kinetics.libraries.values())
+    for family in database.kinetics.families.values():
+        databases.append(family.groups)
+        databases.extend(family.depositories)
+    return databases
+
+
+def collect_structures(databases):
+    """
+    Return a sorted list of the ``(kind, adjlist)`` of every distinct
+    structure drawn for the entries of the given `databases`.
+    """
+    structures = set()
+    for db in databases:
+        for entry in db.entries.values():
+            structures.update(getItemStructures(entry.item))
+    return sorted(structures)
+
+
+def render_images(root, tasks):
+    """
+    Render the images for a list of ``(key, kind, adjlist, format)`` `tasks`
+    into the image cache in directory `root`, in a worker process. Groups
+    are laid out together by :func:`draw_group_images`. Return the keys and
+    paths of the rendered images, and the number of structures that could
+    not be rendered.
+    """
+    cache = ImageCache(root=root, memory_size=0)
+    images = {}
+    for format in IMAGE_CONTENT_TYPES:
+        group_tasks = [task for task in tasks if task[1] == 'group' and task[3] == format]
+        if group_tasks:
+            group_images = draw_group_images([adjlist for key, kind, adjlist, format in group_tasks], format)
+            images.update((task[0], image) for task, image in zip(group_tasks, group_images))
+    rendered = {}
+    failures = 0
+    for key, kind, adjlist, format in tasks:
+        try:
+            data = images[key] if kind == 'group' else render_structure_image(kind, adjlist, format)
+            if isinstance(data, Exception):
+                raise data
+        except Exception:
+            failures += 1
+            continue
+        cache.set(key, format, data)
+        rendered[key] = cache.get_path(key, format)
+    return rendered, failures
+
+
+class Command(BaseCommand):
+    help = 'Render the images of all molecule and group structures in the database into the image cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(),
+                            help='number of worker processes (default: number of cores)')
+        parser.add_argument('--formats', nargs='+', choices=sorted(IMAGE_CONTENT_TYPES),
+                            default=sorted(IMAGE_CONTENT_TYPES), help='image formats to render')
+        parser.add_argument('--chunk-size', type=int, default=RENDER_CHUNK_SIZE,
+                            help='number of images rendered by a worker at a time')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Loading database...')
+        database.load()
+        structures = collect_structures(get_databases())
+        self.stdout.write('Found {0:d} distinct structures.'.format(len(structures)))
+
+        # Images written by an earlier run are kept, so an interrupted run
+        # continues where it stopped
+        manifest = {}
+        tasks = []
+        for kind, adjlist in structures:
+            for format in options['formats']:
+                key = get_image_key(kind, adjlist, format)
+                if image_cache.contains(key, format):
+                    manifest[key] = image_cache.get_path(key, format)
+                else:
+                    tasks.append((key, kind, adjlist, format))
+        self.stdout.write('{0:d} images already rendered, {1:d} to render.'.format(len(manifest), len(tasks)))
+
+        chunk_size = max(1, options['chunk_size'])
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        failures = 0
+        done = 0
+        last_save = time.time()
+        with ProcessPoolExecutor(max_workers=max(1, options['processes']),
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = [pool.submit(render_images, image_cache.root, chunk) for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    rendered, chunk_failures = future.result()
+                    manifest.update(rendered)
+                    failures += chunk_failures
+                    done += 1
+                    if time.time() - last_save >= MANIFEST_SAVE_INTERVAL:
+                        image_cache.write_manifest(manifest)
+                        last_save = time.time()
+                        self.stdout.write('Rendered {0:d} of {1:d} chunks.'.format(done, len(chunks)))
+            finally:
+                # Save the progress so far, even if interrupted
+                for future in futures:
+                    future.cancel()
+                image_cache.write_manifest(manifest)
+
+        self.stdout.write(self.style.SUCCESS('Wrote manifest of {0:d} images to {1}; {2:d} structures '
+                                             'could not be rendered.'.format(len(manifest), image_cache.root,
+                                                                              failures)))
@@ -0,0 +1,664 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the index of the species in the loaded database
+libraries that is used for structure searches across the whole database,
+and the index of entry and species labels used to autocomplete identifiers.
+"""
+
+import bisect
+import logging
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from rdkit.Chem import AllChem
+from rmgpy.molecule import Group, Molecule
+from rmgpy.species import Species
+
+from rmgweb.database.tools import database, get_species_key
+
+logger = logging.getLogger(__name__)
+
+# Sections of the database whose species are searched
+SEARCH_SECTIONS = [
+    ('thermo', 'libraries'),
+    ('thermo', 'depository'),
+    ('transport', 'libraries'),
+    ('kinetics', 'libraries'),
+]
+
+# Sections of the database whose entry and species labels are autocompleted
+LABEL_SECTIONS = [
+    ('thermo', 'libraries'),
+    ('transport', 'libraries'),
+    ('solvation', 'libraries'),
+    ('kinetics', 'libraries'),
+]
+
+# Number of bits in the fingerprints used to prefilter substructure searches
+FINGERPRINT_BITS = 512
+# Number of bits in the fingerprints used for similarity searches
+SIMILARITY_BITS = 1024
+# Components whose species are included in similarity searches
+SIMILARITY_COMPONENTS = ('thermo', 'transport')
+# Default number of species per page of search results
+SEARCH_PAGE_SIZE = 50
+# Number of prefiltered species checked for isomorphism at a time
+SEARCH_BATCH_SIZE = 512
+# Smallest batch worth sending to the process pool
+SEARCH_POOL_THRESHOLD = 64
+# Number of worker processes used to check for subgraph isomorphism
+SEARCH_PROCESSES = max(1, min(4, multiprocessing.cpu_count() - 1))
+
+# Number of set bits in each possible byte
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], np.uint8)
+
+# Two letter element symbols used as atom type labels
+TWO_LETTER_ELEMENTS = ('Cl', 'Si', 'Br', 'Li', 'Ar', 'He', 'Ne')
+
+
+def get_atomtype_element(label):
+    """
+    Return the element symbol of the atom type with the given `label`, or
+    ``None`` if the atom type matches more than one element.
+    """
+    if label.startswith(('R', 'Val')):
+        return None
+    for symbol in TWO_LETTER_ELEMENTS:
+        if label.startswith(symbol):
+            return symbol
+    return label[0]
+
+
+def get_features(atoms, bonds):
+    """
+    Return the set of structural features for the given atoms and bonds,
+    each given as tuples of ``(element, radical)`` and ``(element1, element2,
+    order)``. Elements may be ``None`` if unknown, in which case the atom or
+    bond does not contribute features. Orders are doubled bond orders.
+    """
+    features = set()
+    counts = {}
+    for element, radical in atoms:
+        if element is None:
+            continue
+        counts[element] = counts.get(element, 0) + 1
+        features.add(('atom', element, counts[element]))
+        if radical:
+            features.add(('radical', element))
+    counts = {}
+    for element1, element2, order in bonds:
+        if element1 is None or element2 is None or order is None:
+            continue
+        key = tuple(sorted([element1, element2])) + (order,)
+        counts[key] = counts.get(key, 0) + 1
+        features.add(('bond',) + key + (min(counts[key], 4),))
+    return features
+
+
+def get_molecule_features(molecule):
+    """
+    Return the set of structural features of a :class:`Molecule`.
+    """
+    atoms = [(atom.element.symbol, atom.radical_electrons > 0) for atom in molecule.atoms]
+    bonds = [(bond.vertex1.element.symbol, bond.vertex2.element.symbol, int(round(2 * bond.order)))
+             for bond in molecule.get_all_edges()]
+    return get_features(atoms, bonds)
+
+
+def get_group_features(group):
+    """
+    Return the set of structural features that every molecule containing the
+    :class:`Group` `group` must have.
+    """
+    elements = {}
+    atoms = []
+    for atom in group.atoms:
+        symbols = set(get_atomtype_element(atomtype.label) for atomtype in atom.atomtype)
+        elements[atom] = symbols.pop() if len(symbols) == 1 else None
+        radical = len(atom.radical_electrons) > 0 and min(atom.radical_electrons) > 0
+        atoms.append((elements[atom], radical))
+    bonds = []
+    for bond in group.get_all_edges():
+        order = int(round(2 * bond.order[0])) if len(bond.order) == 1 else None
+        bonds.append((elements[bond.vertex1], elements[bond.vertex2], order))
+    return get_features(atoms, bonds)
+
+
+def get_fingerprint(features):
+    """
+    Return the fingerprint of a set of `features` as an array of bytes, in
+    which each feature sets one bit.
+    """
+    bits = np.zeros(FINGERPRINT_BITS, np.uint8)
+    for feature in features:
+        bits[zlib.crc32(repr(feature).encode('utf-8')) % FINGERPRINT_BITS] = 1
+    return np.packbits(bits)
+
+
+def get_similarity_fingerprint(molecule):
+    """
+    Return the Morgan (ECFP4-like) fingerprint of a :class:`Molecule` as an
+    array of bytes. The fingerprint is empty if it cannot be generated.
+    """
+    try:
+        fingerprint = AllChem.GetMorganFingerprintAsBitVect(molecule.to_rdkit_mol(), 2, nBits=SIMILARITY_BITS)
+    except Exception:
+        return np.zeros(SIMILARITY_BITS // 8, np.uint8)
+    bits = np.frombuffer(fingerprint.ToBitString().encode('ascii'), np.uint8) - ord('0')
+    return np.packbits(bits)
+
+
+def popcount(array):
+    """
+    Return the number of set bits in each row of a 2D array of bytes.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(array).sum(axis=1, dtype=np.int32)
+    return POPCOUNT[array].sum(axis=1, dtype=np.int32)
+
+
+class SpeciesRecord(object):
+    """
+    A species in the search index, along with the library and depository
+    entries that it appears in. Each of the `sources` is a tuple of
+    ``(component, section, subsection, index, label)`` for an entry.
+    """
+
+    def __init__(self, label, molecule, key, sources=None):
+        self.label = label
+        self.molecule = molecule
+        self.key = key
+        self.sources = sources or []
+        fingerprint = np.zeros(FINGERPRINT_BITS // 8, np.uint8)
+        for mol in molecule:
+            fingerprint |= get_fingerprint(get_molecule_features(mol))
+        self.fingerprint = fingerprint
+        # Shared with copies of the record, so that fingerprints generated
+        # for a merged record are kept when the index is merged again
+        self._fingerprints = {}
+
+    @property
+    def similarity_fingerprint(self):
+        """
+        The similarity fingerprint of the species, generated when first used.
+        """
+        if 'similarity' not in self._fingerprints:
+            self._fingerprints['similarity'] = get_similarity_fingerprint(self.molecule[0])
+        return self._fingerprints['similarity']
+
+    def copy(self):
+        """
+        Return a copy of the record with its own list of sources.
+        """
+        other = SpeciesRecord.__new__(SpeciesRecord)
+        other.__dict__.update(self.__dict__)
+        other.sources = list(self.sources)
+        return other
+
+
+def collect_species(component, section):
+    """
+    Return a list of :class:`SpeciesRecord` objects for the species in one
+    `section` of a database `component`, which must already be loaded.
+    """
+    records = []
+    if component == 'kinetics':
+        for subsection, library in database.kinetics.libraries.items():
+            seen = {}
+            for entry in library.entries.values():
+                for species in entry.item.reactants + entry.item.products:
+                    if id(species) in seen:
+                        record = seen[id(species)]
+                    else:
+                        record = SpeciesRecord(species.label, species.molecule, get_species_key(species))
+                        seen[id(species)] = record
+                        records.append(record)
+                    source = (component, section, subsection, entry.index, entry.label)
+                    if source not in record.sources:
+                        record.sources.append(source)
+    else:
+        databases = {
+            ('thermo', 'libraries'): database.thermo.libraries,
+            ('thermo', 'depository'): database.thermo.depository,
+            ('transport', 'libraries'): database.transport.libraries,
+        }[(component, section)]
+        for subsection, library in databases.items():
+            for entry in library.entries.values():
+                if isinstance(entry.item, Molecule):
+                    source = (component, section, subsection, entry.index, entry.label)
+                    records.append(SpeciesRecord(entry.label, [entry.item], get_species_key(entry.item), [source]))
+    return records
+
+
+def match_substructure(group, records, positions):
+    """
+    Return the `positions` in the list of `records` of the species that
+    contain the :class:`Group` `group`.
+    """
+    return [position for position in positions
+            if any(molecule.is_subgraph_isomorphic(group) for molecule in records[position].molecule)]
+
+
+# The version of the index and the molecules of each of its records, as
+# given to a worker process of the index when it was started
+_worker_molecules = (None, [])
+
+
+def _init_worker(version, molecules):
+    """
+    Store the `molecules` of each record in the given `version` of the index
+    in a newly started worker process of the index.
+    """
+    global _worker_molecules
+    _worker_molecules = (version, molecules)
+
+
+def _match_substructure(version, group_adjlist, positions):
+    """
+    Return the `positions` of the species containing the group with the
+    adjacency list `group_adjlist` in a worker process of the index, using
+    the molecules the worker was started with. `version` must match the
+    version of those molecules.
+    """
+    worker_version, molecules = _worker_molecules
+    if worker_version != version:
+        raise ValueError('Species index has changed since the search started.')
+    group = Group().from_adjacency_list(group_adjlist)
+    return [position for position in positions
+            if any(molecule.is_subgraph_isomorphic(group) for molecule in molecules[position])]
+
+
+class SpeciesSearchIndex(object):
+    """
+    An index of the unique species in the libraries and depositories listed
+    in :data:`SEARCH_SECTIONS`. Each section is collected separately and only
+    collected again when it is reloaded; species appearing in several
+    sections are then merged into a single record.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.parts = {}
+        self.records = []
+        self.fingerprints = np.zeros((0, FINGERPRINT_BITS // 8), np.uint8)
+        self.version = 0
+        self.similarity = None
+        self.pool = None
+        self.warming = None
+        self.warming_lock = threading.Lock()
+
+    def update(self, sections=None):
+        """
+        Load the searched `sections` of the database (by default, all of
+        them) if necessary and bring the index up to date with them.
+        """
+        with self.lock:
+            changed = False
+            for component, section in (sections or SEARCH_SECTIONS):
+                database.load(component, section)
+                token = database.get_section_token(component, section)
+                part = self.parts.get((component, section))
+                if part is None or part[0] != token:
+                    logger.info('Indexing species in {0} {1} for searching'.format(component, section))
+                    self.parts[(component, section)] = (token, collect_species(component, section))
+                    changed = True
+            if changed:
+                self.merge()
+
+    def is_current(self, sections=None):
+        """
+        Return ``True`` if the index is up to date with the searched
+        `sections` of the database (by default, all of them) as currently
+        loaded and its similarity fingerprints have been generated. This never
+        waits for the index, and is ``False`` while it is being updated.
+        """
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            for component, section in (sections or SEARCH_SECTIONS):
+                part = self.parts.get((component, section))
+                if part is None or part[0] != database.get_section_token(component, section):
+                    return False
+            return self.similarity is not None
+        finally:
+            self.lock.release()
+
+    def warm(self, sections=None):
+        """
+        Bring the index up to date with the searched `sections` of the
+        database (by default, all of them) and generate its similarity
+        fingerprints in a background thread, unless this is already being
+        done.
+        """
+        def run():
+            try:
+                self.update(sections)
+                self.get_similarity_arrays()
+            except Exception:
+                logger.exception('Unable to update the species search index.')
+
+        with self.warming_lock:
+            if self.warming is None or not self.warming.is_alive():
+                self.warming = threading.Thread(target=run, daemon=True)
+                self.warming.start()
+
+    def merge(self):
+        """
+        Merge the records of all sections, combining records for the same
+        species, and rebuild the fingerprint array.
+        """
+        buckets = {}
+        records = []
+        for component, section in SEARCH_SECTIONS:
+            if (component, section) not in self.parts:
+                continue
+            for record in self.parts[(component, section)][1]:
+                for other in buckets.get(record.key, []):
+                    if other.molecule[0].is_isomorphic(record.molecule[0]):
+                        other.sources.extend(record.sources)
+                        other.fingerprint = other.fingerprint | record.fingerprint
+                        break
+                else:
+                    record = record.copy()
+                    buckets.setdefault(record.key, []).append(record)
+                    records.append(record)
+
+        fingerprints = np.zeros((len(records), FINGERPRINT_BITS // 8), np.uint8)
+        for i, record in enumerate(records):
+            fingerprints[i] = record.fingerprint
+        self.records = records
+        self.fingerprints = fingerprints
+        self.similarity = None
+        self.version += 1
+        # Worker processes hold a copy of the old records, so start new ones
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def get_pool(self):
+        """
+        Return the pool of worker processes used to check for subgraph
+        isomorphism, starting it if necessary. The workers are started by a
+        fork server rather than forked from the (threaded) web server, and
+        are sent the molecules of the current records when they start.
+        """
+        with self.lock:
+            if self.pool is None:
+                molecules = [record.molecule for record in self.records]
+                self.pool = ProcessPoolExecutor(max_workers=SEARCH_PROCESSES,
+                                                mp_context=multiprocessing.get_context('forkserver'),
+                                                initializer=_init_worker, initargs=(self.version, molecules))
+            return self.pool
+
+    def match_substructure(self, group, version, records, positions):
+        """
+        Return the `positions` in `records`, which is the given `version` of
+        the index, of the species containing the :class:`Group` `group`.
+        Large batches are checked in the process pool.
+        """
+        positions = [int(position) for position in positions]
+        if len(positions) >= SEARCH_POOL_THRESHOLD and SEARCH_PROCESSES > 1:
+            group_adjlist = group.to_adjacency_list()
+            chunk_size = -(-len(positions) // SEARCH_PROCESSES)
+            chunks = [positions[i:i + chunk_size] for i in range(0, len(positions), chunk_size)]
+            pool = None
+            try:
+                pool = self.get_pool()
+                futures = [pool.submit(_match_substructure, version, group_adjlist, chunk) for chunk in chunks]
+                return [position for future in futures for position in future.result()]
+            except Exception:
+                logger.warning('Substructure search in worker processes failed; searching serially.')
+                with self.lock:
+                    if pool is not None and self.pool is pool:
+                        self.pool = None
+                        pool.shutdown(wait=False)
+        return match_substructure(group, records, positions)
+
+    def substructure_search(self, group, cursor=0, limit=SEARCH_PAGE_SIZE):
+        """
+        Return a page of the species containing the :class:`Group` `group` as
+        a tuple ``(records, next_cursor, candidates)``. The page holds at most
+        `limit` species starting from position `cursor` in the index, and
+        `next_cursor` is the position to continue from or ``None`` on the last
+        page. `candidates` is the number of species that passed the
+        fingerprint prefilter.
+        """
+        self.update()
+        with self.lock:
+            version, records, fingerprints = self.version, self.records, self.fingerprints
+
+        query = get_fingerprint(get_group_features(group))
+        candidates = np.flatnonzero(np.all((fingerprints & query) == query, axis=1))
+
+        matches = []
+        start = int(np.searchsorted(candidates, cursor))
+        while start < len(candidates) and len(matches) <= limit:
+            batch = candidates[start:start + SEARCH_BATCH_SIZE]
+            matches.extend(self.match_substructure(group, version, records, batch))
+            start += len(batch)
+
+        if len(matches) > limit:
+            next_cursor = matches[limit]
+            matches = matches[:limit]
+        else:
+            next_cursor = None
+        return [records[position] for position in matches], next_cursor, len(candidates)
+
+    def get_similarity_arrays(self):
+        """
+        Return the positions in the index of the species with thermo or
+        transport data, along with their similarity fingerprints as a 2D array
+        of bytes and the number of bits set in each fingerprint.
+        """
+        with self.lock:
+            if self.similarity is None:
+                positions = [i for i, record in enumerate(self.records)
+                             if any(source[0] in SIMILARITY_COMPONENTS for source in record.sources)]
+                fingerprints = np.zeros((len(positions), SIMILARITY_BITS // 8), np.uint8)
+                for i, position in enumerate(positions):
+                    fingerprints[i] = self.records[position].similarity_fingerprint
+                self.similarity = (self.records, np.array(positions, np.int64), fingerprints, popcount(fingerprints))
+            return self.similarity
+
+    def similarity_search(self, molecule, limit=10, wait=True):
+        """
+        Return the `limit` species with thermo or transport data that are most
+        similar to the :class:`Molecule` `molecule`, as a list of tuples of
+        ``(record, similarity)`` in order of decreasing Tanimoto similarity.
+        Unless `wait` is ``True``, ``None`` is returned at once if the index is
+        not up to date, and the index is updated in the background instead.
+        """
+        sections = [section for section in SEARCH_SECTIONS if section[0] in SIMILARITY_COMPONENTS]
+        if wait:
+            self.update(sections)
+        elif not self.is_current(sections):
+            self.warm(sections)
+            return None
+        records, positions, fingerprints, counts = self.get_similarity_arrays()
+        if len(positions) == 0:
+            return []
+
+        query = get_similarity_fingerprint(molecule)
+        common = popcount(fingerprints & query)
+        union = counts + int(POPCOUNT[query].sum()) - common
+        similarity = np.where(union > 0, common / np.maximum(union, 1), 0.0)
+
+        limit = min(limit, len(positions))
+        best = np.argpartition(-similarity, limit - 1)[:limit]
+        best = best[np.argsort(-similarity[best], kind='stable')]
+        return [(records[positions[i]], float(similarity[i])) for i in best]
+
+
+species_index = SpeciesSearchIndex()
+
+
+def get_label_molecule(item):
+    """
+    Return a :class:`Molecule` for the item of a library entry, which may be
+    a molecule, a species or a list of them, or ``None`` if it has none.
+    """
+    if isinstance(item, list):
+        item = item[0] if item else None
+    if isinstance(item, Species):
+        item = item.molecule[0] if item.molecule else None
+    return item if isinstance(item, Molecule) else None
+
+
+def collect_labels(component, section):
+    """
+    Return a dictionary mapping each entry or species label in one `section`
+    of a database `component`, which must already be loaded, to a list of
+    ``[count, molecule]``, where `count` is the number of entries using it.
+    """
+    labels = {}
+
+    def add(label, molecule):
+        if not label or molecule is None:
+            return
+        if label in labels:
+            labels[label][0] += 1
+        else:
+            labels[label] = [1, molecule]
+
+    if component == 'kinetics':
+        for library in database.kinetics.libraries.values():
+            for entry in library.entries.values():
+                for species in entry.item.reactants + entry.item.products:
+                    add(species.label, get_label_molecule(species))
+    else:
+        databases = {
+            ('thermo', 'libraries'): database.thermo.libraries,
+            ('transport', 'libraries'): database.transport.libraries,
+            ('solvation', 'libraries'): database.solvation.libraries,
+        }[(component, section)]
+        for library in databases.values():
+            for entry in library.entries.values():
+                add(entry.label, get_label_molecule(entry.item))
+    return labels
+
+
+class LabelIndex(object):
+    """
+    A sorted index of the entry labels in the thermo, transport and solvation
+    libraries and the species labels in the kinetics libraries, used to
+    autocomplete species identifiers. Each section is collected separately
+    and only collected again when it is reloaded.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.parts = {}
+        self.keys = []
+        self.labels = []
+        self.molecules = []
+        self.counts = np.zeros(0, np.int64)
+        self.lengths = np.zeros(0, np.int64)
+        self.adjlists = []
+
+    def update(self):
+        """
+        Bring the index up to date with the loaded database. Sections are only
+        loaded here if they have never been indexed, so that autocompleting
+        does not have to check the database files for changes; sections
+        reloaded by other views are picked up by their changed tokens.
+        """
+        with self.lock:
+            changed = False
+            for component, section in LABEL_SECTIONS:
+                part = self.parts.get((component, section))
+                if part is None:
+                    database.load(component, section)
+                token = database.get_section_token(component, section)
+                if part is None or part[0] != token:
+                    logger.info('Indexing labels in {0} {1} for autocompletion'.format(component, section))
+                    self.parts[(component, section)] = (token, collect_labels(component, section))
+                    changed = True
+            if changed:
+                self.merge()
+
+    def merge(self):
+        """
+        Merge the labels of all sections and rebuild the sorted arrays. A label
+        used in several sections keeps the structure from the first of them.
+        """
+        merged = {}
+        for component, section in LABEL_SECTIONS:
+            for label, (count, molecule) in self.parts[(component, section)][1].items():
+                if label in merged:
+                    merged[label][0] += count
+                else:
+                    merged[label] = [count, molecule]
+
+        labels = sorted(merged, key=lambda label: (label.lower(), label))
+        self.keys = [label.lower() for label in labels]
+        self.labels = labels
+        self.molecules = [merged[label][1] for label in labels]
+        self.counts = np.array([merged[label][0] for label in labels], np.int64)
+        self.lengths = np.array([len(label) for label in labels], np.int64)
+        # Adjacency lists are only generated for labels that are returned
+        self.adjlists = [None] * len(labels)
+
+    def complete(self, prefix, limit=10):
+        """
+        Return the `limit` best matches for the case-insensitive label
+        `prefix` as a list of tuples of ``(label, adjlist, count)``. An exact
+        match comes first, followed by the labels used by the most entries,
+        then by the shortest and then alphabetically.
+        """
+        self.update()
+        with self.lock:
+            keys, labels, molecules, adjlists = self.keys, self.labels, self.molecules, self.adjlists
+            counts, lengths = self.counts, self.lengths
+
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        start = bisect.bisect_left(keys, prefix)
+        stop = bisect.bisect_left(keys, prefix + '\uffff', start)
+        if start == stop:
+            return []
+
+        inexact = lengths[start:stop] != len(prefix)
+        order = np.lexsort((np.arange(start, stop), lengths[start:stop], -counts[start:stop], inexact))
+        results = []
+        for i in order[:limit]:
+            position = start + int(i)
+            if adjlists[position] is None:
+                adjlists[position] = molecules[position].to_adjacency_list()
+            results.append((labels[position], adjlists[position], int(counts[position])))
+        return results
+
+
+label_index = LabelIndex()
@@ -33,30 +33,55 @@ This module contains additional classes and functions used by the database
 app that don't belong to any other module.
 """
 
+import base64
+import bisect
+import hashlib
+import itertools
+import json
 import logging
 import os
 import socket
 import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from copy import deepcopy
 
 import openbabel as ob
 from openbabel import pybel
 import xlrd
+from rmgpy.chemkin import write_thermo_entry
 from rmgpy.data.base import Entry
 from rmgpy.data.kinetics import KineticsDatabase, TemplateReaction
-from rmgpy.data.kinetics.depository import DepositoryReaction
+from rmgpy.data.kinetics.depository import DepositoryReaction, KineticsDepository
 from rmgpy.data.rmg import RMGDatabase, SolvationDatabase, StatmechDatabase
-from rmgpy.data.thermo import ThermoDatabase
+from rmgpy.data.thermo import ThermoDatabase, find_cp0_and_cpinf
 from rmgpy.data.transport import TransportDatabase
 from rmgpy.kinetics import Arrhenius
 from rmgpy.kinetics.model import KineticsModel
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.species import Species
-from rmgpy.reaction import same_species_lists
+from rmgpy.reaction import Reaction, same_species_lists
+from rmgpy.thermo import NASA
 
 import rmgweb.settings
+from rmgweb.main.imagecache import get_image_key, image_cache
+from rmgweb.main.tools import getItemStructures, getStructureInfo
 
 logger = logging.getLogger(__name__)
 
+# Default and maximum number of rows per page of a database table
+TABLE_PAGE_SIZE = 50
+TABLE_MAX_PAGE_SIZE = 500
+# Columns that database tables can be sorted by
+TABLE_SORT_FIELDS = ('index', 'label', 'dataFormat')
+# Number of Chemkin NASA polynomial strings kept in memory
+NASA_STRING_CACHE_SIZE = 1000
+# Interval in seconds between checks for modified files in each database
+# directory
+DATABASE_CHECK_INTERVAL = 60
+
 
 class RMGWebDatabase(object):
     """Wrapper class for RMGDatabase that provides loading functionality."""
@@ -72,6 +97,33 @@ class RMGWebDatabase(object):
             os.path.join(rmgweb.settings.DATABASE_PATH, 'forbiddenStructures.py')
             )
         self.timestamps = {}
+        # The time each directory was last found to be up to date
+        self.dir_checked = {}
+        self._generation = None
+        self._section_tokens = {}
+        # The most recently used Chemkin NASA polynomial strings for thermo
+        # entries, keyed by (section, subsection, index); cleared when
+        # thermo is reloaded
+        self.nasa_strings = OrderedDict()
+        self._nasa_strings_lock = threading.Lock()
+        # Depositories of unique reactions without training data, keyed by
+        # family label; rebuilt whenever the kinetics families are reloaded
+        self.untrained_reactions = {}
+        # Maps from entry index to entry for each database component, which
+        # are dropped along with the component when it is reloaded
+        self.entry_indices = weakref.WeakKeyDictionary()
+        # Maps from species key to library and depository entries, keyed by
+        # (component, section); each is rebuilt when its section is reloaded
+        self.species_index = {}
+        # Maps from molecular formula to the same entries, for matching
+        # species that differ only in electronic state
+        self.formula_index = {}
+        # Maps from the species keys of either side of a reaction to kinetics
+        # library and depository entries, keyed by section
+        self.reaction_index = {}
+        # Maps from the id of the items of library and depository entries to
+        # their structure markup, keyed by (component, section)
+        self.structure_info = {}
 
     @property
     def kinetics(self):
@@ -108,12 +160,48 @@ class RMGWebDatabase(object):
         """
         return self.database.solvation
 
+    @property
+    def generation(self):
+        """
+        Get a short token identifying the currently loaded version of the
+        database. The token changes whenever any part of the database is
+        (re)loaded from disk, and is the same in every process that has loaded
+        the same files, so it can be used in keys for shared caches.
+        """
+        if self._generation is None:
+            digest = hashlib.md5(repr(sorted(self.timestamps.items())).encode('utf-8'))
+            self._generation = digest.hexdigest()[:12]
+        return self._generation
+
+    def get_section_token(self, component, section):
+        """
+        Get a short token identifying the currently loaded version of one
+        `section` of a database `component`, which changes only when the
+        files of that section are (re)loaded.
+        """
+        dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, component, section)
+        if dirpath not in self._section_tokens:
+            timestamps = sorted(item for item in self.timestamps.items() if item[0].startswith(dirpath + os.sep))
+            digest = hashlib.md5(repr(timestamps).encode('utf-8'))
+            self._section_tokens[dirpath] = digest.hexdigest()[:12]
+        return self._section_tokens[dirpath]
+
+    def cache_key(self, *parts):
+        """
+        Return a key for the Django cache that identifies the given `parts`
+        within the currently loaded version of the database.
+        """
+        key = ':'.join(str(part) for part in parts)
+        return 'rmgweb:{0}:{1}'.format(self.generation, hashlib.md5(key.encode('utf-8')).hexdigest())
+
     def reset_timestamp(self, path):
         """
         Reset the files timestamp in the dictionary of timestamps.
         """
         mtime = os.stat(path).st_mtime
         self.timestamps[path] = mtime
+        self._generation = None
+        self._section_tokens.clear()
 
     def reset_dir_timestamps(self, dirpath):
         """
@@ -123,6 +211,7 @@ class RMGWebDatabase(object):
         for root, dirs, files in os.walk(dirpath):
             for name in files:
                 self.reset_timestamp(os.path.join(root, name))
+        self.dir_checked[dirpath] = time.time()
 
     def is_file_modified(self, path):
         """
@@ -151,7 +240,12 @@ class RMGWebDatabase(object):
     def is_dir_modified(self, dirpath):
         """
         Returns True if anything in the directory at dirpath has been modified since reset_dir_timestamps(dirpath).
+        The directory is only walked if it was last found to be up to date over
+        ``DATABASE_CHECK_INTERVAL`` seconds ago, so a modification may go unnoticed for that long.
         """
+        checked = self.dir_checked.get(dirpath)
+        if checked is not None and time.time() - checked < DATABASE_CHECK_INTERVAL:
+            return False
         to_check = set([path for path in self.timestamps if path.startswith(dirpath)])
         for root, dirs, files in os.walk(dirpath):
             for name in files:
@@ -164,6 +258,7 @@ class RMGWebDatabase(object):
             if self.is_file_modified(path):
                 return True
         # Passed all tests.
+        self.dir_checked[dirpath] = time.time()
         return False
 
     ################################################################################
@@ -177,6 +272,9 @@ class RMGWebDatabase(object):
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', 'depository')
                 if self.is_dir_modified(dirpath):
                     self.database.thermo.load_depository(dirpath)
+                    self.nasa_strings.clear()
+                    self.index_species('thermo', 'depository', self.database.thermo.depository)
+                    self.index_structures('thermo', 'depository', self.database.thermo.depository)
                     self.reset_dir_timestamps(dirpath)
             if section in ['libraries', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', 'libraries')
@@ -196,6 +294,9 @@ class RMGWebDatabase(object):
                         if i not in new_order:
                             new_order.append(i)
                     self.database.thermo.library_order = new_order
+                    self.nasa_strings.clear()
+                    self.index_species('thermo', 'libraries', self.database.thermo.libraries)
+                    self.index_structures('thermo', 'libraries', self.database.thermo.libraries)
                     self.reset_dir_timestamps(dirpath)
             if section in ['groups', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'thermo', 'groups')
@@ -214,6 +315,8 @@ class RMGWebDatabase(object):
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'transport', 'libraries')
                 if self.is_dir_modified(dirpath):
                     self.database.transport.load_libraries(dirpath)
+                    self.index_species('transport', 'libraries', self.database.transport.libraries)
+                    self.index_structures('transport', 'libraries', self.database.transport.libraries)
                     self.reset_dir_timestamps(dirpath)
             if section in ['groups', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'transport', 'groups')
@@ -225,6 +328,7 @@ class RMGWebDatabase(object):
             dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'solvation')
             if self.is_dir_modified(dirpath):
                 self.database.solvation.load(dirpath)
+                self.index_structures('solvation', 'libraries', getattr(self.database.solvation, 'libraries', {}))
                 self.reset_dir_timestamps(dirpath)
 
         if component in ['kinetics', '']:
@@ -232,6 +336,8 @@ class RMGWebDatabase(object):
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'kinetics', 'libraries')
                 if self.is_dir_modified(dirpath):
                     self.database.kinetics.load_libraries(dirpath)
+                    self.index_reactions('libraries', self.database.kinetics.libraries)
+                    self.index_structures('kinetics', 'libraries', self.database.kinetics.libraries)
                     self.reset_dir_timestamps(dirpath)
             if section in ['families', '']:
                 dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'kinetics', 'families')
@@ -251,12 +357,217 @@ class RMGWebDatabase(object):
                         # Filling in rate rules in kinetics families by averaging...
                         family.fill_rules_by_averaging_up()
 
+                    self.untrained_reactions = {}
+                    for label, family in self.database.kinetics.families.items():
+                        try:
+                            self.untrained_reactions[label] = getUntrainedReactions(family)
+                        except ValueError:
+                            # The family is still shown, just without untrained reactions
+                            logger.warning('Unable to find untrained reactions of {0} family.'.format(label),
+                                           exc_info=True)
+                            self.untrained_reactions[label] = None
+
+                    depositories = {depository.label: depository
+                                    for family in self.database.kinetics.families.values()
+                                    for depository in family.depositories}
+                    self.index_reactions('families', depositories)
+                    self.index_structures('kinetics', 'families', depositories)
+
         if component in ['statmech', '']:
             dirpath = os.path.join(rmgweb.settings.DATABASE_PATH, 'statmech')
             if self.is_dir_modified(dirpath):
                 self.database.statmech.load(dirpath)
+                self.index_species('statmech', 'depository', self.database.statmech.depository)
+                self.index_species('statmech', 'libraries', self.database.statmech.libraries)
+                self.index_structures('statmech', 'depository', self.database.statmech.depository)
+                self.index_structures('statmech', 'libraries', self.database.statmech.libraries)
                 self.reset_dir_timestamps(dirpath)
 
+    def index_species(self, component, section, databases):
+        """
+        Build the map from species key to the entries of the `databases` (a
+        dict of database components keyed by subsection label) that make up
+        the given `section` of a database `component`. Only entries whose
+        item is a molecule are indexed.
+        """
+        index = {}
+        formula_index = {}
+        for subsection, db in databases.items():
+            for entry in db.entries.values():
+                if isinstance(entry.item, Molecule):
+                    index.setdefault(get_species_key(entry.item), []).append((subsection, entry))
+                    formula_index.setdefault(entry.item.get_formula(), []).append((subsection, entry))
+        self.species_index[(component, section)] = index
+        self.formula_index[(component, section)] = formula_index
+
+    def index_structures(self, component, section, databases):
+        """
+        Render the structure markup of the items of the entries in the
+        `databases` (a dict of database components keyed by subsection label)
+        that make up the given `section` of a database `component`. For
+        reactions, the markup of each reactant and product is rendered.
+        The image URLs in the markup depend on the manifest of pre-rendered
+        images, so the version of the manifest is kept with the markup.
+        """
+        manifest_version = image_cache.get_manifest_version()
+        index = {}
+        for db in databases.values():
+            for entry in db.entries.values():
+                if isinstance(entry.item, Reaction):
+                    items = entry.item.reactants + entry.item.products
+                elif isinstance(entry.item, (list, tuple)):
+                    items = entry.item
+                else:
+                    items = [entry.item]
+                for item in items:
+                    if id(item) not in index:
+                        structures = [(get_image_key(kind, adjlist, 'svg'), kind, adjlist)
+                                      for kind, adjlist in getItemStructures(item)]
+                        index[id(item)] = (item, getStructureInfo(item), structures, manifest_version)
+        self.structure_info[(component, section)] = index
+
+    def get_structure_info(self, item):
+        """
+        Return the structure markup of `item` (see :func:`getStructureInfo`),
+        which is rendered in advance for the items of library and depository
+        entries and only rendered on request for anything else. Markup
+        rendered before the manifest of pre-rendered images last changed is
+        rendered again, so that it links to the pre-rendered images.
+        """
+        if isinstance(item, Entry):
+            item = item.item
+        for index in self.structure_info.values():
+            cached = index.get(id(item))
+            if cached is not None and cached[0] is item:
+                manifest_version = image_cache.get_manifest_version()
+                if cached[3] != manifest_version:
+                    cached = (item, getStructureInfo(item), cached[2], manifest_version)
+                    index[id(item)] = cached
+                image_cache.add_structures(cached[2])
+                return cached[1]
+        return getStructureInfo(item)
+
+    def get_species_candidates(self, species, component, section, strict=True):
+        """
+        Return the entries in the given `section` of a database `component`
+        that share a species key with any resonance structure of `species`,
+        as a dict of lists keyed by subsection label. If `strict` is
+        ``False``, all entries with the same molecular formula are returned
+        instead, for a non-strict isomorphism check that ignores electrons.
+        The candidates still need to be checked for isomorphism.
+        """
+        if strict:
+            index = self.species_index.get((component, section), {})
+            keys = set(get_species_key(molecule) for molecule in species.molecule)
+        else:
+            index = self.formula_index.get((component, section), {})
+            keys = set(molecule.get_formula() for molecule in species.molecule)
+        candidates = {}
+        for key in keys:
+            for subsection, entry in index.get(key, []):
+                candidates.setdefault(subsection, []).append(entry)
+        return candidates
+
+    def find_species_entries(self, species):
+        """
+        Return a list of ``(component, section, subsection, entry)`` tuples
+        for every indexed library and depository entry whose item is
+        isomorphic to `species`.
+        """
+        results = []
+        for component, section in sorted(self.species_index):
+            candidates = self.get_species_candidates(species, component, section)
+            for subsection in sorted(candidates):
+                for entry in candidates[subsection]:
+                    if species.is_isomorphic(entry.item):
+                        results.append((component, section, subsection, entry))
+        return results
+
+    def index_reactions(self, section, databases):
+        """
+        Build the map from the sorted species keys of the reactants, and of
+        the products, to the entries of the kinetics `databases` (a dict of
+        libraries or depositories keyed by subsection label) in the given
+        `section` of the kinetics database.
+        """
+        index = {}
+        for subsection, db in databases.items():
+            for value in db.entries.values():
+                for entry in (value if isinstance(value, list) else [value]):
+                    reactants_key, products_key = get_reaction_key(entry.item)
+                    index.setdefault(reactants_key, []).append((subsection, entry))
+                    if products_key != reactants_key:
+                        index.setdefault(products_key, []).append((subsection, entry))
+        self.reaction_index[section] = index
+
+    def find_reaction_entries(self, reactants, products=None, sections=None):
+        """
+        Return a list of ``(section, subsection, entry, is_forward)`` tuples
+        for every indexed kinetics library and depository entry for the
+        reaction of the :class:`Species` `reactants` to `products`, in either
+        direction. If `products` is ``None``, all entries with the reactants
+        on one side are returned. The search can be restricted to a list of
+        kinetics database `sections`.
+        """
+        if sections is None:
+            sections = sorted(self.reaction_index)
+        # Resonance structures of the same species may have different keys
+        keys = set(tuple(sorted(combination)) for combination in itertools.product(
+            *[set(get_species_key(molecule) for molecule in species.molecule) for species in reactants]))
+
+        results = []
+        for section in sections:
+            index = self.reaction_index.get(section, {})
+            found = set()
+            for key in keys:
+                for subsection, entry in index.get(key, []):
+                    if id(entry) in found:
+                        continue
+                    reaction = entry.item
+                    if same_species_lists(reaction.reactants, reactants):
+                        is_forward, others = True, reaction.products
+                    elif same_species_lists(reaction.products, reactants):
+                        is_forward, others = False, reaction.reactants
+                    else:
+                        continue
+                    if products is not None and not same_species_lists(others, products):
+                        continue
+                    found.add(id(entry))
+                    results.append((section, subsection, entry, is_forward))
+        return results
+
+    def get_all_thermo_data(self, species):
+        """
+        Return all of the thermo data available for `species` in the same
+        format as :meth:`ThermoDatabase.get_all_thermo_data`, using the
+        formula index to avoid checking every depository and library entry
+        for isomorphism. As in RMG-Py, entries are matched with a non-strict
+        isomorphism check, so entries that differ from `species` only in
+        electronic state are included.
+        """
+        thermo = self.database.thermo
+        thermo_data = [thermo.get_thermo_data_from_groups(species)]
+
+        # Data from depository
+        candidates = self.get_species_candidates(species, 'thermo', 'depository', strict=False)
+        for label in ['stable', 'radical']:
+            for entry in candidates.get(label, []):
+                if any(molecule.is_isomorphic(entry.item, strict=False) for molecule in species.molecule):
+                    thermo_data.append((deepcopy(entry.data), thermo.depository[label], entry))
+
+        # Data from libraries, using the first matching entry of each
+        candidates = self.get_species_candidates(species, 'thermo', 'libraries', strict=False)
+        for label in thermo.library_order:
+            for entry in candidates.get(label, []):
+                if species.is_isomorphic(entry.item, strict=False) and entry.data is not None:
+                    data = deepcopy(entry.data)
+                    find_cp0_and_cpinf(species, data)
+                    data.comment = label
+                    thermo_data.append((data, thermo.libraries[label], entry))
+                    break
+
+        return thermo_data
+
     def get_transport_database(self, section, subsection):
         """
         Return the component of the transport database corresponding to the
@@ -335,6 +646,79 @@ class RMGWebDatabase(object):
 
         return db
 
+    def get_thermo_nasa_string(self, section, subsection, entry):
+        """
+        Return the Chemkin format NASA polynomial for a thermo `entry` in the
+        given `section` and `subsection`. Returns ``None`` if the entry is not
+        a molecule and an empty string if the data could not be fitted, or
+        if the entry links to data that do not exist. The most recently used
+        results are cached until the thermo database is reloaded.
+        """
+        key = (section, subsection, entry.index)
+        with self._nasa_strings_lock:
+            if key in self.nasa_strings:
+                self.nasa_strings.move_to_end(key)
+                return self.nasa_strings[key]
+
+        if not isinstance(entry.item, Molecule):
+            return None
+
+        nasa_string = ''
+        try:
+            thermo = entry.data
+            if isinstance(thermo, str):
+                # Follow the link to the entry holding the data
+                db = self.get_thermo_database(section, subsection)
+                thermo = db.entries[thermo].data
+            species = Species(label=entry.label, molecule=[entry.item])
+            species.generate_resonance_structures()
+            find_cp0_and_cpinf(species, thermo)
+            if isinstance(thermo, NASA):
+                nasa = thermo
+            else:
+                nasa = thermo.to_nasa(Tmin=100.0, Tmax=5000.0, Tint=1000.0)
+            species.thermo = nasa
+            nasa_string = write_thermo_entry(species)
+        except Exception:
+            logger.debug('Could not generate NASA polynomial for thermo/{0}/{1} entry {2}'.format(
+                section, subsection, entry.index))
+
+        with self._nasa_strings_lock:
+            self.nasa_strings[key] = nasa_string
+            while len(self.nasa_strings) > NASA_STRING_CACHE_SIZE:
+                self.nasa_strings.popitem(last=False)
+        return nasa_string
+
+    def _index_entries(self, db):
+        """
+        Build and store the map from index to entry for the database
+        component `db`. Entries whose value in `db.entries` is a list of
+        entries (e.g. averaged rate rules) are included individually.
+        """
+        entries = {}
+        for value in db.entries.values():
+            for entry in (value if isinstance(value, list) else [value]):
+                entries.setdefault(entry.index, entry)
+        self.entry_indices[db] = (len(db.entries), entries)
+        return entries
+
+    def get_entry(self, db, index):
+        """
+        Return the entry with the given integer `index` in the database
+        component `db`, or ``None`` if there is no such entry.
+        """
+        indices = self.entry_indices.get(db)
+        if indices is None or indices[0] != len(db.entries):
+            entries = self._index_entries(db)
+        else:
+            entries = indices[1]
+        entry = entries.get(index)
+        if entry is None or entry.index != index:
+            # Entries may have been added or renumbered in place since the
+            # map was built, so check again with a fresh map
+            entry = self._index_entries(db).get(index)
+        return entry
+
     def get_kinetics_database(self, section, subsection):
         """
         Return the component of the kinetics database corresponding to the
@@ -353,6 +737,10 @@ class RMGWebDatabase(object):
                         db = family.groups
                     elif subsection[1] == 'rules':
                         db = family.rules
+                    elif subsection[1] == 'untrained':
+                        db = self.untrained_reactions[family.label]
+                        if db is None:
+                            raise KeyError(family.label)
                     else:
                         label = '{0}/{1}'.format(family.label, subsection[1])
                         db = next((d for d in family.depositories if d.label == label))
@@ -365,6 +753,159 @@ class RMGWebDatabase(object):
 ################################################################################
 
 
+def get_species_key(species):
+    """
+    Return a hashable key for a :class:`Species` or :class:`Molecule` that is
+    the same for all isomorphic structures (including resonance structures).
+    Different structures may occasionally share a key, so the key should only
+    be used to bucket candidates before an isomorphism check.
+    """
+    molecule = species.molecule[0] if isinstance(species, Species) else species
+    try:
+        return molecule.to_inchi_key(), molecule.multiplicity
+    except Exception:
+        return molecule.get_formula(), molecule.multiplicity
+
+
+def get_reaction_key(reaction):
+    """
+    Return a hashable key for a reaction, built from the keys of its reactants
+    and products in that order. Use ``frozenset(get_reaction_key(reaction))``
+    for a key that does not depend on the direction of the reaction.
+    """
+    return (tuple(sorted(get_species_key(species) for species in reaction.reactants)),
+            tuple(sorted(get_species_key(species) for species in reaction.products)))
+
+
+def getUntrainedReactions(family):
+    """
+    Return a depository containing unique reactions from the depositories of
+    `family` for which no training data exists. Reactions are bucketed by
+    their (direction independent) reaction key, so that isomorphism checks
+    are only needed between reactions sharing a bucket. A :class:`ValueError`
+    is raised if the family has no training depository.
+    """
+    # Load training depository
+    for depository in family.depositories:
+        if 'training' in depository.label:
+            training = depository
+            break
+    else:
+        raise ValueError('Could not find training depository in {0} family.'.format(family.label))
+
+    def find_isomorphic(buckets, key, reaction):
+        for other in buckets.get(key, []):
+            if other.is_isomorphic(reaction):
+                return True
+        return False
+
+    # Load trained reactions
+    trained = {}
+    for entry in training.entries.values():
+        key = frozenset(get_reaction_key(entry.item))
+        if not find_isomorphic(trained, key, entry.item):
+            trained.setdefault(key, []).append(entry.item)
+
+    # Load untrained reactions
+    untrained = {}
+    untrained_reactions = []
+    for depository in family.depositories:
+        if 'training' not in depository.label:
+            for entry in depository.entries.values():
+                key = frozenset(get_reaction_key(entry.item))
+                if find_isomorphic(trained, key, entry.item) or find_isomorphic(untrained, key, entry.item):
+                    continue
+                untrained.setdefault(key, []).append(entry.item)
+                untrained_reactions.append(entry.item)
+
+    # Sort reactions by reactant size
+    untrained_reactions.sort(key=lambda reaction: sum([1 for r in reaction.reactants for a in r.molecule[0].atoms if a.is_non_hydrogen()]))
+
+    # Build entries
+    depository = KineticsDepository(name='{0}/untrained'.format(family.label),
+                                    label='{0}/untrained'.format(family.label))
+    for count, reaction in enumerate(untrained_reactions, 1):
+        depository.entries['{0}'.format(count)] = Entry(
+            item=reaction,
+            index=count,
+            label=str(reaction),
+        )
+
+    return depository
+
+
+def get_table_sort_key(row, sort):
+    """
+    Return the key used to order a table `row` when sorting by the `sort`
+    column. Ties are broken by index and label so that the order is total.
+    """
+    if sort == 'index':
+        return row['index'], row['label']
+    return str(row[sort]).lower(), row['index'], row['label']
+
+
+def encode_table_cursor(key):
+    """
+    Return an opaque cursor string for the sort `key` of the last row of a
+    page, to be passed back when requesting the following page.
+    """
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+
+def decode_table_cursor(cursor):
+    """
+    Return the sort key stored in a cursor made by :func:`encode_table_cursor`.
+    A :class:`ValueError` is raised if the cursor is malformed.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError('Invalid cursor "{0}".'.format(cursor))
+    if not isinstance(key, list):
+        raise ValueError('Invalid cursor "{0}".'.format(cursor))
+    return tuple(key)
+
+
+def get_table_page(rows, sort='index', descending=False, query='', cursor='', limit=TABLE_PAGE_SIZE):
+    """
+    Return one page of a database table as a tuple ``(page, next_cursor,
+    total)``. Each of the `rows` is a dict with at least ``index``, ``label``
+    and ``dataFormat`` keys. Rows whose label or data format do not contain
+    `query` are skipped, the rest are sorted by the `sort` column, and at most
+    `limit` rows following the `cursor` are returned. `next_cursor` is an
+    empty string on the last page and `total` is the number of rows matching
+    the query. A :class:`ValueError` is raised for invalid arguments.
+    """
+    if sort not in TABLE_SORT_FIELDS:
+        raise ValueError('Invalid value "{0}" for sort parameter.'.format(sort))
+    if not 0 < limit <= TABLE_MAX_PAGE_SIZE:
+        raise ValueError('Page size must be between 1 and {0}.'.format(TABLE_MAX_PAGE_SIZE))
+
+    query = query.strip().lower()
+    if query:
+        rows = [row for row in rows if query in str(row['label']).lower() or query in str(row['dataFormat']).lower()]
+    rows = sorted(rows, key=lambda row: get_table_sort_key(row, sort))
+    keys = [get_table_sort_key(row, sort) for row in rows]
+
+    start = 0
+    if cursor:
+        key = decode_table_cursor(cursor)
+        try:
+            if descending:
+                start = len(keys) - bisect.bisect_left(keys, key)
+            else:
+                start = bisect.bisect_right(keys, key)
+        except TypeError:
+            raise ValueError('Invalid cursor "{0}" for sort parameter "{1}".'.format(cursor, sort))
+    if descending:
+        rows.reverse()
+        keys.reverse()
+
+    page = rows[start:start + limit]
+    next_cursor = encode_table_cursor(keys[start + limit - 1]) if start + limit < len(rows) else ''
+    return page, next_cursor, len(rows)
+
+
 def generateSpeciesThermo(species, database):
     """
     Generate the thermodynamics data for a given :class:`Species` object
@@ -44,11 +44,18 @@ urlpatterns = [
     # Load the whole database into memory
     re_path(r'^load/?$', views.load, name='load'),
 
+    # Pages of database tables as JSON
+    re_path(r'^(?P<component>thermo|transport|solvation|statmech|kinetics)/(?P<section>\w+)/(?P<subsection>.+)/table\.json$',
+            views.databaseTable, name='table'),
+
     # Thermodynamics database
     re_path(r'^thermo/$', views.thermo, name='thermo'),
     re_path(r'^thermo/search/$', views.moleculeSearch, name='thermo-search'),
     re_path(r'^thermo/molecule/(?P<adjlist>[\S\s]+)$', views.thermoData, name='thermo-data'),
+    re_path(r'^thermo/compare/$', views.thermoCompare, name='thermo-compare'),
+    re_path(r'^thermo/(?P<section>\w+)/(?P<subsection>.+)/export/$', views.thermoExport, name='thermo-export'),
     re_path(r'^thermo/(?P<section>\w+)/(?P<subsection>.+)/(?P<index>-?\d+)/$', views.thermoEntry, name='thermo-entry'),
+    re_path(r'^thermo/(?P<section>\w+)/(?P<subsection>.+)/(?P<index>-?\d+)/plot\.json$', views.thermoEntryPlotData, name='thermo-plot-data'),
     re_path(r'^thermo/(?P<section>\w+)/(?P<subsection>.+)/(?P<adjlist>[\S\s]+)/new$', views.thermoEntryNew, name='thermo-entry-new'),
     re_path(r'^thermo/(?P<section>\w+)/(?P<subsection>.+)/(?P<index>-?\d+)/edit$', views.thermoEntryEdit, name='thermo-entry-edit'),
     re_path(r'^thermo/(?P<section>\w+)/(?P<subsection>.+)/$', views.thermo, name='thermo'),
@@ -102,18 +109,29 @@ urlpatterns = [
     # Kinetics database
     re_path(r'^kinetics/$', views.kinetics, name='kinetics'),
     re_path(r'^kinetics/search/$', views.kineticsSearch, name='kinetics-search'),
+    re_path(r'^kinetics/lookup/$', views.kineticsLookup, name='kinetics-lookup'),
 
     re_path(r'^kinetics/families/(?P<family>[^/]+)/(?P<type>\w+)/new$', views.kineticsEntryNew, name='kinetics-entry-new'),
     re_path(r'^kinetics/families/(?P<family>[^/]+)/untrained/$', views.kineticsUntrained, name='kinetics-untrained'),
 
+    re_path(r'^kinetics/(?P<section>\w+)/(?P<subsection>.+)/tree\.json$', views.kineticsTree, name='kinetics-tree'),
     re_path(r'^kinetics/(?P<section>\w+)/(?P<subsection>.+)/(?P<index>\d+)/edit$', views.kineticsEntryEdit, name='kinetics-entry-edit'),
     re_path(r'^kinetics/(?P<section>\w+)/(?P<subsection>.+)/(?P<index>-?\d+)/$', views.kineticsEntry, name='kinetics-entry'),
+    re_path(r'^kinetics/(?P<section>\w+)/(?P<subsection>.+)/(?P<index>-?\d+)/plot\.json$', views.kineticsEntryPlotData, name='kinetics-plot-data'),
     re_path(r'^kinetics/(?P<section>\w+)/(?P<subsection>.+)/$', views.kinetics, name='kinetics'),
     re_path(r'^kinetics/(?P<section>\w+)/$', views.kinetics, name='kinetics'),
 
+    # Search the species in the database by structure
+    re_path(r'^search/substructure/$', views.substructureSearch, name='substructure-search'),
+    re_path(r'^search/similarity/$', views.similaritySearch, name='similarity-search'),
+    re_path(r'^search/autocomplete/$', views.autocomplete, name='autocomplete'),
+
     # Molecule Information Page
     re_path(r'^molecule/(?P<adjlist>[\S\s]+)$', views.moleculeEntry, name='molecule-entry'),
 
+    # Library and depository entries for a molecule
+    re_path(r'^appearances/(?P<adjlist>[\S\s]+)$', views.moleculeAppearances, name='molecule-appearances'),
+
     # Group Information Page
     re_path(r'^group/(?P<adjlist>[\S\s]+)$', views.groupEntry, name='group-entry'),
 
@@ -39,7 +39,6 @@ import subprocess
 import urllib
 import pandas as pd
 import numpy as np
-from functools import reduce
 from rdkit import Chem
 import rdkit.Chem.rdmolops as rdmolops
 from CoolProp.CoolProp import PropsSI
@@ -58,7 +57,7 @@ from rmgpy.data.statmech import GroupFrequencies
 from rmgpy.data.thermo import find_cp0_and_cpinf
 from rmgpy.data.transport import CriticalPointGroupContribution, TransportData
 from rmgpy.exceptions import AtomTypeError, ReactionError
-from rmgpy.kinetics import Arrhenius, ArrheniusEP, ArrheniusBM, KineticsData
+from rmgpy.kinetics import Arrhenius, ArrheniusEP, ArrheniusBM, KineticsData, KineticsModel
 from rmgpy.molecule import Group, Molecule, Atom, Bond
 from rmgpy.molecule.adjlist import Saturator
 from rmgpy.molecule.resonance import analyze_molecule, generate_resonance_structures
@@ -70,10 +69,14 @@ from rmgpy.thermo import NASA, ThermoData, Wilhoit
 from rmgpy.thermo.thermoengine import process_thermo_data
 
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.templatetags.static import static
-from django.http import Http404, HttpResponseRedirect, HttpResponse, HttpResponseBadRequest
+from django.http import Http404, HttpResponseRedirect, HttpResponse, HttpResponseBadRequest, JsonResponse, \
+                        StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.gzip import gzip_page
 from django.forms import formset_factory
 
 try:
@@ -83,16 +86,29 @@ except ImportError:
 
 import rmgweb.settings
 from rmgweb.secretsettings import SOLPROP_URL
-from rmgweb.database.forms import DivErrorList, EniSearchForm, KineticsEntryEditForm, \
-                                  KineticsSearchForm, MoleculeSearchForm, RateEvaluationForm
-from rmgweb.database.tools import database, generateReactions, generateSpeciesThermo, reactionHasReactants
-from rmgweb.main.tools import getStructureInfo, groupToInfo, moleculeFromURL, moleculeToAdjlist
+from rmgweb.database.forms import DivErrorList, EniSearchForm, GroupDrawForm, KineticsEntryEditForm, \
+                                  KineticsSearchForm, MoleculeSearchForm, RateEvaluationForm, ThermoCompareForm
+from rmgweb.database.search import label_index, species_index
+from rmgweb.database.tools import TABLE_PAGE_SIZE, database, generateReactions, generateSpeciesThermo, \
+                                  get_table_page, reactionHasReactants
+from rmgweb.main.evaluate import evaluate_log_rate_coefficients
+from rmgweb.main.plotdata import get_plot_series, get_request_plot_units, plot_data_response
+from rmgweb.main.templatetags.render_kinetics import RATE_PLOT_UNITS, get_rate_coefficient_series, \
+                                                    render_kinetics_math
+from rmgweb.main.templatetags.render_solvation import render_solvation_math
+from rmgweb.main.templatetags.render_statmech import render_statmech_math
+from rmgweb.main.templatetags.render_thermo import THERMO_PLOT_UNITS, get_thermo_series, render_thermo_math
+from rmgweb.main.templatetags.render_transport import render_transport_math
+from rmgweb.main.tools import groupToInfo, moleculeFromURL, moleculeToAdjlist
 from rmgpy.data.solvation import get_critical_temperature
 
 # from rmgweb.main.tools import moleculeToURL, moleculeFromURL
 
 logger = logging.getLogger(__name__)
 
+# Temperatures (in K) at which rate coefficients are shown in kinetics trees
+KINETICS_TREE_TEMPERATURES = [300, 400, 500, 600, 800, 1000, 1500, 2000]
+
 ################################################################################
 
 
@@ -109,20 +125,145 @@ def index(request):
     """
     return render(request, 'database.html')
 
-def return_common_entry_data(entries, section, subsection, index, data_type):
+def return_common_entry_data(db, section, subsection, index, data_type):
     """
-    A helper function that returns entry data for a species, after the relevant entries are determined.
+    A helper function that returns the entry with the given `index` in the database component `db`.
     """
-    index = int(index)
-    if index != -1:
-        for entry in entries:
-            if entry.index == index:
-                break
-        else:
-            raise Http404
+    entry = database.get_entry(db, int(index))
+    if entry is None:
+        raise Http404
 
     return entry
 
+
+def getTablePage(request, rows, format_row):
+    """
+    Return the page of a database table requested by the ``sort``, ``order``,
+    ``q``, ``cursor`` and ``limit`` query parameters of `request`, as a tuple
+    ``(entries, next_cursor, total)``. Only the rows on the page are passed
+    to `format_row`, which returns the extra (e.g. structure markup) fields of
+    a row. A :class:`ValueError` is raised for invalid parameters.
+    """
+    try:
+        limit = int(request.GET.get('limit', TABLE_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('Invalid value "{0}" for limit parameter.'.format(request.GET.get('limit')))
+    page, next_cursor, total = get_table_page(rows,
+                                              sort=request.GET.get('sort', 'index'),
+                                              descending=request.GET.get('order') == 'desc',
+                                              query=request.GET.get('q', ''),
+                                              cursor=request.GET.get('cursor', ''),
+                                              limit=limit)
+    entries = []
+    for row in page:
+        entry = {key: value for key, value in row.items() if key != 'entry'}
+        entry.update(format_row(row))
+        entries.append(entry)
+    return entries, next_cursor, total
+
+
+def getTableRows(component, section, subsection):
+    """
+    Return the rows of the table of the given `section` and `subsection` of
+    a database `component`, and the function that formats a single row. A
+    :class:`ValueError` is raised if the table does not exist.
+    """
+    if component == 'thermo':
+        database.load('thermo', section)
+        db = database.get_thermo_database(section, subsection)
+        return getThermoTableRows(db), lambda row: formatThermoTableRow(section, subsection, row)
+    elif component == 'transport':
+        database.load('transport', section)
+        db = database.get_transport_database(section, subsection)
+        return getTransportTableRows(db), lambda row: formatTransportTableRow(section, subsection, row)
+    elif component == 'solvation':
+        database.load('solvation', section)
+        db = database.get_solvation_database(section, subsection)
+        return getSolvationTableRows(db), lambda row: formatSolvationTableRow(section, subsection, row)
+    elif component == 'statmech':
+        database.load('statmech', section)
+        db = database.get_statmech_database(section, subsection)
+        return getStatmechTableRows(db), lambda row: formatStatmechTableRow(section, subsection, row)
+    elif component == 'kinetics':
+        database.load('kinetics', section)
+        db = database.get_kinetics_database(section, subsection)
+        if db is None or (db.top is not None and len(db.top) > 0):
+            # Trees are not shown as tables
+            raise ValueError('Invalid value "%s" for subsection parameter.' % subsection)
+        return getKineticsTableRows(db, subsection), lambda row: formatKineticsTableRow(section, subsection, row)
+    else:
+        raise ValueError('Invalid value "%s" for component parameter.' % component)
+
+
+def getEntryMath(component, entry, units):
+    """
+    Return the (cached) math fragment showing the data of a database `entry`
+    of the given `component` in the given `units`, as shown on its entry
+    page, or ``None`` if the entry only links to the data of another entry.
+    """
+    if isinstance(entry.data, str):
+        return None
+    if component == 'thermo':
+        return render_thermo_math(entry.data, units)
+    elif component == 'transport':
+        return render_transport_math(entry.data, units)
+    elif component == 'solvation':
+        return render_solvation_math(entry, units)
+    elif component == 'statmech':
+        return render_statmech_math(entry.data, units)
+    elif component == 'kinetics':
+        return render_kinetics_math(entry.data, units)
+
+
+def databaseTable(request, component, section, subsection):
+    """
+    Return one page of the table of entries in a part of the database as
+    JSON. The page is selected with the ``sort`` (index, label or
+    dataFormat), ``order`` (asc or desc), ``q`` (filter text), ``limit``
+    and ``cursor`` query parameters; the ``next`` cursor of the response
+    requests the following page. With ``math=1`` each entry also includes
+    the math fragment showing its data in the user's preferred units.
+    """
+    try:
+        rows, format_row = getTableRows(component, section, subsection)
+    except ValueError:
+        raise Http404
+    if request.GET.get('math') == '1':
+        format_table_row = format_row
+
+        def format_row(row):
+            fields = format_table_row(row)
+            fields['math'] = getEntryMath(component, row['entry'], request.units)
+            return fields
+    try:
+        entries, next_cursor, total = getTablePage(request, rows, format_row)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    return JsonResponse({'entries': entries, 'next': next_cursor, 'total': total})
+
+
+def renderDatabaseTable(request, template, component, section, subsection, db, rows, format_row, **kwargs):
+    """
+    Render the first page of a database table using `template`. The rest of
+    the table is loaded by the browser from :func:`databaseTable`.
+    """
+    try:
+        entries, next_cursor, total = getTablePage(request, rows, format_row)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    context = {
+        'section': section,
+        'subsection': subsection,
+        'databaseName': db.name,
+        'entries': entries,
+        'nextCursor': next_cursor,
+        'total': total,
+        'pageSize': int(request.GET.get('limit', TABLE_PAGE_SIZE)),
+        'tableUrl': reverse('database:table', kwargs={'component': component, 'section': section, 'subsection': subsection}),
+    }
+    context.update(kwargs)
+    return render(request, template, context)
+
 #################################################################################################################################################
 
 
@@ -147,47 +288,52 @@ def transport(request, section='', subsection=''):
         except ValueError:
             raise Http404
 
-        # Sort entries by index
-        entries0 = list(db.entries.values())
-        entries0.sort(key=lambda entry: entry.index)
-
-        entries = []
-        for entry in entries0:
-
-            structure = getStructureInfo(entry.item)
-
-            if isinstance(entry.data, CriticalPointGroupContribution):
-                data_format = 'CriticalPointGroupContribution'
-            elif isinstance(entry.data, TransportData):
-                data_format = 'TransportData'
-
-            elif entry.data is None:
-                data_format = 'None'
-                entry.index = 0
-
-            else:
-                data_format = 'Other'
-
-            entries.append((entry.index, entry.label, structure, data_format))
-
-        return render(request, 'transportTable.html',
-                      {'section': section, 'subsection': subsection,
-                       'databaseName': db.name, 'entries': entries}
-                      )
+        return renderDatabaseTable(request, 'transportTable.html', 'transport', section, subsection, db,
+                                   getTransportTableRows(db),
+                                   lambda row: formatTransportTableRow(section, subsection, row))
 
     else:
         # No subsection was specified, so render an outline of the transport
-        # database components and sort them
-        transport_libraries = [(label, database.transport.libraries[label]) for label in database.transport.library_order]
-        transport_libraries.sort()
-        transport_groups = [(label, groups) for label, groups in database.transport.groups.items()]
-        transport_groups.sort()
+        # database components and sort them, only if the outline is not cached
+        transport_libraries = SimpleLazyObject(lambda: sorted((label, database.transport.libraries[label])
+                                                              for label in database.transport.library_order))
+        transport_groups = SimpleLazyObject(lambda: sorted(database.transport.groups.items()))
         return render(request, 'transport.html',
                       {'section': section, 'subsection': subsection,
-                       'transportLibraries': transport_libraries, 'transportGroups': transport_groups}
+                       'transportLibraries': transport_libraries, 'transportGroups': transport_groups,
+                       'generation': database.generation}
                       )
 
 
+def getTransportTableRows(db):
+    """
+    Return the rows of the table of entries in the transport database `db`.
+    """
+    rows = []
+    for entry in db.entries.values():
+        if isinstance(entry.data, CriticalPointGroupContribution):
+            data_format = 'CriticalPointGroupContribution'
+        elif isinstance(entry.data, TransportData):
+            data_format = 'TransportData'
+        elif entry.data is None:
+            data_format = 'None'
+            entry.index = 0
+        else:
+            data_format = 'Other'
+        rows.append({'index': entry.index, 'label': entry.label, 'dataFormat': data_format, 'entry': entry})
+    return rows
+
+
+def formatTransportTableRow(section, subsection, row):
+    """
+    Return the structure and link of a row of a transport database table.
+    """
+    return {
+        'url': reverse('database:transport-entry', kwargs={'section': section, 'subsection': subsection, 'index': row['index']}),
+        'structure': database.get_structure_info(row['entry'].item),
+    }
+
+
 def transportEntry(request, section, subsection, index):
     """
     A view for showing an entry in a transport database.
@@ -201,10 +347,10 @@ def transportEntry(request, section, subsection, index):
     except ValueError:
         raise Http404
 
-    entry = return_common_entry_data(db.entries.values(), section, subsection, index, "transport")
+    entry = return_common_entry_data(db, section, subsection, index, "transport")
 
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(entry.item)
+    structure = database.get_structure_info(entry.item)
 
     # Prepare the transport data for passing to the template
     # This includes all string formatting, since we can't do that in the template
@@ -257,7 +403,7 @@ def transportData(request, adjlist):
         ))
 
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(molecule)
+    structure = database.get_structure_info(molecule)
 
     return render(request, 'transportData.html',
                   {'molecule': molecule,
@@ -294,54 +440,56 @@ def solvation(request, section='', subsection=''):
             db = database.get_solvation_database(section, subsection)
         except ValueError:
             raise Http404
-        # Sort entries by index
-        entries0 = list(db.entries.values())
-        entries0.sort(key=lambda entry: entry.index)
 
-        entries = []
-        for entry in entries0:
-            structures = []
-
-            if type(entry.item) is list: # the case for solvents
-                for structure in entry.item:
-                    structures.append(getStructureInfo(structure))
-            else: # single values for solutes
-                structures.append(getStructureInfo(entry.item))
-
-            if isinstance(entry.data, SoluteData):
-                data_format = 'SoluteData'
-            elif isinstance(entry.data, SolventData):
-                data_format = 'SolventData'
-
-            elif entry.data is None:
-                data_format = 'None'
-                # entry.index = 0
-
-            else:
-                data_format = 'Other'
-
-            entries.append((entry.index, entry.label, structures, data_format))
-
-        return render(request, 'solvationTable.html',
-                      {'section': section,
-                       'subsection': subsection,
-                       'databaseName': db.name,
-                       'entries': entries})
+        return renderDatabaseTable(request, 'solvationTable.html', 'solvation', section, subsection, db,
+                                   getSolvationTableRows(db),
+                                   lambda row: formatSolvationTableRow(section, subsection, row))
 
     else:
         # No subsection was specified, so render an outline of the solvation
-        # database components and sort them
-        solvation_libraries = []
-        solvation_libraries.append(('solvent', database.solvation.libraries['solvent']))
-        solvation_libraries.append(('solute', database.solvation.libraries['solute']))
-        solvation_libraries.sort()
-        solvation_groups = [(label, groups) for label, groups in database.solvation.groups.items()]
-        solvation_groups.sort()
+        # database components and sort them, only if the outline is not cached
+        solvation_libraries = SimpleLazyObject(lambda: sorted([('solvent', database.solvation.libraries['solvent']),
+                                                               ('solute', database.solvation.libraries['solute'])]))
+        solvation_groups = SimpleLazyObject(lambda: sorted(database.solvation.groups.items()))
         return render(request, 'solvation.html',
                       {'section': section,
                        'subsection': subsection,
                        'solvationLibraries': solvation_libraries,
-                       'solvationGroups': solvation_groups})
+                       'solvationGroups': solvation_groups,
+                       'generation': database.generation})
+
+
+def getSolvationTableRows(db):
+    """
+    Return the rows of the table of entries in the solvation database `db`.
+    """
+    rows = []
+    for entry in db.entries.values():
+        if isinstance(entry.data, SoluteData):
+            data_format = 'SoluteData'
+        elif isinstance(entry.data, SolventData):
+            data_format = 'SolventData'
+        elif entry.data is None:
+            data_format = 'None'
+        else:
+            data_format = 'Other'
+        rows.append({'index': entry.index, 'label': entry.label, 'dataFormat': data_format, 'entry': entry})
+    return rows
+
+
+def formatSolvationTableRow(section, subsection, row):
+    """
+    Return the structures and link of a row of a solvation database table.
+    """
+    item = row['entry'].item
+    if type(item) is list:  # the case for solvents
+        structures = [database.get_structure_info(structure) for structure in item]
+    else:  # single values for solutes
+        structures = [database.get_structure_info(item)]
+    return {
+        'url': reverse('database:solvation-entry', kwargs={'section': section, 'subsection': subsection, 'index': row['index']}),
+        'structure': ' '.join(structures),
+    }
 
 
 def solvationEntry(request, section, subsection, index):
@@ -357,21 +505,16 @@ def solvationEntry(request, section, subsection, index):
     except ValueError:
         raise Http404
 
-    index = int(index)
-    for entry in db.entries.values():
-        if entry.index == index:
-            break
-    else:
-        raise Http404
+    entry = return_common_entry_data(db, section, subsection, index, "solvation")
 
     # Get the structures of the item we are viewing
     structures = []
 
     if type(entry.item) is list: # the case for solvents
         for structure in entry.item:
-            structures.append(getStructureInfo(structure))
+            structures.append(database.get_structure_info(structure))
     else: # single values for solutes
-        structures.append(getStructureInfo(entry.item))
+        structures.append(database.get_structure_info(entry.item))
 
     # Prepare the solvation data for passing to the template. This includes all string formatting,
     # since we can't do that in the template.
@@ -408,10 +551,43 @@ def _dHsolv_estimator(pair_smiles):
     result = requests.post(SOLPROP_URL + "/dHsolv_estimator", json={"solvent_smiles": pair_smiles[0][0], "solute_smiles": pair_smiles[0][1]}).json()
     return result["avg_pred"], result["epi_unc"], result["valid_indices"]
 
-def get_solvation_from_DirectML(pair_smiles, error_msg, dGsolv_required, dHsolv_required, calc_dSsolv, energy_unit):
+def _solvation_estimator_batch(name, pair_smiles):
+    """
+    Call the DirectML estimator `name` ('dGsolv' or 'dHsolv') of the running Docker container once for all of the
+    solvent-solute pairs in `pair_smiles`. Returns a dictionary mapping each (solvent_smiles, solute_smiles) tuple to
+    its prediction and epistemic uncertainty in kcal/mol. Pairs that could not be predicted are left out.
+    """
+    pairs = list(dict.fromkeys(tuple(pair) for pair in pair_smiles))
+    if not pairs:
+        return {}
+    estimates = {}
+    try:
+        result = requests.post(SOLPROP_URL + "/{0}_estimator_batch".format(name), json={"pairs": pairs}).json()
+        avg_pre, epi_unc, valid_indices = result["avg_pred"], result["epi_unc"], result["valid_indices"]
+        if len(avg_pre) != len(pairs):
+            # predictions are only given for the valid pairs
+            pairs = [pairs[i] for i in valid_indices]
+        for pair, pre, unc in zip(pairs, avg_pre, epi_unc):
+            if pre is not None:
+                estimates[pair] = (pre, unc)
+    except Exception:
+        # fall back to one request per pair so that a single bad pair does not fail the others
+        estimator = _dGsolv_estimator if name == 'dGsolv' else _dHsolv_estimator
+        for pair in pairs:
+            try:
+                avg_pre, epi_unc, valid_indices = estimator([list(pair)])
+                estimates[pair] = (avg_pre[0], epi_unc[0])
+            except Exception:
+                pass
+    return estimates
+
+def get_solvation_from_DirectML(pair_smiles, error_msg, dGsolv_required, dHsolv_required, calc_dSsolv, energy_unit,
+                                dGsolv_estimates=None, dHsolv_estimates=None):
     """
     Calculate solvation free energy, enthalpy, and entropy using the DirectML model. Corresponding
     epistemic uncertainties and error message are also returned. All values are returned in the given energy unit.
+    The predictions are looked up in `dGsolv_estimates` and `dHsolv_estimates` if they are given, as returned by
+    _solvation_estimator_batch; otherwise they are requested for this pair alone.
     """
     dGsolv298 = None
     dGsolv298_epi_unc = None
@@ -428,16 +604,18 @@ def get_solvation_from_DirectML(pair_smiles, error_msg, dGsolv_required, dHsolv_
         error_msg = update_error_msg(error_msg, 'The prediction may not be reliable')
 
     if dGsolv_required:
+        if dGsolv_estimates is None:
+            dGsolv_estimates = _solvation_estimator_batch('dGsolv', pair_smiles)
         try:
-            avg_pre, epi_unc, valid_indices = _dGsolv_estimator(pair_smiles)  # default is in kcal/mol
-            dGsolv298, dGsolv298_epi_unc = avg_pre[0], epi_unc[0]
-        except:
+            dGsolv298, dGsolv298_epi_unc = dGsolv_estimates[(solvent_smiles, solute_smiles)]  # default is in kcal/mol
+        except KeyError:
             error_msg = update_error_msg(error_msg, 'Unable to parse the SMILES', overwrite=True)
     if dHsolv_required:
+        if dHsolv_estimates is None:
+            dHsolv_estimates = _solvation_estimator_batch('dHsolv', pair_smiles)
         try:
-            avg_pre, epi_unc, valid_indices = _dHsolv_estimator(pair_smiles)  # default is in kcal/mol
-            dHsolv298, dHsolv298_epi_unc = avg_pre[0], epi_unc[0]
-        except:
+            dHsolv298, dHsolv298_epi_unc = dHsolv_estimates[(solvent_smiles, solute_smiles)]  # default is in kcal/mol
+        except KeyError:
             error_msg = update_error_msg(error_msg, 'Unable to parse the SMILES', overwrite=True)
     if calc_dSsolv and dGsolv298 is not None and dHsolv298 is not None:
         dSsolv298 = (dHsolv298 - dGsolv298) / 298  # default is in kcal/mol/K
@@ -469,6 +647,14 @@ def get_solvation_data_ML(solvent_solute_smiles, calc_dGsolv, calc_dHsolv, calc_
     for col_name in results_col_name_list:
         solvation_data_results[col_name] = []
 
+    # get the DirectML predictions of all of the pairs at once, including the water pairs needed for logP
+    pair_smiles_list = [pair.split('_') for pair in solvent_solute_smiles_list if len(pair.split('_')) == 2]
+    dGsolv_pairs = list(pair_smiles_list)
+    if calc_logP:
+        dGsolv_pairs += [['O', solute_smiles] for solvent_smiles, solute_smiles in pair_smiles_list]
+    dGsolv_estimates = _solvation_estimator_batch('dGsolv', dGsolv_pairs) if dGsolv_required else {}
+    dHsolv_estimates = _solvation_estimator_batch('dHsolv', pair_smiles_list) if dHsolv_required else {}
+
     # get predictions for each given solvent_solute SMILES
     for solvent_solute in solvent_solute_smiles_list:
         # initialization
@@ -484,7 +670,8 @@ def get_solvation_data_ML(solvent_solute_smiles, calc_dGsolv, calc_dHsolv, calc_
             pair_smiles = [[solvent_smiles, solute_smiles]]
             # get dGsolv, dHsolv, dSsolv calculation
             [dGsolv298, dGsolv298_epi_unc, dHsolv298, dHsolv298_epi_unc, dSsolv298], error_msg = \
-                get_solvation_from_DirectML(pair_smiles, error_msg, dGsolv_required, dHsolv_required, calc_dSsolv, 'J/mol')
+                get_solvation_from_DirectML(pair_smiles, error_msg, dGsolv_required, dHsolv_required, calc_dSsolv, 'J/mol',
+                                            dGsolv_estimates, dHsolv_estimates)
             # get logK calculation
             if calc_logK and dGsolv298 is not None:
                 logK = -dGsolv298 / (math.log(10) * constants.R * 298)
@@ -495,8 +682,7 @@ def get_solvation_data_ML(solvent_solute_smiles, calc_dGsolv, calc_dHsolv, calc_
                     logP = 0
                 else:
                     try:
-                        avg_pre, epi_unc, valid_indices = _dGsolv_estimator([['O', solute_smiles]])
-                        dGsolv298_water = convert_energy_unit(avg_pre[0], 'kcal/mol', 'J/mol')
+                        dGsolv298_water = convert_energy_unit(dGsolv_estimates[('O', solute_smiles)][0], 'kcal/mol', 'J/mol')
                         logP = -(dGsolv298 - dGsolv298_water) / (math.log(10) * constants.R * 298)
                         logP = clean_up_value(logP, deci_place=2, only_big=True)
                     except:
@@ -918,7 +1104,7 @@ def solvationSolventData(request, solvent_adjlist):
         solvent_info_list.append((solvent_label, solvent_entry, solvent_href))
 
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(molecule)
+    structure = database.get_structure_info(molecule)
 
     return render(request, 'solvationSolventData.html',
                   {'molecule': molecule,
@@ -1361,35 +1547,41 @@ def statmech(request, section='', subsection=''):
         except ValueError:
             raise Http404
 
-        # Sort entries by index
-        entries0 = list(db.entries.values())
-        entries0.sort(key=lambda entry: entry.index)
+        return renderDatabaseTable(request, 'statmechTable.html', 'statmech', section, subsection, db,
+                                   getStatmechTableRows(db),
+                                   lambda row: formatStatmechTableRow(section, subsection, row))
+    else:
+        # No subsection was specified, so render an outline of the statmech
+        # database components and sort them, only if the outline is not cached
+        statmech_depository = SimpleLazyObject(lambda: sorted(database.statmech.depository.items()))
+        statmech_libraries = SimpleLazyObject(lambda: sorted((name, database.statmech.libraries[name])
+                                                             for name in database.statmech.library_order))
+        statmech_groups = SimpleLazyObject(lambda: sorted(database.statmech.groups.items()))
+        return render(request, 'statmech.html', {'section': section, 'subsection': subsection, 'statmechDepository': statmech_depository, 'statmechLibraries': statmech_libraries, 'statmechGroups': statmech_groups, 'generation': database.generation})
 
-        entries = []
-        for entry in entries0:
-            structure = getStructureInfo(entry.item)
-            if isinstance(entry.data, GroupFrequencies):
-                data_format = 'GroupFrequencies'
-            else:
-                data_format = 'Other'
 
-            entries.append((entry.index, entry.label, structure, data_format))
+def getStatmechTableRows(db):
+    """
+    Return the rows of the table of entries in the statmech database `db`.
+    """
+    rows = []
+    for entry in db.entries.values():
+        if isinstance(entry.data, GroupFrequencies):
+            data_format = 'GroupFrequencies'
+        else:
+            data_format = 'Other'
+        rows.append({'index': entry.index, 'label': entry.label, 'dataFormat': data_format, 'entry': entry})
+    return rows
 
-        return render(request, 'statmechTable.html',
-                      {'section': section,
-                       'subsection': subsection,
-                       'databaseName': db.name,
-                       'entries': entries})
-    else:
-        # No subsection was specified, so render an outline of the statmech
-        # database components and sort them
-        statmech_depository = [(label, depository) for label, depository in database.statmech.depository.items()]
-        statmech_depository.sort()
-        statmech_libraries = [(name, database.statmech.libraries[name]) for name in database.statmech.library_order]
-        statmech_libraries.sort()
-        statmech_groups = [name for name in database.statmech.groups.items()]
-        statmech_groups.sort()
-        return render(request, 'statmech.html', {'section': section, 'subsection': subsection, 'statmechDepository': statmech_depository, 'statmechLibraries': statmech_libraries, 'statmechGroups': statmech_groups})
+
+def formatStatmechTableRow(section, subsection, row):
+    """
+    Return the structure and link of a row of a statmech database table.
+    """
+    return {
+        'url': reverse('database:statmech-entry', kwargs={'section': section, 'subsection': subsection, 'index': row['index']}),
+        'structure': database.get_structure_info(row['entry'].item),
+    }
 
 
 def statmechEntry(request, section, subsection, index):
@@ -1405,10 +1597,10 @@ def statmechEntry(request, section, subsection, index):
     except ValueError:
         raise Http404
 
-    entry = return_common_entry_data(db.entries.values(), section, subsection, index, "statmech")
+    entry = return_common_entry_data(db, section, subsection, index, "statmech")
 
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(entry.item)
+    structure = database.get_structure_info(entry.item)
 
     # Prepare the statmech data for passing to the template
     # This includes all string formatting, since we can't do that in the template
@@ -1448,7 +1640,7 @@ def statmechData(request, adjlist):
     statmech_data_list.append((1, database.statmech.get_solvent_data(species.label), source, href))
 
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(molecule)
+    structure = database.get_structure_info(molecule)
 
     return render(request, 'statmechData.html', {'molecule': molecule, 'structure': structure, 'statmechDataList': statmech_data_list, 'symmetryNumber': symmetry_number})
 
@@ -1477,55 +1669,60 @@ def thermo(request, section='', subsection=''):
         except ValueError:
             raise Http404
 
-        # Sort entries by index
-        entries0 = list(db.entries.values())
-        entries0.sort(key=lambda entry: entry.index)
-
-        entries = []
-        for entry in entries0:
-
-            structure = getStructureInfo(entry.item)
+        return renderDatabaseTable(request, 'thermoTable.html', 'thermo', section, subsection, db,
+                                   getThermoTableRows(db),
+                                   lambda row: formatThermoTableRow(section, subsection, row))
 
-            if isinstance(entry.data, ThermoData):
-                data_format = 'Group additivity'
-            elif isinstance(entry.data, Wilhoit):
-                data_format = 'Wilhoit'
-            elif isinstance(entry.data, NASA):
-                data_format = 'NASA'
-            elif isinstance(entry.data, str):
-                data_format = 'Link'
-            elif isinstance(entry.item, (LogicNode, LogicOr, LogicAnd)):
-                data_format = 'Logic'
+    else:
+        # No subsection was specified, so render an outline of the thermo
+        # database components, only if the outline is not cached
+        thermo_depository = SimpleLazyObject(lambda: sorted(database.thermo.depository.items()))
+        # If they weren't already sorted in our preferred order, we'd sort thermoLibraries
+        thermo_libraries = SimpleLazyObject(lambda: [(label, database.thermo.libraries[label])
+                                                     for label in database.thermo.library_order])
+        thermo_groups = SimpleLazyObject(lambda: sorted(database.thermo.groups.items()))
+        return render(request, 'thermo.html', {'section': section, 'subsection': subsection, 'thermoDepository': thermo_depository, 'thermoLibraries': thermo_libraries, 'thermoGroups': thermo_groups, 'generation': database.generation})
 
-            elif entry.data is None:
-                data_format = 'None'
-                entry.index = 0
-            else:
-                data_format = 'Other'
 
-            entries.append((entry.index, entry.label, structure, data_format))
+def getThermoTableRows(db):
+    """
+    Return the rows of the table of entries in the thermo database `db`.
+    """
+    rows = []
+    for entry in db.entries.values():
+        if isinstance(entry.data, ThermoData):
+            data_format = 'Group additivity'
+        elif isinstance(entry.data, Wilhoit):
+            data_format = 'Wilhoit'
+        elif isinstance(entry.data, NASA):
+            data_format = 'NASA'
+        elif isinstance(entry.data, str):
+            data_format = 'Link'
+        elif isinstance(entry.item, (LogicNode, LogicOr, LogicAnd)):
+            data_format = 'Logic'
+        elif entry.data is None:
+            data_format = 'None'
+            entry.index = 0
+        else:
+            data_format = 'Other'
+        rows.append({'index': entry.index, 'label': entry.label, 'dataFormat': data_format, 'entry': entry})
+    return rows
 
-        return render(request, 'thermoTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entries': entries})
 
-    else:
-        # No subsection was specified, so render an outline of the thermo
-        # database components
-        thermo_depository = [(label, depository) for label, depository in database.thermo.depository.items()]
-        thermo_depository.sort()
-        thermo_libraries = [(label, database.thermo.libraries[label]) for label in database.thermo.library_order]
-        # If they weren't already sorted in our preferred order, we'd call thermoLibraries.sort()
-        thermo_groups = [(label, groups) for label, groups in database.thermo.groups.items()]
-        thermo_groups.sort()
-        return render(request, 'thermo.html', {'section': section, 'subsection': subsection, 'thermoDepository': thermo_depository, 'thermoLibraries': thermo_libraries, 'thermoGroups': thermo_groups})
+def formatThermoTableRow(section, subsection, row):
+    """
+    Return the structure and link of a row of a thermo database table.
+    """
+    return {
+        'url': reverse('database:thermo-entry', kwargs={'section': section, 'subsection': subsection, 'index': row['index']}),
+        'structure': database.get_structure_info(row['entry'].item),
+    }
 
 
 def thermoEntry(request, section, subsection, index):
     """
     A view for showing an entry in a thermodynamics database.
     """
-    from rmgpy.chemkin import write_thermo_entry
-    from rmgpy.data.thermo import find_cp0_and_cpinf
-
     # Load the thermo database if necessary
     database.load('thermo', section)
 
@@ -1534,10 +1731,10 @@ def thermoEntry(request, section, subsection, index):
         db = database.get_thermo_database(section, subsection)
     except ValueError:
         raise Http404
-    entry = return_common_entry_data(db.entries.values(), section, subsection, index, "thermo")
+    entry = return_common_entry_data(db, section, subsection, index, "thermo")
 
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(entry.item)
+    structure = database.get_structure_info(entry.item)
 
     # Prepare the thermo data for passing to the template
     # This includes all string formatting, since we can't do that in the template
@@ -1547,25 +1744,88 @@ def thermoEntry(request, section, subsection, index):
         thermo = entry.data
 
     # Get the thermo data for the molecule
-    nasa_string = None
-    if isinstance(entry.item, Molecule):
-        species = Species(molecule=[entry.item])
-        species.generate_resonance_structures()
-        find_cp0_and_cpinf(species, thermo)
-        nasa_string = ''
-        try:
-            if isinstance(thermo, NASA):
-                nasa = thermo
-            else:
-                nasa = thermo.to_nasa(Tmin=100.0, Tmax=5000.0, Tint=1000.0)
-            species.thermo = nasa
-            nasa_string = write_thermo_entry(species)
-        except:
-            pass
+    nasa_string = database.get_thermo_nasa_string(section, subsection, entry)
 
     reference_type = ''
     reference = entry.reference
-    return render(request, 'thermoEntry.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entry': entry, 'structure': structure, 'reference': reference, 'referenceType': reference_type, 'thermo': thermo, 'nasa_string': nasa_string})
+    # The plot data are fetched separately so that they can be cached by the browser
+    plot_data_url = ''
+    if isinstance(thermo, (ThermoData, Wilhoit, NASA)):
+        units = request.units.get_units(THERMO_PLOT_UNITS)
+        plot_data_url = getPlotDataUrl('thermo', section, subsection, index, units)
+
+    return render(request, 'thermoEntry.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'entry': entry, 'structure': structure, 'reference': reference, 'referenceType': reference_type, 'thermo': thermo, 'nasa_string': nasa_string, 'plotDataUrl': plot_data_url})
+
+
+def getPlotDataUrl(component, section, subsection, index, units):
+    """
+    Return the URL of the plot data of an entry in a section of a database
+    `component` in the given `units`. The URL includes the current version
+    of the section, so that the data can be cached until it is reloaded.
+    """
+    query = dict(units, v=database.get_section_token(component, section))
+    url = reverse('database:{0}-plot-data'.format(component),
+                  kwargs={'section': section, 'subsection': subsection, 'index': index})
+    return url + '?' + urllib.parse.urlencode(query)
+
+
+def thermoEntryPlotData(request, section, subsection, index):
+    """
+    Return the heat capacity, enthalpy, entropy and free energy of an entry
+    in a thermodynamics database for plotting, as JSON in the units given by
+    the query parameters.
+    """
+    units = get_request_plot_units(request, THERMO_PLOT_UNITS)
+    if units is None:
+        return HttpResponseBadRequest('Invalid units.')
+
+    # Load the thermo database if necessary
+    database.load('thermo', section)
+    try:
+        db = database.get_thermo_database(section, subsection)
+    except ValueError:
+        raise Http404
+    entry = return_common_entry_data(db, section, subsection, index, "thermo")
+    if not isinstance(entry.data, (ThermoData, Wilhoit, NASA)):
+        raise Http404
+
+    series = get_plot_series('thermo', entry.data, units, get_thermo_series)
+    if not series:
+        raise Http404
+    return plot_data_response(request, series, database.get_section_token('thermo', section))
+
+
+@gzip_page
+def thermoExport(request, section, subsection):
+    """
+    Returns all of the entries in a thermo library or depository as a
+    Chemkin thermo file of NASA polynomials. The file is generated entry by
+    entry while it is sent, so the whole file is never held in memory.
+    """
+    if section not in ['depository', 'libraries']:
+        raise Http404
+
+    # Load the thermo database if necessary
+    database.load('thermo', section)
+
+    try:
+        db = database.get_thermo_database(section, subsection)
+    except ValueError:
+        raise Http404
+
+    def generate_chemkin_thermo():
+        yield 'THERM ALL\n    300.000  1000.000  5000.000\n\n'
+        for entry in sorted(db.entries.values(), key=lambda entry: entry.index):
+            nasa_string = database.get_thermo_nasa_string(section, subsection, entry)
+            if nasa_string:
+                yield nasa_string
+            elif nasa_string is not None:
+                yield '! Unable to generate NASA polynomial for entry {0}. {1}\n\n'.format(entry.index, entry.label)
+        yield 'END\n\n'
+
+    response = StreamingHttpResponse(generate_chemkin_thermo(), content_type='text/plain')
+    response['Content-Disposition'] = 'attachment; filename="{0}.dat"'.format(subsection.replace('/', '_'))
+    return response
 
 
 def thermoData(request, adjlist):
@@ -1589,7 +1849,7 @@ def thermoData(request, adjlist):
     word_list = []
     ref_dict = {}
 
-    for data, library, entry in database.thermo.get_all_thermo_data(species):
+    for data, library, entry in database.get_all_thermo_data(species):
         # Make sure we calculate Cp0 and CpInf
         find_cp0_and_cpinf(species, data)
         # Round trip conversion via Wilhoit for proper fitting
@@ -1621,10 +1881,41 @@ def thermoData(request, adjlist):
             nasa_string,
         ))
 
+    # If there is no library or depository data, point to the most similar
+    # species that do have some. The page does not wait for the species
+    # index to be updated, so they are left out until it is.
+    similar_species = []
+    if all(source == 'Group additivity' for entry, data, source, href, nasa in thermo_data_list):
+        for record, similarity in species_index.similarity_search(molecule, limit=5, wait=False) or []:
+            similar_species.append((record, similarity, database.get_structure_info(record.molecule[0]),
+                                    getSpeciesSearchSources(record, ('thermo', 'transport'))))
+
     # Get the structure of the item we are viewing
-    structure = getStructureInfo(molecule)
+    structure = database.get_structure_info(molecule)
 
-    return render(request, 'thermoData.html', {'molecule': molecule, 'structure': structure, 'thermo_data_list': thermo_data_list, 'symmetry_number': symmetry_number, 'ref_dict': ref_dict, 'word_list': word_list, 'plotWidth': 500, 'plotHeight': 400 + 15 * len(thermo_data_list)})
+    return render(request, 'thermoData.html', {'molecule': molecule, 'structure': structure, 'thermo_data_list': thermo_data_list, 'symmetry_number': symmetry_number, 'ref_dict': ref_dict, 'word_list': word_list, 'similar_species': similar_species, 'plotWidth': 500, 'plotHeight': 400 + 15 * len(thermo_data_list)})
+
+
+def thermoCompare(request):
+    """
+    Plots the heat capacity, enthalpy, entropy and free energy of several
+    species, given as SMILES strings, against each other. The thermo data
+    of each species are estimated as when generating a model.
+    """
+    form = ThermoCompareForm(request.GET or None, error_class=DivErrorList)
+    species_list = []
+
+    if form.is_valid():
+        # Load the thermo database if necessary
+        database.load('thermo')
+        for smiles in form.cleaned_data['species']:
+            molecule = Molecule().from_smiles(smiles)
+            species = Species(molecule=[molecule])
+            generateSpeciesThermo(species, database)
+            href = reverse('database:thermo-data', kwargs={'adjlist': molecule.to_adjacency_list()})
+            species_list.append((smiles, database.get_structure_info(molecule), species.thermo, href))
+
+    return render(request, 'thermoCompare.html', {'form': form, 'species_list': species_list, 'plotWidth': 500, 'plotHeight': 400 + 15 * len(species_list)})
 
 
 def parseThermoComment(comment):
@@ -1702,84 +1993,105 @@ def getKineticsTreeHTML(database, section, subsection, entries):
     Return a string of HTML markup used for displaying information about
     kinetics entries in a given `database` as a tree of unordered lists.
     """
-    html = ''
+    # Evaluate the rate coefficients of every node in the tree in one pass
+    nodes = [entry for entry in getDatabaseTreeAsList(database, entries) if entry.data is not None]
+    log_kdata = evaluate_log_rate_coefficients([entry.data for entry in nodes], KINETICS_TREE_TEMPERATURES, P=1e5)
+    log_kdata = {entry.index: row for entry, row in zip(nodes, log_kdata)}
+
+    html = []
+    writeKineticsTreeHTML(html, section, subsection, entries, log_kdata)
+    return ''.join(html)
+
+
+def writeKineticsTreeHTML(html, section, subsection, entries, log_kdata):
+    """
+    Append the HTML markup for the kinetics tree below `entries` to the list
+    `html`, using the precomputed log10 rate coefficients in `log_kdata`.
+    """
     for entry in entries:
         # Write current node
         url = reverse('database:kinetics-entry', kwargs={'section': section, 'subsection': subsection, 'index': entry.index})
-        html += '<li class="kineticsEntry">\n'
-        html += '<div class="kineticsLabel">'
+        html.append('<li class="kineticsEntry">\n')
+        html.append('<div class="kineticsLabel">')
         if len(entry.children) > 0:
-            html += '<img id="button_{0}" class="treeButton" src="{1}"/>'.format(entry.index, static('img/tree-collapse.png'))
+            html.append('<img id="button_{0}" class="treeButton" src="{1}"/>'.format(entry.index, static('img/tree-collapse.png')))
         else:
-            html += '<img class="treeButton" src="{0}"/>'.format(static('img/tree-blank.png'))
-        html += '<a href="{0}">{1}. {2}</a>\n'.format(url, entry.index, entry.label)
-        html += '<div class="kineticsData">\n'
-        if entry.data is not None:
-            for T in [300, 400, 500, 600, 800, 1000, 1500, 2000]:
-                html += '<span class="kineticsDatum">{0:.2f}</span> '.format(math.log10(entry.data.get_rate_coefficient(T, P=1e5)))
-        html += '</div>\n'
+            html.append('<img class="treeButton" src="{0}"/>'.format(static('img/tree-blank.png')))
+        html.append('<a href="{0}">{1}. {2}</a>\n'.format(url, entry.index, entry.label))
+        html.append('<div class="kineticsData">\n')
+        if entry.index in log_kdata:
+            for log_k in log_kdata[entry.index]:
+                html.append('<span class="kineticsDatum">{0:.2f}</span> '.format(log_k))
+        html.append('</div>\n')
         # Recursively descend children (depth-first)
         if len(entry.children) > 0:
-            html += '<ul id="children_{0}" class="kineticsSubTree">\n'.format(entry.index)
-            html += getKineticsTreeHTML(database, section, subsection, entry.children)
-            html += '</ul>\n'
-        html += '</li>\n'
-    return html
+            html.append('<ul id="children_{0}" class="kineticsSubTree">\n'.format(entry.index))
+            writeKineticsTreeHTML(html, section, subsection, entry.children, log_kdata)
+            html.append('</ul>\n')
+        html.append('</li>\n')
 
 
-def getUntrainedReactions(family):
+def getKineticsTreeNodes(database, section, subsection, entries):
     """
-    Return a depository containing unique reactions for which no
-    training data exists.
+    Return a dictionary mapping the index of each node of the kinetics tree
+    below `entries` to a summary of each of its children: their index,
+    label, URL, number of children and log10 rate coefficients. The nodes
+    of `entries` themselves are listed under the index ``''``.
     """
-    # Load training depository
-    for depository in family.depositories:
-        if 'training' in depository.label:
-            training = depository
-            break
-    else:
-        raise Exception('Could not find training depository in {0} family.'.format(family.label))
+    tree_entries = getDatabaseTreeAsList(database, entries)
+    nodes = [entry for entry in tree_entries if entry.data is not None]
+    log_kdata = evaluate_log_rate_coefficients([entry.data for entry in nodes], KINETICS_TREE_TEMPERATURES, P=1e5)
+    log_kdata = {entry.index: row for entry, row in zip(nodes, log_kdata)}
 
-    # Load trained reactions
-    trained_reactions = []
-    for entry in training.entries.values():
-        for reaction in trained_reactions:
-            if reaction.is_isomorphic(entry.item):
-                break
-        else:
-            trained_reactions.append(entry.item)
-
-    # Load untrained reactions
-    untrained_reactions = []
-    for depository in family.depositories:
-        if 'training' not in depository.label:
-            for entry in depository.entries.values():
-                for reaction in trained_reactions:
-                    if reaction.is_isomorphic(entry.item):
-                        break
-                else:
-                    for reaction in untrained_reactions:
-                        if reaction.is_isomorphic(entry.item):
-                            break
-                    else:
-                        untrained_reactions.append(entry.item)
-
-    # Sort reactions by reactant size
-    untrained_reactions.sort(key=lambda reaction: sum([1 for r in reaction.reactants for a in r.molecule[0].atoms if a.is_non_hydrogen()]))
-
-    # Build entries
-    untrained = KineticsDepository(name='{0}/untrained'.format(family.label),
-                                   label='{0}/untrained'.format(family.label))
-    count = 1
-    for reaction in untrained_reactions:
-        untrained.entries['{0}'.format(count)] = Entry(
-            item=reaction,
-            index=count,
-            label=getReactionUrl(reaction),
-        )
-        count += 1
+    tree = {'': [getKineticsTreeNode(section, subsection, entry, log_kdata) for entry in entries]}
+    for entry in tree_entries:
+        if len(entry.children) > 0:
+            tree[str(entry.index)] = [getKineticsTreeNode(section, subsection, child, log_kdata)
+                                      for child in entry.children]
+    return tree
+
+
+def getKineticsTreeNode(section, subsection, entry, log_kdata):
+    """
+    Return the summary of a single node `entry` of a kinetics tree, using
+    the precomputed log10 rate coefficients in `log_kdata`. Rate coefficients
+    without a finite logarithm are given as ``None``, which is valid JSON.
+    """
+    return {
+        'index': entry.index,
+        'label': entry.label,
+        'url': reverse('database:kinetics-entry', kwargs={'section': section, 'subsection': subsection, 'index': entry.index}),
+        'children': len(entry.children),
+        'data': [round(float(log_k), 2) if math.isfinite(log_k) else None for log_k in log_kdata.get(entry.index, [])],
+    }
+
+
+def kineticsTree(request, section, subsection):
+    """
+    Return the children of one node of a kinetics tree as JSON, for
+    expanding the tree in the browser. The node is given by the index in
+    the ``node`` query parameter; without it, the top nodes are returned.
+    """
+    database.load('kinetics', section)
+    try:
+        db = database.get_kinetics_database(section, subsection)
+    except ValueError:
+        raise Http404
+    if db is None or db.top is None or len(db.top) == 0:
+        raise Http404
 
-    return untrained
+    # The summaries of all nodes are found in one pass and only change
+    # when the database is reloaded
+    cache_key = database.cache_key('kinetics-tree-nodes', section, subsection)
+    tree = cache.get(cache_key)
+    if tree is None:
+        tree = getKineticsTreeNodes(db, section, subsection, db.top)
+        cache.set(cache_key, tree, None)
+
+    nodes = tree.get(request.GET.get('node', ''))
+    if nodes is None:
+        raise Http404
+    return plot_data_response(request, {'nodes': nodes}, database.get_section_token('kinetics', section))
 
 ###############################################################################
 
@@ -2160,103 +2472,109 @@ def kinetics(request, section='', subsection=''):
         # A subsection was specified, so render a table of the entries in
         # that part of the database
 
-        is_group_database = False
-
-        # Sort entries by index
-        if db.top is not None and len(db.top) > 0:
-            # If there is a tree in this database, only consider the entries
-            # that are in the tree
-            entries0 = getDatabaseTreeAsList(db, db.top)
+        if db.top is None or len(db.top) == 0:
+            # If there is not a tree, render the first page of a table of
+            # all entries
+            return renderDatabaseTable(request, 'kineticsTable.html', 'kinetics', section, subsection, db,
+                                       getKineticsTableRows(db, subsection),
+                                       lambda row: formatKineticsTableRow(section, subsection, row),
+                                       databaseDesc=db.long_desc, tree='', isGroupDatabase=False)
+
+        is_group_database = isinstance(db, KineticsGroups)
+        tree_url = reverse('database:kinetics-tree', kwargs={'section': section, 'subsection': subsection})
+        tree_version = database.get_section_token('kinetics', section)
+
+        if request.GET.get('full') != '1':
+            # The tree is expanded one node at a time in the browser, so
+            # only the top nodes are sent with the page
+            return render(request, 'kineticsTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'databaseDesc': db.long_desc, 'entries': [], 'tree': '', 'treeUrl': tree_url, 'treeVersion': tree_version, 'isGroupDatabase': is_group_database})
+
+        # If there is a tree in this database, only consider the entries
+        # that are in the tree
+        entries0 = getDatabaseTreeAsList(db, db.top)
+        # The rendered tree only changes when the database is reloaded
+        cache_key = database.cache_key('kinetics-tree', section, subsection)
+        tree = cache.get(cache_key)
+        if tree is None:
             tree = '<ul class="kineticsTree">\n{0}\n</ul>\n'.format(getKineticsTreeHTML(db, section, subsection, db.top))
-        else:
-            # If there is not a tree, consider all entries
-            entries0 = list(db.entries.values())
-            if any(isinstance(item, list) for item in entries0):
-                # if the entries are lists
-                entries0 = reduce(lambda x, y: x+y, entries0)
-            # Sort the entries by index and label
-            entries0.sort(key=lambda entry: (entry.index, entry.label))
-            tree = ''
+            cache.set(cache_key, tree, None)
 
         entries = []
+        if is_group_database:
+            for entry0 in entries0:
+                entries.append({
+                    'index': entry0.index,
+                    'label': entry0.label,
+                    'parent': entry0.parent,
+                    'children': entry0.children,
+                })
+
+        return render(request, 'kineticsTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'databaseDesc': db.long_desc, 'entries': entries, 'tree': tree, 'treeUrl': tree_url, 'treeVersion': tree_version, 'isGroupDatabase': is_group_database})
 
-        for entry0 in entries0:
+    else:
+        # No subsection was specified, so render an outline of the kinetics
+        # database components, only if the outline is not cached
+        kinetics_libraries = SimpleLazyObject(lambda: sorted((label, library) for label, library
+                                                             in database.kinetics.libraries.items()
+                                                             if subsection in label))
+
+        # Untrained reactions are found once when the families are loaded
+        kinetics_families = SimpleLazyObject(lambda: sorted((label, family, database.untrained_reactions.get(label))
+                                                            for label, family in database.kinetics.families.items()
+                                                            if subsection in label))
+        return render(request, 'kinetics.html', {'section': section, 'subsection': subsection, 'kineticsLibraries': kinetics_libraries, 'kineticsFamilies': kinetics_families, 'generation': database.generation})
+
+
+def getKineticsTableRows(db, subsection):
+    """
+    Return the rows of the table of entries in the kinetics database `db`,
+    which does not have a tree.
+    """
+    rows = []
+    for entry in db.entries.values():
+        for entry0 in (entry if isinstance(entry, list) else [entry]):
+            if 'rules' in subsection and isinstance(entry0.item, list):
+                # if the reactants are not group objects, then this rate rule came from
+                # the averaging step, and we don't want to show all of the averaged nodes
+                # in the web view.  We only want to show nodes with direct values or
+                # training rates that became rate rules.
+                continue
             if isinstance(entry0.data, str):
                 data_format = 'Link'
             else:
                 data_format = entry0.data.__class__.__name__
+            rows.append({'index': entry0.index, 'label': entry0.label, 'dataFormat': data_format, 'entry': entry0})
+    return rows
 
-            entry = {
-                'index': entry0.index,
-                'label': entry0.label,
-                'dataFormat': data_format,
-            }
-            if isinstance(db, KineticsGroups):
-                is_group_database = True
-                entry['structure'] = getStructureInfo(entry0.item)
-                entry['parent'] = entry0.parent
-                entry['children'] = entry0.children
-            elif 'rules' in subsection:
-                if isinstance(entry0.item, list):
-                    # if the reactants are not group objects, then this rate rule came from
-                    # the averaging step, and we don't want to show all of the averaged nodes
-                    # in the web view.  We only want to show nodes with direct values or
-                    # training rates that became rate rules.
-                    continue
-                else:
-                    entry['reactants'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.reactants])
-                    entry['products'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.products])
-                    entry['arrow'] = '&hArr;' if entry0.item.reversible else '&rarr;'
-            else:
-                entry['reactants'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.reactants])
-                entry['products'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.products])
-                entry['arrow'] = '&hArr;' if entry0.item.reversible else '&rarr;'
-
-            entries.append(entry)
-
-        return render(request, 'kineticsTable.html', {'section': section, 'subsection': subsection, 'databaseName': db.name, 'databaseDesc': db.long_desc, 'entries': entries, 'tree': tree, 'isGroupDatabase': is_group_database})
 
+def formatKineticsTableRow(section, subsection, row):
+    """
+    Return the reaction and link of a row of a kinetics database table.
+    """
+    reaction = row['entry'].item
+    if subsection.endswith('/untrained'):
+        url = getReactionUrl(reaction)
     else:
-        # No subsection was specified, so render an outline of the kinetics
-        # database components
-        kinetics_libraries = [(label, library) for label, library in database.kinetics.libraries.items() if subsection in label]
-        kinetics_libraries.sort()
-
-        # If this is a subsection, but not the main kinetics page,
-        # we don't need to iterate through the entire database, as this takes a long time to load.
-        try:
-            families_to_process = [database.kinetics.families[subsection]]
-        except KeyError: # if main kinetics page, or some other error
-            families_to_process = database.kinetics.families.values()
-
-        for family in families_to_process:
-            for i in range(0, len(family.depositories)):
-                if 'untrained' in family.depositories[i].name:
-                    family.depositories.pop(i)
-            family.depositories.append(getUntrainedReactions(family))
-        kinetics_families = [(label, family) for label, family in database.kinetics.families.items() if subsection in label]
-        kinetics_families.sort()
-        return render(request, 'kinetics.html', {'section': section, 'subsection': subsection, 'kineticsLibraries': kinetics_libraries, 'kineticsFamilies': kinetics_families})
+        url = reverse('database:kinetics-entry', kwargs={'section': section, 'subsection': subsection, 'index': row['index']})
+    return {
+        'url': url,
+        'reactants': ' + '.join([database.get_structure_info(reactant) for reactant in reaction.reactants]),
+        'products': ' + '.join([database.get_structure_info(reactant) for reactant in reaction.products]),
+        'arrow': '&hArr;' if reaction.reversible else '&rarr;',
+    }
 
 
 def kineticsUntrained(request, family):
     database.load('kinetics', 'families')
-    entries0 = list(getUntrainedReactions(database.kinetics.families[family]).entries.values())
-    entries0.sort(key=lambda entry: (entry.index, entry.label))
-
-    entries = []
-    for entry0 in entries0:
-        entry = {
-                'index': entry0.index,
-                'url': entry0.label,
-            }
-
-        entry['reactants'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.reactants])
-        entry['products'] = ' + '.join([getStructureInfo(reactant) for reactant in entry0.item.products])
-        entry['arrow'] = '&hArr;' if entry0.item.reversible else '&rarr;'
-
-        entries.append(entry)
-    return render(request, 'kineticsTable.html', {'section': 'families', 'subsection': family, 'databaseName': '{0}/untrained'.format(family), 'entries': entries, 'tree': None, 'isGroupDatabase': False})
+    subsection = '{0}/untrained'.format(family)
+    try:
+        db = database.get_kinetics_database('families', subsection)
+    except ValueError:
+        raise Http404
+    return renderDatabaseTable(request, 'kineticsTable.html', 'kinetics', 'families', subsection, db,
+                               getKineticsTableRows(db, subsection),
+                               lambda row: formatKineticsTableRow('families', subsection, row),
+                               tree='', isGroupDatabase=False)
 
 
 def getReactionUrl(reaction, family=None, estimator=None, resonance=True):
@@ -2307,10 +2625,8 @@ def kineticsEntryNew(request, family, type):
     except ValueError:
         raise Http404
 
-    entries = list(db.entries.values())
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x, y: x+y, entries)
+    # Flatten the entries, some of which may be lists of entries
+    entries = [entry for value in db.entries.values() for entry in (value if isinstance(value, list) else [value])]
     entry = None
     if request.method == 'POST':
         form = KineticsEntryEditForm(request.POST, error_class=DivErrorList)
@@ -2430,16 +2746,8 @@ def kineticsEntryEdit(request, section, subsection, index):
     except ValueError:
         raise Http404
 
-    entries = list(db.entries.values())
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x, y: x+y, entries)
-    index = int(index)
-    for entry in entries:
-        if entry.index == index:
-            break
-    else:
-        raise Http404
+    entry = return_common_entry_data(db, section, subsection, index, "kinetics")
+    index = entry.index
 
     if request.method == 'POST':
         form = KineticsEntryEditForm(request.POST, error_class=DivErrorList)
@@ -2528,10 +2836,8 @@ def thermoEntryNew(request, section, subsection, adjlist):
     except ValueError:
         raise Http404
 
-    entries = list(db.entries.values())
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x, y: x + y, entries)
+    # Flatten the entries, some of which may be lists of entries
+    entries = [entry for value in db.entries.values() for entry in (value if isinstance(value, list) else [value])]
     entry = None
     if request.method == 'POST':
         form = ThermoEntryEditForm(request.POST, error_class=DivErrorList)
@@ -2631,16 +2937,8 @@ def thermoEntryEdit(request, section, subsection, index):
     except ValueError:
         raise Http404
 
-    entries = list(db.entries.values())
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x, y: x + y, entries)
-    index = int(index)
-    for entry in entries:
-        if entry.index == index:
-            break
-    else:
-        raise Http404
+    entry = return_common_entry_data(db, section, subsection, index, "thermo")
+    index = entry.index
 
     if request.method == 'POST':
         form = ThermoEntryEditForm(request.POST, error_class=DivErrorList)
@@ -2728,12 +3026,7 @@ def kineticsEntry(request, section, subsection, index):
     except ValueError:
         raise Http404
 
-    entries = list(db.entries.values())
-    if any(isinstance(item, list) for item in entries):
-        # if the entries are lists
-        entries = reduce(lambda x, y: x + y, entries)
-
-    entry = return_common_entry_data(entries, section, subsection, index, "kinetics")
+    entry = return_common_entry_data(db, section, subsection, index, "kinetics")
 
     reference = entry.reference
     reference_type = ''
@@ -2746,8 +3039,14 @@ def kineticsEntry(request, section, subsection, index):
         reactant_num = len(entry.item.reactants)
         degeneracy = entry.item.degeneracy
 
+    # The plot data are fetched separately so that they can be cached by the browser
+    plot_data_url = ''
+    if isinstance(entry.data, KineticsModel):
+        units = request.units.get_units(RATE_PLOT_UNITS)
+        plot_data_url = getPlotDataUrl('kinetics', section, subsection, index, units)
+
     if isinstance(db, KineticsGroups):
-        structure = getStructureInfo(entry.item)
+        structure = database.get_structure_info(entry.item)
         return render(request, 'kineticsEntry.html',
                       {'section': section,
                        'subsection': subsection,
@@ -2756,10 +3055,11 @@ def kineticsEntry(request, section, subsection, index):
                        'structure': structure,
                        'reference': reference,
                        'referenceType': reference_type,
+                       'plotDataUrl': plot_data_url,
                        })
     else:
-        reactants = ' + '.join([getStructureInfo(reactant) for reactant in entry.item.reactants])
-        products = ' + '.join([getStructureInfo(reactant) for reactant in entry.item.products])
+        reactants = ' + '.join([database.get_structure_info(reactant) for reactant in entry.item.reactants])
+        products = ' + '.join([database.get_structure_info(reactant) for reactant in entry.item.products])
         arrow = '&hArr;' if entry.item.reversible else '&rarr;'
 
         # Searching for other instances of the reaction only valid for real reactions, not groups
@@ -2777,9 +3077,33 @@ def kineticsEntry(request, section, subsection, index):
                        'reference': reference,
                        'referenceType': reference_type,
                        'reactionUrl': reaction_url,
+                       'plotDataUrl': plot_data_url,
                        })
 
 
+def kineticsEntryPlotData(request, section, subsection, index):
+    """
+    Return the :math:`k(T,P)` data of an entry in a kinetics database for
+    plotting, as JSON in the units given by the query parameters.
+    """
+    units = get_request_plot_units(request, RATE_PLOT_UNITS)
+    if units is None:
+        return HttpResponseBadRequest('Invalid units.')
+
+    # Load the kinetics database, if necessary
+    database.load('kinetics', section)
+    try:
+        db = database.get_kinetics_database(section, subsection)
+    except ValueError:
+        raise Http404
+    entry = return_common_entry_data(db, section, subsection, index, "kinetics")
+    if not isinstance(entry.data, KineticsModel):
+        raise Http404
+
+    series = get_plot_series('rate-coefficients', entry.data, units, get_rate_coefficient_series)
+    return plot_data_response(request, series, database.get_section_token('kinetics', section))
+
+
 def kineticsGroupEstimateEntry(request, family, estimator, reactant1, product1, reactant2='', reactant3='', product2='', product3='', resonance=True):
     """
     View a kinetics group estimate as an entry.
@@ -2829,9 +3153,9 @@ def kineticsGroupEstimateEntry(request, family, estimator, reactant1, product1,
     for product in reaction0.products:
         generateSpeciesThermo(product, database)
 
-    reactants = ' + '.join([getStructureInfo(reactant) for reactant in reaction0.reactants])
+    reactants = ' + '.join([database.get_structure_info(reactant) for reactant in reaction0.reactants])
     arrow = '&hArr;' if reaction0.reversible else '&rarr;'
-    products = ' + '.join([getStructureInfo(reactant) for reactant in reaction0.products])
+    products = ' + '.join([database.get_structure_info(reactant) for reactant in reaction0.products])
 
     source = '%s (RMG-Py %s)' % (reaction0.family, reaction0.estimator)
 
@@ -2949,6 +3273,56 @@ def kineticsSearch(request):
     return render(request, 'kineticsSearch.html', {'form': form})
 
 
+def kineticsLookup(request):
+    """
+    Return the kinetics library and depository entries for a reaction as
+    JSON, without generating reactions from the kinetics families. The
+    reaction is given by the ``reactant1``-``reactant3`` and (optional)
+    ``product1``-``product3`` query parameters, which are adjacency lists.
+    Entries for the reaction in either direction are returned. The
+    ``section`` parameter ("libraries" or "families") restricts the search
+    to kinetics libraries or to family depositories.
+    """
+    section = request.GET.get('section', '')
+    if section not in ['libraries', 'families', '']:
+        return HttpResponseBadRequest('Invalid value "{0}" for section parameter.'.format(section))
+    sections = [section] if section else ['libraries', 'families']
+
+    species_lists = []
+    for prefix in ['reactant', 'product']:
+        species_list = []
+        for i in range(1, 4):
+            adjlist = request.GET.get('{0}{1}'.format(prefix, i), '')
+            if adjlist == '':
+                continue
+            try:
+                species = Species(molecule=[Molecule().from_adjacency_list(adjlist)])
+            except Exception:
+                return HttpResponseBadRequest('Invalid adjacency list for {0}{1}.'.format(prefix, i))
+            species.generate_resonance_structures()
+            species_list.append(species)
+        species_lists.append(species_list)
+    reactants, products = species_lists
+    if not reactants:
+        return HttpResponseBadRequest('At least one reactant is required.')
+
+    for section in sections:
+        database.load('kinetics', section)
+
+    entries = []
+    for section, subsection, entry, is_forward in database.find_reaction_entries(reactants, products or None, sections):
+        entries.append({
+            'section': section,
+            'subsection': subsection,
+            'index': entry.index,
+            'label': entry.label,
+            'dataFormat': 'Link' if isinstance(entry.data, str) else entry.data.__class__.__name__,
+            'direction': 'forward' if is_forward else 'reverse',
+            'url': reverse('database:kinetics-entry', kwargs={'section': section, 'subsection': subsection, 'index': entry.index}),
+        })
+    return JsonResponse({'entries': entries})
+
+
 def kineticsResults(request, reactant1, reactant2='', reactant3='', product1='', product2='', product3='', resonance=True):
     """
     A view used to present a list of unique reactions that result from a
@@ -2996,9 +3370,9 @@ def kineticsResults(request, reactant1, reactant2='', reactant3='', product1='',
         if not forward:
             reaction = Reaction(reactants=reaction.products,
                                 products=reaction.reactants)
-        reactants = ' + '.join([getStructureInfo(reactant) for reactant in reaction.reactants])
+        reactants = ' + '.join([database.get_structure_info(reactant) for reactant in reaction.reactants])
         arrow = '&hArr;' if reaction.reversible else '&rarr;'
-        products = ' + '.join([getStructureInfo(product) for product in reaction.products])
+        products = ' + '.join([database.get_structure_info(product) for product in reaction.products])
         reaction_url = getReactionUrl(reaction, resonance=resonance)
         reaction_data_list.append([reactants, arrow, products, count, reaction_url])
 
@@ -3069,9 +3443,9 @@ def kineticsData(request, reactant1, reactant2='', reactant3='', product1='', pr
 
         is_forward = reactionHasReactants(reaction, reactant_list)
 
-        reactants = ' + '.join([getStructureInfo(reactant) for reactant in reaction.reactants])
+        reactants = ' + '.join([database.get_structure_info(reactant) for reactant in reaction.reactants])
         arrow = '&hArr;' if reaction.reversible else '&rarr;'
-        products = ' + '.join([getStructureInfo(reactant) for reactant in reaction.products])
+        products = ' + '.join([database.get_structure_info(reactant) for reactant in reaction.products])
         if isinstance(reaction, TemplateReaction):
             counter = ''
             if reaction.estimator == 'rate rules':
@@ -3208,7 +3582,7 @@ def moleculeSearch(request):
             adjlist = posted.cleaned_data['species']
             if adjlist != '':
                 molecule.from_adjacency_list(adjlist)
-                structure_markup = getStructureInfo(molecule)
+                structure_markup = database.get_structure_info(molecule)
                 adjlist = molecule.to_adjacency_list()  # obtain full adjlist, in case hydrogens were non-explicit
 
         try:
@@ -3360,7 +3734,7 @@ def solvationSolventSearch(request):
             adjlist = posted.cleaned_data['adjlist']
             if adjlist != '':
                 molecule.from_adjacency_list(adjlist)
-                structure_markup = getStructureInfo(molecule)
+                structure_markup = database.get_structure_info(molecule)
                 solvent_adjlist = molecule.to_adjacency_list()  # obtain full adjlist, in case hydrogens were non-explicit
 
             if 'solventSearch' in request.POST:
@@ -3786,11 +4160,104 @@ def validate_smiles(mol_input, error_msg, warning_msg, mol_type, allowed_atom_li
     return mol_smiles, error_msg, warning_msg
 
 
+def getSpeciesSearchSources(record, components=None):
+    """
+    Return a list of ``(description, url)`` tuples for the library and
+    depository entries of a species in the search index, optionally only
+    those in the given database `components`.
+    """
+    sources = []
+    for component, section, subsection, index, label in record.sources:
+        if components is not None and component not in components:
+            continue
+        url = reverse('database:{0}-entry'.format(component),
+                      kwargs={'section': section, 'subsection': subsection, 'index': index})
+        sources.append(('{0} {1}: {2}'.format(component.title(), subsection, label), url))
+    return sources
+
+
+def similaritySearch(request):
+    """
+    Return the species with library or depository thermo or transport data
+    that are most similar (by Tanimoto similarity of their fingerprints) to
+    the molecule given by the ``adjlist`` query parameter, as JSON. The
+    ``limit`` parameter sets the number of species returned.
+    """
+    try:
+        molecule = Molecule().from_adjacency_list(request.GET.get('adjlist', ''))
+    except Exception:
+        return HttpResponseBadRequest('Invalid adjacency list.')
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid value for limit parameter.')
+    if not 0 < limit <= 100:
+        return HttpResponseBadRequest('Limit must be between 1 and 100.')
+
+    entries = []
+    for record, similarity in species_index.similarity_search(molecule, limit=limit):
+        entries.append({
+            'label': record.label,
+            'similarity': round(similarity, 4),
+            'adjlist': record.molecule[0].to_adjacency_list(),
+            'sources': [{'description': description, 'url': url}
+                        for description, url in getSpeciesSearchSources(record, ('thermo', 'transport'))],
+        })
+    return JsonResponse({'entries': entries})
+
+
+def autocomplete(request):
+    """
+    Return the labels of library entries and species starting with the
+    ``q`` query parameter, along with their adjacency lists and the number of
+    entries using each label, as JSON. The ``limit`` parameter sets the
+    number of labels returned.
+    """
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid value for limit parameter.')
+    if not 0 < limit <= 50:
+        return HttpResponseBadRequest('Limit must be between 1 and 50.')
+
+    entries = [{'label': label, 'adjlist': adjlist, 'count': count}
+               for label, adjlist, count in label_index.complete(request.GET.get('q', ''), limit=limit)]
+    return JsonResponse({'entries': entries})
+
+
+def substructureSearch(request):
+    """
+    A view for finding the species in the thermo and transport libraries and
+    depositories and the kinetics libraries that contain a functional group,
+    given as a group adjacency list.
+    """
+    form = GroupDrawForm()
+    results = None
+    next_url = ''
+    if 'group' in request.GET:
+        form = GroupDrawForm(request.GET, error_class=DivErrorList)
+        if form.is_valid():
+            adjlist = form.cleaned_data['group']
+            try:
+                cursor = int(request.GET.get('cursor', 0))
+            except ValueError:
+                return HttpResponseBadRequest('Invalid value for cursor parameter.')
+            group = Group().from_adjacency_list(adjlist)
+            records, next_cursor, candidates = species_index.substructure_search(group, cursor=cursor)
+            logger.debug('{0} species passed the substructure search prefilter'.format(candidates))
+            results = [(record, database.get_structure_info(record.molecule[0]), getSpeciesSearchSources(record))
+                       for record in records]
+            if next_cursor is not None:
+                next_url = '{0}?{1}'.format(request.path, urllib.parse.urlencode({'group': adjlist, 'cursor': next_cursor}))
+
+    return render(request, 'substructureSearch.html',
+                  {'form': form, 'results': results, 'nextUrl': next_url})
+
+
 def groupDraw(request):
     """
     Creates webpage form to display group chemgraph upon entering adjacency list.
     """
-    from rmgweb.database.forms import GroupDrawForm
     form = GroupDrawForm()
     structure_markup = ''
     group = Group()
@@ -3830,12 +4297,12 @@ def EniSearch(request):
             detergent = Molecule()
             detergent.from_adjacency_list(detergent_adjlist)
             detergent_smiles = detergent.to_smiles()
-            detergent_structure = getStructureInfo(detergent)
+            detergent_structure = database.get_structure_info(detergent)
 
             deposit = Molecule()
             deposit.from_adjacency_list(deposit_adjlist)
             deposit_smiles = deposit.to_smiles()
-            deposit_structure = getStructureInfo(deposit)
+            deposit_structure = database.get_structure_info(deposit)
 
             detergentA, detergentB = getAbrahamAB(detergent_smiles)
             depositA, depositB = getAbrahamAB(deposit_smiles)
@@ -3870,7 +4337,7 @@ def moleculeEntry(request, adjlist):
         molecule = Molecule().from_adjacency_list(adjlist)
     except:
         return HttpResponseBadRequest('<h1>Bad Request (400)</h1><p>Invalid adjacency list.</p>')
-    structure = getStructureInfo(molecule)
+    structure = database.get_structure_info(molecule)
 
     mol_weight = molecule.get_molecular_weight()
 
@@ -3900,6 +4367,36 @@ def moleculeEntry(request, adjlist):
                    'old_adjlist': old_adjlist})
 
 
+def moleculeAppearances(request, adjlist):
+    """
+    Returns an html page listing every thermo, transport and statmech
+    library or depository entry for the molecule given by `adjlist`.
+    """
+    adjlist = urllib.parse.unquote(adjlist)
+    try:
+        molecule = Molecule().from_adjacency_list(adjlist)
+    except:
+        return HttpResponseBadRequest('<h1>Bad Request (400)</h1><p>Invalid adjacency list.</p>')
+    species = Species(molecule=[molecule])
+    species.generate_resonance_structures()
+
+    database.load('thermo', 'depository')
+    database.load('thermo', 'libraries')
+    database.load('transport', 'libraries')
+    database.load('statmech')
+
+    appearances = []
+    for component, section, subsection, entry in database.find_species_entries(species):
+        href = reverse('database:{0}-entry'.format(component),
+                       kwargs={'section': section, 'subsection': subsection, 'index': entry.index})
+        appearances.append((component, section, subsection, entry, href))
+
+    return render(request, 'moleculeAppearances.html',
+                  {'structure': database.get_structure_info(molecule),
+                   'adjlist': adjlist,
+                   'appearances': appearances})
+
+
 def groupEntry(request, adjlist):
     """
     Returns an html page which includes the image of the group.
@@ -3911,7 +4408,7 @@ def groupEntry(request, adjlist):
         group = Group().from_adjacency_list(adjlist)
     except:
         return HttpResponseBadRequest('<h1>Bad Request (400)</h1><p>Invalid adjacency list.</p>')
-    structure = getStructureInfo(group)
+    structure = database.get_structure_info(group)
 
     return render(request, 'groupEntry.html', {'structure': structure, 'group': group})
 
@@ -3984,13 +4481,13 @@ def generateResonanceStructure(request, adjlist):
         # (item, repr, oct, origin)
         content = []
         if (item in repr_oct) and (item in repr_expoct):
-            content = [getStructureInfo(item), 'repr_both']
+            content = [database.get_structure_info(item), 'repr_both']
         elif item in repr_oct:
-            content = [getStructureInfo(item), 'repr_oct']
+            content = [database.get_structure_info(item), 'repr_oct']
         elif item in repr_expoct:
-            content = [getStructureInfo(item), 'repr_expoct']
+            content = [database.get_structure_info(item), 'repr_expoct']
         else:
-            content = [getStructureInfo(item), 'unre']
+            content = [database.get_structure_info(item), 'unre']
 
         if molecule.is_isomorphic(item):
             content[1] = content[1] + ' origin'
@@ -39,6 +39,8 @@ import subprocess
 import rmgpy
 
 import rmgweb
+from django.utils.functional import SimpleLazyObject
+from rmgweb.main.units import get_unit_preferences
 from rmgweb.settings import PROJECT_PATH
 
 context = None
@@ -62,6 +64,16 @@ def get_announcement(request):
     return msg_context
 
 
+def get_units(request):
+    """
+    Context processor to add the unit preferences of the user as `units`,
+    for passing to the template filters that render quantities.
+    """
+    if hasattr(request, 'units'):
+        return {'units': request.units}
+    return {'units': SimpleLazyObject(lambda: get_unit_preferences(request.user))}
+
+
 def get_git_commit(modulePath):
     """
     Get git commit hash for given repository path.
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module provides array-based evaluation of RMG models for the plots and
+tables on the website. Models with a simple closed form are evaluated with
+NumPy on a whole array of conditions at once; all others fall back to the
+scalar methods provided by RMG-Py.
+"""
+
+import logging
+import math
+
+import numpy as np
+import rmgpy.constants as constants
+from numpy.polynomial.chebyshev import chebgrid2d
+from rmgpy.kinetics import Arrhenius, Chebyshev, MultiArrhenius, MultiPDepArrhenius, PDepArrhenius
+
+logger = logging.getLogger(__name__)
+
+# Whether the vectorized expression for a model class has been checked
+# against the scalar RMG-Py method, keyed by class
+_vectorized_classes = {}
+
+################################################################################
+
+
+def _check_vectorized(model, values, scalar_function, x):
+    """
+    Compare the vectorized `values` computed for `model` at the first and
+    last points of `x` against the scalar `scalar_function` at those points.
+    The comparison is only made the first time each model class is seen,
+    and its result is remembered for the rest of the process.
+    """
+    cls = model.__class__
+    if cls not in _vectorized_classes:
+        expected = np.array([scalar_function(x[0]), scalar_function(x[-1])])
+        _vectorized_classes[cls] = bool(np.allclose(values[[0, -1]], expected, rtol=1e-8, atol=0))
+        if not _vectorized_classes[cls]:
+            logger.warning('Vectorized evaluation of {0} does not match RMG-Py; '
+                           'falling back to scalar evaluation.'.format(cls.__name__))
+    return _vectorized_classes[cls]
+
+################################################################################
+
+
+def _get_arrhenius_terms(kinetics):
+    """
+    Return a list of (A, n, Ea, T0) tuples in SI units whose Arrhenius
+    expressions sum to the given `kinetics`, or ``None`` if the model is not
+    a (sum of) modified Arrhenius expression(s).
+    """
+    if isinstance(kinetics, Arrhenius):
+        return [(kinetics.A.value_si, kinetics.n.value_si, kinetics.Ea.value_si, kinetics.T0.value_si)]
+    elif isinstance(kinetics, MultiArrhenius):
+        terms = []
+        for arrhenius in kinetics.arrhenius:
+            arrhenius_terms = _get_arrhenius_terms(arrhenius)
+            if arrhenius_terms is None:
+                return None
+            terms.extend(arrhenius_terms)
+        return terms
+    return None
+
+
+def evaluate_rate_coefficients(kinetics_list, Tdata, P=1e5):
+    """
+    Evaluate the rate coefficient of every model in `kinetics_list` at each
+    temperature in `Tdata` (in K) and the pressure `P` (in Pa). All Arrhenius
+    models are evaluated together in one vectorized pass. Returns an array of
+    shape ``(len(kinetics_list), len(Tdata))`` in SI units.
+    """
+    Tdata = np.asarray(Tdata, np.float64)
+    kdata = np.zeros((len(kinetics_list), len(Tdata)), np.float64)
+
+    # Collect the Arrhenius terms of all of the models that have them
+    owners, terms, scalar = [], [], []
+    for i, kinetics in enumerate(kinetics_list):
+        kinetics_terms = _get_arrhenius_terms(kinetics)
+        if kinetics_terms is None or _vectorized_classes.get(kinetics.__class__) is False:
+            scalar.append(i)
+        else:
+            owners.extend([i] * len(kinetics_terms))
+            terms.extend(kinetics_terms)
+
+    if terms:
+        A, n, Ea, T0 = (np.array(column, np.float64)[:, np.newaxis] for column in zip(*terms))
+        k = A * (Tdata / T0) ** n * np.exp(-Ea / (constants.R * Tdata))
+        np.add.at(kdata, np.array(owners), k)
+        for i in sorted(set(owners)):
+            kinetics = kinetics_list[i]
+            if not _check_vectorized(kinetics, kdata[i], lambda T: kinetics.get_rate_coefficient(T, P), Tdata):
+                scalar.append(i)
+
+    for i in scalar:
+        kdata[i] = [kinetics_list[i].get_rate_coefficient(T, P) for T in Tdata]
+
+    return kdata
+
+
+def _get_rate_coefficient_grid(kinetics, Tdata, Pdata):
+    """
+    Return the rate coefficients of the pressure-dependent `kinetics` at
+    each pressure in `Pdata` and temperature in `Tdata` as a 2D array with a
+    row for each pressure, or ``None`` if the model has no vectorized form.
+    """
+    if isinstance(kinetics, PDepArrhenius):
+        kdata = np.zeros((len(Pdata), len(Tdata)), np.float64)
+        for i, P in enumerate(Pdata):
+            Plow, Phigh, alow, ahigh = kinetics.get_adjacent_expressions(P)
+            if Plow == Phigh:
+                kdata[i] = evaluate_rate_coefficients([alow], Tdata, P)[0]
+                continue
+            klow, khigh = evaluate_rate_coefficients([alow, ahigh], Tdata, P)
+            # Interpolate linearly in log(k) and log(P) between the two pressures
+            with np.errstate(divide='ignore', invalid='ignore'):
+                k = klow * 10 ** (math.log10(P / Plow) / math.log10(Phigh / Plow) * np.log10(khigh / klow))
+            kdata[i] = np.where((klow == 0) & (khigh == 0), 0.0, k)
+        return kdata
+    elif isinstance(kinetics, MultiPDepArrhenius):
+        kdata = np.zeros((len(Pdata), len(Tdata)), np.float64)
+        for pdep_arrhenius in kinetics.arrhenius:
+            k = _get_rate_coefficient_grid(pdep_arrhenius, Tdata, Pdata)
+            if k is None:
+                return None
+            kdata += k
+        return kdata
+    elif isinstance(kinetics, Chebyshev):
+        Tmin, Tmax = kinetics.Tmin.value_si, kinetics.Tmax.value_si
+        Pmin, Pmax = kinetics.Pmin.value_si, kinetics.Pmax.value_si
+        Tred = (2.0 / Tdata - 1.0 / Tmin - 1.0 / Tmax) / (1.0 / Tmax - 1.0 / Tmin)
+        Pred = (2.0 * np.log10(Pdata) - math.log10(Pmin) - math.log10(Pmax)) / (math.log10(Pmax) - math.log10(Pmin))
+        return 10.0 ** chebgrid2d(Pred, Tred, np.transpose(kinetics.coeffs.value_si))
+    return None
+
+
+def evaluate_rate_coefficient_grid(kinetics, Tdata, Pdata):
+    """
+    Evaluate the rate coefficient of the pressure-dependent `kinetics` at
+    each temperature in `Tdata` (in K) and pressure in `Pdata` (in Pa).
+    PDepArrhenius, MultiPDepArrhenius and Chebyshev models are evaluated on
+    the whole grid at once. Returns an array of shape
+    ``(len(Pdata), len(Tdata))`` in SI units.
+    """
+    Tdata = np.asarray(Tdata, np.float64)
+    Pdata = np.asarray(Pdata, np.float64)
+    kdata = None
+    if _vectorized_classes.get(kinetics.__class__) is not False:
+        kdata = _get_rate_coefficient_grid(kinetics, Tdata, Pdata)
+    if kdata is not None:
+        corners = [(Tdata[0], Pdata[0]), (Tdata[-1], Pdata[-1])]
+        if not _check_vectorized(kinetics, kdata[[0, -1], [0, -1]],
+                                 lambda TP: kinetics.get_rate_coefficient(*TP), corners):
+            kdata = None
+    if kdata is None:
+        kdata = np.array([[kinetics.get_rate_coefficient(T, P) for T in Tdata] for P in Pdata])
+    return kdata
+
+
+def evaluate_log_rate_coefficients(kinetics_list, Tdata, P=1e5):
+    """
+    Evaluate the base-10 logarithm of the rate coefficient of every model in
+    `kinetics_list` at each temperature in `Tdata` (in K) and the pressure
+    `P` (in Pa), as for :func:`evaluate_rate_coefficients`. Rate
+    coefficients that are not positive and finite have no logarithm and are
+    given as NaN.
+    """
+    kdata = evaluate_rate_coefficients(kinetics_list, Tdata, P)
+    log_kdata = np.full_like(kdata, np.nan)
+    np.log10(kdata, out=log_kdata, where=np.isfinite(kdata) & (kdata > 0))
+    return log_kdata
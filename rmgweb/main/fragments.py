@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the cache of the HTML fragments rendered by the
+``render_*_math`` template filters. A fragment depends only on the data it
+shows and the units it is shown in, so it is cached by the content of the
+data and the unit preferences, and shared by every page and process showing
+the same data.
+"""
+
+import functools
+import hashlib
+
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+from rmgweb.main.imagecache import image_cache
+from rmgweb.main.units import get_unit_preferences
+
+
+def get_fragment_identity(obj):
+    """
+    Return a string identifying the content of the object `obj` to render,
+    which is either a data object or a database entry. Return ``None`` if
+    the content cannot be identified because part of it has no proper
+    representation, in which case the fragment should not be cached.
+    """
+    if hasattr(obj, 'data') and hasattr(obj, 'index') and hasattr(obj, 'item'):
+        # A database entry; the representation of an entry shows only its label
+        identity = repr((obj.index, obj.label, repr(obj.item), repr(obj.data), getattr(obj, 'data_count', None)))
+    else:
+        identity = repr(obj)
+    if ' object at 0x' in identity:
+        # The default representation, which identifies only the object's address
+        return None
+    return identity
+
+
+def get_fragment(name, obj, unit_preferences, render):
+    """
+    Return the fragment of the given `name` showing the object `obj` in the
+    units of `unit_preferences`, calling ``render(obj, unit_preferences)`` to
+    create it if it is not cached. The structures whose images the fragment
+    shows are cached with it and remembered by the image cache whenever the
+    cached fragment is used, just as if it had been rendered.
+    """
+    identity = get_fragment_identity(obj)
+    if identity is None:
+        return render(obj, unit_preferences)
+    key = repr((name, identity, unit_preferences.key))
+    cache_key = 'rmgweb:fragment:' + hashlib.md5(key.encode('utf-8')).hexdigest()
+    cached = cache.get(cache_key)
+    if cached is None:
+        with image_cache.record_structures() as structures:
+            fragment = str(render(obj, unit_preferences))
+        cache.set(cache_key, (fragment, structures), None)
+    else:
+        fragment, structures = cached
+        image_cache.add_structures(structures)
+    return mark_safe(fragment)
+
+
+def cached_fragment(render):
+    """
+    Decorate a ``render_*_math(obj, user=None)`` template filter so that the
+    fragments it returns are cached. The decorated filter takes a user or
+    unit preferences, like the original.
+    """
+    @functools.wraps(render)
+    def wrapper(obj, user=None):
+        return get_fragment(render.__name__, obj, get_unit_preferences(user), render)
+    return wrapper
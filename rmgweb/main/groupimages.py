@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the pool of worker processes drawing group structures.
+:meth:`Group.draw` lays out each group by running Graphviz in a new process.
+The workers instead collect the Graphviz input of many groups and lay them
+all out with a single Graphviz process, and the images requested at about
+the same time, such as those of a group tree page, are drawn together.
+"""
+
+import multiprocessing
+import re
+import subprocess
+import threading
+import concurrent.futures
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Number of worker processes drawing groups
+GROUP_DRAW_PROCESSES = max(1, min(2, multiprocessing.cpu_count() - 1))
+# Largest number of groups laid out by one Graphviz process
+GROUP_BATCH_SIZE = 64
+# Time in seconds to wait for other requests to draw groups with
+GROUP_BATCH_DELAY = 0.02
+# Time in seconds to wait for the image of a group before giving up
+GROUP_DRAW_TIMEOUT = 30
+
+# Marks the end of each image in the output of Graphviz
+PNG_END = b'IEND\xaeB`\x82'
+SVG_START = re.compile(rb'(?=<\?xml)')
+
+
+class DotSource(object):
+    """
+    The Graphviz input `source` for a graph laid out with the program `prog`,
+    returned in place of the image by :meth:`Group.draw` in worker processes.
+    """
+
+    def __init__(self, prog, source):
+        self.prog = prog
+        self.source = source
+
+
+def install_dot_capture():
+    """
+    Make pydot return the Graphviz input of graphs instead of running
+    Graphviz to create them. This affects every use of pydot in the process,
+    so it must only be called in the worker processes drawing groups.
+    """
+    import pydot
+
+    def create(self, prog=None, format=None, **kwargs):
+        return DotSource(prog or self.prog, self.to_string())
+
+    pydot.Dot.create = create
+
+
+def clean_group_svg(svg_data):
+    """
+    Return the SVG image `svg_data` of a group as bytes, without the scale
+    and rotate transformations applied by pydot.
+    """
+    if isinstance(svg_data, str):
+        svg_data = svg_data.encode('utf-8')
+    return re.sub(rb'scale\(0\.722222 0\.722222\) rotate\(0\) ', b'', svg_data)
+
+
+def run_graphviz(prog, format, sources):
+    """
+    Lay out the graphs with the Graphviz input `sources` in a single run of
+    the Graphviz program `prog`, returning their images in the given
+    `format`. Return ``None`` if the images could not be told apart.
+    """
+    output = subprocess.run([prog, '-T' + format], input='\n'.join(sources).encode('utf-8'),
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout
+    if format == 'png':
+        images = [image + PNG_END for image in output.split(PNG_END)[:-1]]
+    else:
+        images = [image for image in SVG_START.split(output) if image.strip()]
+    return images if len(images) == len(sources) else None
+
+
+def draw_group_images(adjlists, format):
+    """
+    Return a list of the images of the groups with the given `adjlists` in
+    the given `format`, drawn in a worker process. The entry for a group
+    that could not be drawn is a :class:`ValueError` instead.
+    """
+    from rmgpy.molecule.group import Group
+
+    install_dot_capture()
+    images = [None] * len(adjlists)
+    batches = {}
+    for i, adjlist in enumerate(adjlists):
+        try:
+            result = Group().from_adjacency_list(adjlist).draw(format)
+        except Exception as e:
+            images[i] = ValueError(str(e))
+            continue
+        if isinstance(result, DotSource):
+            batches.setdefault(result.prog, []).append((i, result.source))
+        else:
+            # The group was drawn without pydot
+            images[i] = result
+    for prog, batch in batches.items():
+        try:
+            batch_images = run_graphviz(prog, format, [source for i, source in batch])
+        except (OSError, subprocess.CalledProcessError):
+            batch_images = None
+        if batch_images is None:
+            # Lay out the graphs separately to find the ones that fail
+            batch_images = []
+            for i, source in batch:
+                try:
+                    batch_images.extend(run_graphviz(prog, format, [source]) or [ValueError('Invalid group.')])
+                except (OSError, subprocess.CalledProcessError) as e:
+                    batch_images.append(ValueError(str(e)))
+        for (i, source), image in zip(batch, batch_images):
+            images[i] = image
+    if format == 'svg':
+        images = [image if isinstance(image, ValueError) else clean_group_svg(image) for image in images]
+    return images
+
+
+class GroupDrawingPool(object):
+    """
+    A pool of worker processes drawing group structures in batches. The
+    groups requested by different threads within ``GROUP_BATCH_DELAY``
+    seconds of each other are drawn in the same batch.
+    """
+
+    def __init__(self, processes=GROUP_DRAW_PROCESSES):
+        self.processes = processes
+        self.lock = threading.RLock()
+        self.pool = None
+        self.pending = []
+        self.timer = None
+
+    def get_pool(self):
+        """
+        Return the pool of worker processes, starting it if necessary. The
+        workers are started by a fork server rather than forked from the
+        (threaded) web server. The lock must be held by the caller.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.processes,
+                                            mp_context=multiprocessing.get_context('forkserver'))
+        return self.pool
+
+    def draw(self, adjlist, format):
+        """
+        Return the image of the group with the given `adjlist` in the given
+        `format`. A :class:`ValueError` is raised if the group could not be
+        drawn within ``GROUP_DRAW_TIMEOUT`` seconds.
+        """
+        future = Future()
+        with self.lock:
+            self.pending.append((adjlist, format, future))
+            if len(self.pending) >= GROUP_BATCH_SIZE:
+                self._flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(GROUP_BATCH_DELAY, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        try:
+            return future.result(timeout=GROUP_DRAW_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            raise ValueError('Timed out drawing group.')
+
+    def draw_many(self, adjlists, format):
+        """
+        Return a list of the images of the groups with the given `adjlists`
+        in the given `format`, with a :class:`ValueError` in place of each
+        group that could not be drawn within ``GROUP_DRAW_TIMEOUT`` seconds.
+        """
+        with self.lock:
+            pool = self.get_pool()
+        batches = [adjlists[i:i + GROUP_BATCH_SIZE] for i in range(0, len(adjlists), GROUP_BATCH_SIZE)]
+        futures = [pool.submit(draw_group_images, batch, format) for batch in batches]
+        concurrent.futures.wait(futures, timeout=GROUP_DRAW_TIMEOUT)
+        images = []
+        for batch, future in zip(batches, futures):
+            if future.done() and future.exception() is None:
+                images.extend(future.result())
+                continue
+            if future.done() and isinstance(future.exception(), BrokenProcessPool):
+                # A worker died, so start new ones for the next batch
+                with self.lock:
+                    if self.pool is pool:
+                        self.pool = None
+            future.cancel()
+            images.extend([ValueError('Unable to draw group.')] * len(batch))
+        return images
+
+    def flush(self):
+        """
+        Start drawing the pending groups.
+        """
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        """
+        Start drawing the pending groups, in one batch for each format. The
+        lock must be held by the caller.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending = self.pending, []
+        batches = {}
+        for adjlist, format, future in pending:
+            batches.setdefault(format, []).append((adjlist, future))
+        for format, batch in batches.items():
+            result = self.get_pool().submit(draw_group_images, [adjlist for adjlist, future in batch], format)
+            result.add_done_callback(lambda result, batch=batch: self._resolve(result, batch))
+
+    def _resolve(self, result, batch):
+        """
+        Pass the images drawn by a worker to the requests waiting for them.
+        """
+        try:
+            images = result.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died, so start new ones for the next batch
+                with self.lock:
+                    self.pool = None
+            images = [ValueError(str(e))] * len(batch)
+        for (adjlist, future), image in zip(batch, images):
+            if isinstance(image, ValueError):
+                future.set_exception(image)
+            else:
+                future.set_result(image)
+
+
+# The pool drawing groups for this process
+group_drawing_pool = GroupDrawingPool()
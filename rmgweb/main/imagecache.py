@@ -0,0 +1,483 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the cache of rendered molecule and group structure
+images. Images are addressed by a hash of the normalized adjacency list and
+the image format, so an image never changes once rendered. They are stored
+as files under ``settings.STRUCTURE_IMAGE_ROOT``, with the most recently used
+images also kept in memory.
+"""
+
+import collections
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+
+from rmgweb.main.groupimages import clean_group_svg, group_drawing_pool
+
+logger = logging.getLogger(__name__)
+
+# The content type of each image format
+IMAGE_CONTENT_TYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+# Lifetime in seconds of cached images in browsers; an image never changes
+IMAGE_MAX_AGE = 365 * 24 * 3600
+# Number of images kept in memory by each process
+IMAGE_MEMORY_SIZE = 2048
+# Number of lookups between reports of the hit rate
+IMAGE_REPORT_INTERVAL = 1000
+# Name of the file in the cache directory listing the pre-rendered images
+IMAGE_MANIFEST = 'manifest.json'
+# Interval in seconds between checks for a new manifest
+IMAGE_MANIFEST_INTERVAL = 60
+# Number of structures on recent pages whose adjacency lists are remembered
+IMAGE_STRUCTURES_SIZE = 20000
+# Format name of the files holding the adjacency lists of structures
+IMAGE_STRUCTURE_FORMAT = 'adj'
+# Image format whose keys identify the structures shown on pages
+IMAGE_STRUCTURE_KEY_FORMAT = 'svg'
+# The form of image keys, which are SHA-1 hex digests
+IMAGE_KEY_PATTERN = re.compile(r'[0-9a-f]{40}')
+# Largest number of images returned by one batch request
+IMAGE_BATCH_SIZE = 500
+
+
+def normalize_adjlist(adjlist):
+    """
+    Return the adjacency list `adjlist` with blank lines and redundant
+    whitespace removed, so that adjacency lists differing only in layout
+    share their images.
+    """
+    lines = [' '.join(line.split()) for line in adjlist.strip().splitlines()]
+    return '\n'.join(line for line in lines if line)
+
+
+def is_image_key(key):
+    """
+    Return ``True`` if `key` has the form of an image key, which is all that
+    keeps keys sent by clients from naming files outside the cache directory.
+    """
+    return isinstance(key, str) and IMAGE_KEY_PATTERN.fullmatch(key) is not None
+
+
+def get_image_key(kind, adjlist, format):
+    """
+    Return the key of the image of the given `kind` (``'molecule'`` or
+    ``'group'``) and `format` for an adjacency list `adjlist`.
+    """
+    content = '{0}\n{1}\n{2}'.format(kind, format, normalize_adjlist(adjlist))
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def render_molecule_image(molecule, format):
+    """
+    Return the image of the given `molecule` in the given `format` as bytes.
+    """
+    from rmgpy.molecule.draw import MoleculeDrawer
+
+    if format == 'png':
+        surface, _, _ = MoleculeDrawer().draw(molecule, file_format='png')
+        return surface.write_to_png()
+    else:
+        svg_data = io.BytesIO()
+        MoleculeDrawer().draw(molecule, file_format='svg', target=svg_data)
+        return svg_data.getvalue()
+
+
+def render_group_image(group, format):
+    """
+    Return the image of the given `group` in the given `format` as bytes.
+    """
+    if format == 'png':
+        return group.draw('png')
+    else:
+        return clean_group_svg(group.draw('svg'))
+
+
+def render_structure_image(kind, adjlist, format):
+    """
+    Return the image of the given `kind` (``'molecule'`` or ``'group'``) and
+    `format` for an adjacency list `adjlist` as bytes.
+    """
+    from rmgpy.molecule.group import Group
+    from rmgpy.molecule.molecule import Molecule
+
+    if kind == 'group':
+        return render_group_image(Group().from_adjacency_list(adjlist), format)
+    else:
+        return render_molecule_image(Molecule().from_adjacency_list(adjlist), format)
+
+
+class ImageCache(object):
+    """
+    A two level cache of structure images: an in-memory LRU cache of up to
+    `memory_size` images in front of a directory of image files shared by
+    all processes. The directory is ``settings.STRUCTURE_IMAGE_ROOT`` unless
+    a `root` is given.
+    """
+
+    def __init__(self, root=None, memory_size=IMAGE_MEMORY_SIZE):
+        self._root = root
+        self.memory_size = memory_size
+        self.memory = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.file_hits = 0
+        self.misses = 0
+        self.manifest = {}
+        self.manifest_mtime = None
+        self.manifest_checked = 0
+        self.structures = collections.OrderedDict()
+        self.local = threading.local()
+
+    @property
+    def root(self):
+        """
+        Get the directory holding the image files.
+        """
+        return self._root or settings.STRUCTURE_IMAGE_ROOT
+
+    @property
+    def hit_rate(self):
+        """
+        Get the fraction of lookups found in memory or on disk.
+        """
+        lookups = self.memory_hits + self.file_hits + self.misses
+        return (self.memory_hits + self.file_hits) / lookups if lookups else 0.0
+
+    def get_path(self, key, format):
+        """
+        Return the path of the file holding the image with the given `key`
+        and `format`, relative to the cache directory.
+        """
+        return os.path.join(key[:2], '{0}.{1}'.format(key, format))
+
+    def contains(self, key, format):
+        """
+        Return ``True`` if the image with the given `key` and `format` has
+        been written to the cache directory.
+        """
+        return os.path.exists(os.path.join(self.root, self.get_path(key, format)))
+
+    def add_structure(self, kind, adjlist, format=IMAGE_STRUCTURE_KEY_FORMAT):
+        """
+        Remember the adjacency list `adjlist` of a structure of the given
+        `kind` shown on a page, so that its image in the given `format` can be
+        rendered when requested by key alone. Return the key of the image.
+        """
+        key = get_image_key(kind, adjlist, format)
+        self.add_structures([(key, kind, adjlist)])
+        return key
+
+    def add_structures(self, structures):
+        """
+        Remember the structures in a list of ``(key, kind, adjlist)``
+        `structures`, whose keys have already been computed. Structures new
+        to this process are also written to the cache directory, so that the
+        other processes can render their images.
+        """
+        for recorded in getattr(self.local, 'recording', []):
+            recorded.extend(structures)
+        new_structures = []
+        with self.lock:
+            for key, kind, adjlist in structures:
+                if key not in self.structures:
+                    new_structures.append((key, kind, adjlist))
+                self.structures[key] = (kind, adjlist)
+                self.structures.move_to_end(key)
+            while len(self.structures) > IMAGE_STRUCTURES_SIZE:
+                self.structures.popitem(last=False)
+        for key, kind, adjlist in new_structures:
+            if not self.contains(key, IMAGE_STRUCTURE_FORMAT):
+                self._write(key, IMAGE_STRUCTURE_FORMAT, '{0}\n{1}'.format(kind, adjlist).encode('utf-8'))
+
+    def is_registered(self, kind, adjlist):
+        """
+        Return ``True`` if the structure of the given `kind` with the
+        adjacency list `adjlist` has been shown on a page of the site. Only
+        the images of such structures are written to the cache directory, so
+        that images requested for arbitrary structures cannot fill it.
+        """
+        return self.get_structure(get_image_key(kind, adjlist, IMAGE_STRUCTURE_KEY_FORMAT)) is not None
+
+    def get_structure(self, key):
+        """
+        Return the ``(kind, adjlist)`` of the structure whose image has the
+        given `key`, or ``None`` if the structure was never shown on a page.
+        """
+        if not is_image_key(key):
+            return None
+        with self.lock:
+            structure = self.structures.get(key)
+        if structure is not None:
+            return structure
+        try:
+            with open(os.path.join(self.root, self.get_path(key, IMAGE_STRUCTURE_FORMAT)), 'rb') as f:
+                kind, adjlist = f.read().decode('utf-8').split('\n', 1)
+        except (OSError, ValueError):
+            return None
+        with self.lock:
+            self.structures[key] = (kind, adjlist)
+            while len(self.structures) > IMAGE_STRUCTURES_SIZE:
+                self.structures.popitem(last=False)
+        return kind, adjlist
+
+    @contextlib.contextmanager
+    def record_structures(self):
+        """
+        Collect the ``(key, kind, adjlist)`` of the structures remembered by
+        this thread within the context in the list it yields. Markup showing
+        the structures can then be cached along with them, and the structures
+        remembered again whenever the cached markup is used.
+        """
+        if not hasattr(self.local, 'recording'):
+            self.local.recording = []
+        recorded = []
+        self.local.recording.append(recorded)
+        try:
+            yield recorded
+        finally:
+            self.local.recording.remove(recorded)
+
+    def get_manifest(self):
+        """
+        Return the manifest of pre-rendered images, which maps the key of
+        each image to its path in the cache directory. The manifest file is
+        checked for changes at most every ``IMAGE_MANIFEST_INTERVAL`` seconds.
+        """
+        now = time.time()
+        if now - self.manifest_checked >= IMAGE_MANIFEST_INTERVAL:
+            self.manifest_checked = now
+            path = os.path.join(self.root, IMAGE_MANIFEST)
+            try:
+                mtime = os.stat(path).st_mtime
+                if mtime != self.manifest_mtime:
+                    with open(path) as f:
+                        self.manifest = json.load(f)['images']
+                    self.manifest_mtime = mtime
+            except (OSError, ValueError, KeyError):
+                self.manifest = {}
+                self.manifest_mtime = None
+        return self.manifest
+
+    def get_manifest_version(self):
+        """
+        Return the modification time of the manifest of pre-rendered images,
+        which changes whenever the manifest is replaced, or ``None`` if there
+        is no manifest.
+        """
+        self.get_manifest()
+        return self.manifest_mtime
+
+    def write_manifest(self, images):
+        """
+        Atomically replace the manifest with one listing the given `images`,
+        a dictionary mapping the key of each image to its path.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'images': images}, f, sort_keys=True)
+        os.replace(temp_path, os.path.join(self.root, IMAGE_MANIFEST))
+        self.manifest_checked = 0
+
+    def get(self, key, format):
+        """
+        Return the cached image with the given `key` and `format`, or
+        ``None`` if it has not been rendered.
+        """
+        if not is_image_key(key):
+            return None
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                self._report()
+                return data
+        try:
+            with open(os.path.join(self.root, self.get_path(key, format)), 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self.lock:
+                self.misses += 1
+                self._report()
+            return None
+        with self.lock:
+            self.file_hits += 1
+            self._remember(key, data)
+            self._report()
+        return data
+
+    def set(self, key, format, data, persist=True):
+        """
+        Store the image `data` with the given `key` and `format`. Unless
+        `persist` is ``False``, the image is also written to a file. The file
+        is written atomically, so other processes never read a partial image.
+        Failing to write the file is logged, and the image is then only kept
+        in memory. A :class:`ValueError` is raised for an invalid `key`.
+        """
+        if not is_image_key(key):
+            raise ValueError('Invalid image key {0!r}.'.format(key))
+        with self.lock:
+            self._remember(key, data)
+        if persist:
+            self._write(key, format, data)
+
+    def _write(self, key, format, data):
+        """
+        Atomically write the file holding the `data` with the given `key` and
+        `format`, logging any failure to write it.
+        """
+        path = os.path.join(self.root, self.get_path(key, format))
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            logger.warning('Unable to write structure image file {0}.'.format(path), exc_info=True)
+
+    def _remember(self, key, data):
+        """
+        Keep the image `data` with the given `key` in memory, forgetting the
+        least recently used image if the cache is full. The lock must be
+        held by the caller.
+        """
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def _report(self):
+        """
+        Log the hit rate every ``IMAGE_REPORT_INTERVAL`` lookups. The lock
+        must be held by the caller.
+        """
+        lookups = self.memory_hits + self.file_hits + self.misses
+        if lookups % IMAGE_REPORT_INTERVAL == 0:
+            logger.info('Structure image cache in process {0}: {1:d} lookups, {2:.1%} hit rate '
+                        '({3:d} from memory, {4:d} from disk).'.format(os.getpid(), lookups, self.hit_rate,
+                                                                       self.memory_hits, self.file_hits))
+
+
+# The structure image cache of this process
+image_cache = ImageCache()
+
+
+def get_etag(key):
+    """
+    Return the strong ETag of the image with the given `key`.
+    """
+    return '"{0}"'.format(key)
+
+
+def get_image_url(kind, adjlist, format='png'):
+    """
+    Return the URL of the pre-rendered image of the given `kind` and
+    `format` for an adjacency list `adjlist`, which is served directly from
+    ``settings.STRUCTURE_IMAGE_URL``, or ``None`` if the image is not listed
+    in the manifest.
+    """
+    path = image_cache.get_manifest().get(get_image_key(kind, adjlist, format))
+    if path is None:
+        return None
+    return settings.STRUCTURE_IMAGE_URL + path.replace(os.sep, '/')
+
+
+def get_structure_images(keys, format='svg'):
+    """
+    Return a dictionary of the images in the given `format` for the given
+    image `keys`, rendering those that are not cached but whose structures
+    are remembered. Keys of other images are left out, so the images have to
+    be requested separately.
+    """
+    images = {}
+    groups = []
+    for key in keys:
+        data = image_cache.get(key, format)
+        if data is not None:
+            images[key] = data
+            continue
+        structure = image_cache.get_structure(key)
+        if structure is None:
+            continue
+        kind, adjlist = structure
+        if kind == 'group':
+            groups.append((key, adjlist))
+        else:
+            try:
+                images[key] = render_structure_image(kind, adjlist, format)
+            except Exception:
+                continue
+            image_cache.set(key, format, images[key])
+    if groups:
+        for (key, adjlist), data in zip(groups, group_drawing_pool.draw_many([adjlist for key, adjlist in groups],
+                                                                             format)):
+            if not isinstance(data, Exception):
+                images[key] = data
+                image_cache.set(key, format, data)
+    return images
+
+
+def image_response(request, key, format, render, persist=True):
+    """
+    Return the response for the image with the given `key` and `format`,
+    calling `render` with no arguments to create the image if it is not
+    cached. A rendered image is only kept in memory unless `persist` is
+    ``True``. An image never changes, so a browser revalidating an image it
+    already has is answered without looking the image up at all.
+    """
+    etag = get_etag(key)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        data = image_cache.get(key, format)
+        if data is None:
+            data = render()
+            image_cache.set(key, format, data, persist=persist)
+        response = HttpResponse(data, content_type=IMAGE_CONTENT_TYPES[format])
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age={0:d}, immutable'.format(IMAGE_MAX_AGE)
+    return response
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains the helpers for sending the data series plotted with
+Highcharts, either as JavaScript variables within a page or as cacheable
+JSON responses fetched by the page.
+"""
+
+import hashlib
+import json
+import math
+
+import numpy as np
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+
+from rmgweb.main.models import UserProfile
+from rmgweb.main.units import UNIT_FIELDS
+
+# Number of significant digits kept in plotted values
+PLOT_DIGITS = 6
+# Lifetime in seconds of plot data whose URL identifies the database version
+PLOT_DATA_MAX_AGE = 365 * 24 * 3600
+
+# The allowed choices for each kind of plot units, which are those of the
+# matching user profile field
+PLOT_UNIT_CHOICES = {name: UserProfile._meta.get_field(field).choices for name, field in UNIT_FIELDS.items()}
+
+
+def compact(values, digits=PLOT_DIGITS):
+    """
+    Return the number or (nested) sequence of numbers `values` as plain
+    floats rounded to `digits` significant digits, which keeps the plot data
+    short. Values that are not finite become ``None``.
+    """
+    if isinstance(values, (list, tuple, np.ndarray)):
+        return [compact(value, digits) for value in values]
+    value = float(values)
+    if not math.isfinite(value):
+        return None
+    return float('{0:.{1}g}'.format(value, digits))
+
+
+def get_plot_series(name, model, units, generate):
+    """
+    Return the plot data series of the given `name` for a kinetics, thermo
+    or states `model` in the given `units`, calling ``generate(model, **units)``
+    to create them if they are not cached. The data are cached by the full
+    representation of the model, so identical models share the cached data.
+    A model without a proper representation is not cached.
+    """
+    identity = repr(model)
+    if ' object at 0x' in identity:
+        # The default representation, which identifies only the object's address
+        return generate(model, **units)
+    key = repr((name, identity, sorted(units.items())))
+    cache_key = 'rmgweb:plot:' + hashlib.md5(key.encode('utf-8')).hexdigest()
+    series = cache.get(cache_key)
+    if series is None:
+        series = generate(model, **units)
+        cache.set(cache_key, series, None)
+    return series
+
+
+def format_plot_variables(series):
+    """
+    Return JavaScript code assigning each of the plot data `series` to the
+    variable of the same name, as used by the plotting scripts.
+    """
+    return ''.join('{0} = {1};\n'.format(name, json.dumps(value, separators=(',', ':')))
+                   for name, value in series.items())
+
+
+def get_request_plot_units(request, defaults):
+    """
+    Return the units given in the query parameters of the `request` for
+    each kind of plot units in `defaults`, which holds the units to use if a
+    parameter is missing. Return ``None`` if any of the units are not among
+    the choices offered to users.
+    """
+    units = {}
+    for name, default in defaults.items():
+        units[name] = request.GET.get(name, default)
+        if units[name] not in [choice for choice, label in PLOT_UNIT_CHOICES[name]]:
+            return None
+    return units
+
+
+def plot_data_response(request, series, version):
+    """
+    Return the plot data `series` as a JSON response with an ETag. If the
+    ``v`` query parameter matches the current `version` of the data, the
+    response can be cached by browsers for a long time, since its URL will
+    change with the data.
+    """
+    content = json.dumps(series, separators=(',', ':'))
+    etag = '"{0}"'.format(hashlib.md5(content.encode('utf-8')).hexdigest())
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    if request.GET.get('v') == version:
+        response['Cache-Control'] = 'public, max-age={0}'.format(PLOT_DATA_MAX_AGE)
+    else:
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
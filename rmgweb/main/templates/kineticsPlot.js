@@ -1,4 +1,7 @@
-plotKinetics = function (id, kseries, average = true) {
+plotKinetics = function (id, kseries, average = true, units = window) {
+    // The units are read from the page variables unless they are given
+    var Tunits = units.Tunits;
+    var kunits = units.kunits;
     var series = [];
     var identicalkUnits = true;
 
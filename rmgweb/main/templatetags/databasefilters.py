@@ -38,6 +38,8 @@ from django import template
 from django.utils.safestring import mark_safe
 from rmgpy.quantity import Quantity
 
+from rmgweb.main.units import get_conversion_factor
+
 # Register this module as a Django template tag library
 register = template.Library()
 
@@ -48,7 +50,7 @@ def renderMW(MW):
     Renders molecular weight from SI units to the regular g/mol units we are used to.
     """
     mass = Quantity(MW, 'kg/mol').value
-    multfactor = Quantity(1, 'g/mol').get_conversion_factor_from_si()
+    multfactor = get_conversion_factor('g/mol')
     return mark_safe("{0:.2f}".format(mass*multfactor))
 
 
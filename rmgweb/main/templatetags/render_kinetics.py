@@ -32,21 +32,27 @@
 Provides template tags for rendering kinetics models in various ways.
 """
 
+import functools
 import math
 import numpy as np
 from django import template
 from django.utils.safestring import mark_safe
-from rmgpy.quantity import Quantity
 from rmgpy.kinetics import *
 
-from rmgweb.main.models import UserProfile
+from rmgweb.main.evaluate import evaluate_rate_coefficient_grid, evaluate_rate_coefficients
+from rmgweb.main.fragments import cached_fragment
+from rmgweb.main.plotdata import compact, format_plot_variables, get_plot_series
 from rmgweb.main.tools import getLaTeXScientificNotation, getStructureMarkup
+from rmgweb.main.units import get_conversion_factor, get_unit_preferences
 
 # Register this module as a Django template tag library
 register = template.Library()
 
 ################################################################################
 
+# Default units of the plotted rate coefficients
+RATE_PLOT_UNITS = {'Tunits': 'K', 'Punits': 'Pa', 'rate_units': 'm^3,mol,s'}
+
 UNIT_TYPES = {
     'cm': 'length',
     'm': 'length',
@@ -184,9 +190,11 @@ def construct_rate_units(dimensionality, desired_units):
     return units
 
 
+@functools.lru_cache(maxsize=256)
 def reconstruct_rate_units(units, desired_units, add_conc_dim=False):
     """
-    Reconstruct the specified units using the desired base units.
+    Reconstruct the specified units using the desired base units. The
+    results are memoized, since there are only a few distinct arguments.
 
     For example, if m^6/(mol^2*s) is provided and the desired units are
     cm^3, molecule, s, then return cm^6/(molecule^2*s).
@@ -225,13 +233,13 @@ def reconstruct_rate_units(units, desired_units, add_conc_dim=False):
     return construct_rate_units(dimensionality, unit_dict)
 
 
-def getRateCoefficientUnits(kinetics, user=None):
+def getRateCoefficientUnits(kinetics, user=None, desired_units=None):
     """
     For a given `kinetics` model, return the desired rate coefficient units
     at high and low pressures, the conversion factor from SI to those units
-    (high pressure), and the number of reactant species. If a `user` is
-    specified, the user's preferred units will be used; otherwise default units
-    will be used.
+    (high pressure), and the number of reactant species. If `desired_units`
+    or a `user` is specified, those base units or the user's preferred units
+    will be used; otherwise default units will be used.
     """
     # Get units from based on the kinetics type
     if isinstance(kinetics, (Arrhenius, ArrheniusEP, ArrheniusBM,
@@ -241,7 +249,7 @@ def getRateCoefficientUnits(kinetics, user=None):
     elif isinstance(kinetics, KineticsData):
         units = kinetics.kdata.units
     elif isinstance(kinetics, (PDepArrhenius, MultiArrhenius, MultiPDepArrhenius)):
-        return getRateCoefficientUnits(kinetics.arrhenius[0])
+        return getRateCoefficientUnits(kinetics.arrhenius[0], user=user, desired_units=desired_units)
     elif isinstance(kinetics, Chebyshev):
         units = kinetics.kunits
     elif isinstance(kinetics, Troe):
@@ -253,13 +261,9 @@ def getRateCoefficientUnits(kinetics, user=None):
     else:
         raise NotImplementedError('Cannot get units for {0} class.'.format(kinetics.__class__.__name__))
 
-    if user and user.is_authenticated:
-        # If user is logged in, get their desired units
-        user_profile = UserProfile.objects.get(user=user)
-        desired_units = user_profile.rate_coefficient_units
-    else:
-        # Default base units
-        desired_units = 'm^3,mol,s'
+    if desired_units is None:
+        # Get the user's desired units, or the default base units
+        desired_units = get_unit_preferences(user).get_units({'rate_units': 'm^3,mol,s'})['rate_units']
 
     if units == '':
         # Dimensionless
@@ -268,7 +272,7 @@ def getRateCoefficientUnits(kinetics, user=None):
         # Reconstruct the rate units using the desired base units
         kunits = reconstruct_rate_units(units, desired_units)
         kunits_low = reconstruct_rate_units(units, desired_units, add_conc_dim=True)
-        kfactor = Quantity(1, kunits).get_conversion_factor_from_si()
+        kfactor = get_conversion_factor(kunits)
 
         return kunits, kunits_low, kfactor
 
@@ -276,6 +280,7 @@ def getRateCoefficientUnits(kinetics, user=None):
 
 
 @register.filter
+@cached_fragment
 def render_kinetics_math(kinetics, user=None):
     """
     Return a math representation of the given `kinetics` using MathJax. If a
@@ -285,19 +290,13 @@ def render_kinetics_math(kinetics, user=None):
     if kinetics is None:
         return mark_safe("<p>There are no kinetics for this entry.</p>")
     # Define other units and conversion factors to use
-    if user and user.is_authenticated:
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = user_profile.temperature_units
-        Punits = user_profile.pressure_units
-        Eunits = user_profile.energy_units
-    else:
-        Tunits = 'K'
-        Punits = 'Pa'
-        Eunits = 'J/mol'
-    kunits, kunits_low, kfactor = getRateCoefficientUnits(kinetics, user=user)
-    Tfactor = Quantity(1, Tunits).get_conversion_factor_from_si()
-    Pfactor = Quantity(1, Punits).get_conversion_factor_from_si()
-    Efactor = Quantity(1, Eunits).get_conversion_factor_from_si()
+    unit_preferences = get_unit_preferences(user)
+    units = unit_preferences.get_units({'Tunits': 'K', 'Punits': 'Pa', 'Eunits': 'J/mol'})
+    Tunits, Punits, Eunits = units['Tunits'], units['Punits'], units['Eunits']
+    kunits, kunits_low, kfactor = getRateCoefficientUnits(kinetics, user=unit_preferences)
+    Tfactor = unit_preferences.get_factor(Tunits)
+    Pfactor = unit_preferences.get_factor(Punits)
+    Efactor = unit_preferences.get_factor(Eunits)
     if kunits == 's^-1':
         kunits = 's^{-1}'
 
@@ -506,6 +505,17 @@ k(T,P) = k_0(T) [\mathrm{{M}}]
 ################################################################################
 
 
+def get_rate_coefficient_array(kinetics, Tlist, Plist=None):
+    """
+    Return the rate coefficients of `kinetics` in SI units at each of the
+    temperatures in `Tlist` as an array or, if pressures `Plist` are given,
+    as a 2D array with a row for each pressure.
+    """
+    if Plist is None:
+        return evaluate_rate_coefficients([kinetics], Tlist)[0]
+    return evaluate_rate_coefficient_grid(kinetics, Tlist, Plist)
+
+
 @register.filter
 def get_rate_coefficients(kinetics, user=None):
     """
@@ -520,30 +530,21 @@ def get_rate_coefficients(kinetics, user=None):
 
     if user == "A_n_Ea":
         # Not a user, but a request to just return the Arrhenius coefficients
-        return_A_n_Ea = True
-        user = None
-    else:
-        return_A_n_Ea = False
+        return mark_safe(get_plot_series('arrhenius-fit', kinetics, {}, get_fitted_arrhenius))
 
-    # Define other units and conversion factors to use
-    if user and user.is_authenticated:
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = user_profile.temperature_units
-        Punits = user_profile.pressure_units
-        Eunits = user_profile.energy_units
-    else:
-        Tunits = 'K'
-        Punits = 'Pa'
-        Eunits = 'J/mol'
-    kunits, kunits_low, kfactor = getRateCoefficientUnits(kinetics, user=user)
-    Tfactor = Quantity(1, Tunits).get_conversion_factor_from_si()
-    Pfactor = Quantity(1, Punits).get_conversion_factor_from_si()
-    Efactor = Quantity(1, Eunits).get_conversion_factor_from_si()
-
-    # Generate data to use for plots
-    Tdata = []
-    Pdata = []
-    kdata = []
+    units = get_unit_preferences(user).get_units(RATE_PLOT_UNITS)
+    series = get_plot_series('rate-coefficients', kinetics, units, get_rate_coefficient_series)
+    return mark_safe(format_plot_variables(series))
+
+
+def get_rate_coefficient_data(kinetics, kfactor):
+    """
+    Return the temperatures and pressures at which to plot `kinetics` and
+    the rate coefficients at them, scaled by `kfactor`, as a tuple of arrays
+    ``(Tdata, Pdata, kdata, Tdata2, Pdata2, kdata2)``. The first set is for
+    plotting against temperature and the second against pressure; the
+    pressures are empty unless the kinetics are pressure-dependent.
+    """
     if kinetics.Tmin is not None and kinetics.Tmax is not None:
         if kinetics.Tmin.value_si == kinetics.Tmax.value_si:
             Tmin = kinetics.Tmin.value_si - 5
@@ -564,93 +565,96 @@ def get_rate_coefficients(kinetics, user=None):
     # Number of points in Tlist (ten times that in Pdep's Tlist2)
     points = 50
 
-    for Tinv in np.linspace(1.0 / Tmax, 1.0 / Tmin, points):
-        Tdata.append(1.0 / Tinv)
+    Pdata = np.zeros(0)
+    Tdata = 1.0 / np.linspace(1.0 / Tmax, 1.0 / Tmin, points)
     if kinetics.is_pressure_dependent():
-        for logP in np.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 1):
-            Pdata.append(10**logP)
-        for P in Pdata:
-            klist = []
-            for T in Tdata:
-                klist.append(kinetics.get_rate_coefficient(T, P) * kfactor)
-            kdata.append(klist)
+        Pdata = 10 ** np.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 1)
+        kdata = get_rate_coefficient_array(kinetics, Tdata, Pdata) * kfactor
     elif isinstance(kinetics, (ArrheniusEP, ArrheniusBM)):
-        for T in Tdata:
-            kdata.append(kinetics.get_rate_coefficient(T, dHrxn=0) * kfactor)
+        kdata = np.array([kinetics.get_rate_coefficient(T, dHrxn=0) for T in Tdata]) * kfactor
     elif isinstance(kinetics, (StickingCoefficient, StickingCoefficientBEP)):
-        for T in Tdata:
-            kdata.append(kinetics.get_sticking_coefficient(T) * kfactor)
+        kdata = np.array([kinetics.get_sticking_coefficient(T) for T in Tdata]) * kfactor
     else:
-        for T in Tdata:
-            kdata.append(kinetics.get_rate_coefficient(T) * kfactor)
-
-    Tdata2 = []
-    Pdata2 = []
-    kdata2 = []
-    for Tinv in np.linspace(1.0 / Tmax, 1.0 / Tmin, points // 10):
-        Tdata2.append(1.0 / Tinv)
+        kdata = get_rate_coefficient_array(kinetics, Tdata) * kfactor
+
+    Pdata2 = np.zeros(0)
+    Tdata2 = 1.0 / np.linspace(1.0 / Tmax, 1.0 / Tmin, points // 10)
     if kinetics.is_pressure_dependent():
-        for logP in np.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 0.1):
-            Pdata2.append(10**logP)
-        for P in Pdata2:
-            klist = []
-            for T in Tdata2:
-                klist.append(kinetics.get_rate_coefficient(T, P) * kfactor)
-            kdata2.append(klist)
+        Pdata2 = 10 ** np.arange(math.log10(Pmin), math.log10(Pmax)+0.001, 0.1)
+        kdata2 = get_rate_coefficient_array(kinetics, Tdata2, Pdata2) * kfactor
     elif isinstance(kinetics, (ArrheniusEP, ArrheniusBM)):
-        for T in Tdata2:
-            kdata2.append(kinetics.get_rate_coefficient(T, dHrxn=0) * kfactor)
+        kdata2 = np.array([kinetics.get_rate_coefficient(T, dHrxn=0) for T in Tdata2]) * kfactor
     elif isinstance(kinetics, (StickingCoefficient, StickingCoefficientBEP)):
-        for T in Tdata:
-            kdata2.append(kinetics.get_sticking_coefficient(T) * kfactor)
+        kdata2 = np.array([kinetics.get_sticking_coefficient(T) for T in Tdata]) * kfactor
     else:
-        for T in Tdata2:
-            kdata2.append(kinetics.get_rate_coefficient(T) * kfactor)
-
-    if return_A_n_Ea:
-        "We are only interested in the (fitted) Arrhenius parameters (and their units)"
-        Tlist = np.array([T * Tfactor for T in Tdata], np.float64)
-
-        if kinetics.is_pressure_dependent():
-            # Use the highest pressure we have available
-            klist = np.array(kdata[-1], np.float64)
-            pressure_note = " (At {0} {1})".format(Pdata[-1], Punits)
-            k_model = Arrhenius().fit_to_data(Tlist, klist, kunits)
-        elif isinstance(kinetics, (StickingCoefficient, StickingCoefficientBEP)):
-            klist = np.array(kdata, np.float64)
-            pressure_note = ""
-            k_model = StickingCoefficient().fit_to_data(Tlist, klist, kunits)
-        elif isinstance(kinetics, (SurfaceArrhenius, SurfaceArrheniusBEP)):
-            klist = np.array(kdata, np.float64)
-            pressure_note = ""
-            k_model = SurfaceArrhenius().fit_to_data(Tlist, klist, kunits)
-        else:
-            klist = np.array(kdata, np.float64)
-            pressure_note = ""
-            k_model = Arrhenius().fit_to_data(Tlist, klist, kunits)
-
-        return mark_safe("""A = {0}; n = {1}; Ea = {2}; Aunits = "{3}"; Eunits = "{4}"; Pnote = "{5}";""".format(
-                            k_model.A.value_si * kfactor,
-                            k_model.n.value_si,
-                            k_model.Ea.value_si * Efactor,
-                            kunits,
-                            Eunits,
-                            pressure_note
-                        ))
-
-    return mark_safe("""Tlist = {0};Plist = {1};klist = {2};
-                        Tlist2 = {3};Plist2 = {4}; klist2 = {5};
-                        Tunits = "{6}";Punits = "{7}";kunits = "{8}";""".format(
-                             [T * Tfactor for T in Tdata],
-                             [P * Pfactor for P in Pdata],
-                             kdata,
-                             [T * Tfactor for T in Tdata2],
-                             [P * Pfactor for P in Pdata2],
-                             kdata2,
-                             Tunits,
-                             Punits,
-                             kunits,
-                         ))
+        kdata2 = get_rate_coefficient_array(kinetics, Tdata2) * kfactor
+
+    return Tdata, Pdata, kdata, Tdata2, Pdata2, kdata2
+
+
+def get_rate_coefficient_series(kinetics, Tunits='K', Punits='Pa', rate_units='m^3,mol,s'):
+    """
+    Return the :math:`k(T,P)` data for plotting `kinetics` as a dictionary
+    of series, using the given temperature and pressure units and base
+    units for the rate coefficient.
+    """
+    kunits, kunits_low, kfactor = getRateCoefficientUnits(kinetics, desired_units=rate_units)
+    Tfactor = get_conversion_factor(Tunits)
+    Pfactor = get_conversion_factor(Punits)
+    Tdata, Pdata, kdata, Tdata2, Pdata2, kdata2 = get_rate_coefficient_data(kinetics, kfactor)
+    return {
+        'Tlist': compact(Tdata * Tfactor),
+        'Plist': compact(Pdata * Pfactor),
+        'klist': compact(kdata),
+        'Tlist2': compact(Tdata2 * Tfactor),
+        'Plist2': compact(Pdata2 * Pfactor),
+        'klist2': compact(kdata2),
+        'Tunits': Tunits,
+        'Punits': Punits,
+        'kunits': kunits,
+    }
+
+
+def get_fitted_arrhenius(kinetics):
+    """
+    Fit an Arrhenius expression to the rate coefficients of `kinetics`, at
+    the highest pressure available if they are pressure-dependent, and
+    return JavaScript setting its parameters and their default units.
+    """
+    Punits = 'Pa'
+    Eunits = 'J/mol'
+    kunits, kunits_low, kfactor = getRateCoefficientUnits(kinetics)
+    Efactor = get_conversion_factor(Eunits)
+    Tdata, Pdata, kdata, Tdata2, Pdata2, kdata2 = get_rate_coefficient_data(kinetics, kfactor)
+
+    Tlist = np.array(Tdata, np.float64)
+
+    if kinetics.is_pressure_dependent():
+        # Use the highest pressure we have available
+        klist = np.array(kdata[-1], np.float64)
+        pressure_note = " (At {0} {1})".format(float(Pdata[-1]), Punits)
+        k_model = Arrhenius().fit_to_data(Tlist, klist, kunits)
+    elif isinstance(kinetics, (StickingCoefficient, StickingCoefficientBEP)):
+        klist = np.array(kdata, np.float64)
+        pressure_note = ""
+        k_model = StickingCoefficient().fit_to_data(Tlist, klist, kunits)
+    elif isinstance(kinetics, (SurfaceArrhenius, SurfaceArrheniusBEP)):
+        klist = np.array(kdata, np.float64)
+        pressure_note = ""
+        k_model = SurfaceArrhenius().fit_to_data(Tlist, klist, kunits)
+    else:
+        klist = np.array(kdata, np.float64)
+        pressure_note = ""
+        k_model = Arrhenius().fit_to_data(Tlist, klist, kunits)
+
+    return """A = {0}; n = {1}; Ea = {2}; Aunits = "{3}"; Eunits = "{4}"; Pnote = "{5}";""".format(
+                        k_model.A.value_si * kfactor,
+                        k_model.n.value_si,
+                        k_model.Ea.value_si * Efactor,
+                        kunits,
+                        Eunits,
+                        pressure_note
+                    )
 
 
 ###############################################################################
@@ -39,6 +39,8 @@ from rmgpy.species import Species
 from rmgpy.molecule.group import Group
 from rmgpy.data.solvation import SoluteData, SolventData, SolvationCorrection
 
+from rmgweb.main.fragments import cached_fragment
+
 # Register this module as a Django template tag library
 register = template.Library()
 
@@ -66,6 +68,7 @@ def print_param_list(param_list, result, decimal_place=2, unit=''):
 
 
 @register.filter
+@cached_fragment
 def render_solvation_math(solvation, user=None):
     """
     Return a math representation of the given `solvation` using MathJax. If a
@@ -37,17 +37,26 @@ import math
 import numpy as np
 from django import template
 from django.utils.safestring import mark_safe
-from rmgpy.quantity import Quantity, ArrayQuantity
+from rmgpy.quantity import ArrayQuantity
 from rmgpy.statmech import *
 import rmgpy.constants as constants
 
-from rmgweb.main.models import UserProfile
+from rmgweb.main.plotdata import compact, format_plot_variables, get_plot_series
+from rmgweb.main.units import get_conversion_factor, get_unit_preferences
 
 # Register this module as a Django template tag library
 register = template.Library()
 
 logger = logging.getLogger(__name__)
 
+# Default units of the plotted states data
+STATES_PLOT_UNITS = {'Tunits': 'K', 'Eunits': 'kcal/mol'}
+# Temperatures in K, energies in J/mol and rotor angles in rad at which the
+# states data are plotted
+STATES_TLIST = np.arange(10, 2001, 10, dtype=float)
+STATES_ELIST = np.arange(0, 400001, 1000, dtype=float)
+STATES_PHILIST = np.arange(0, 2 * math.pi, math.pi / 200)
+
 ################################################################################
 
 
@@ -59,12 +68,9 @@ def render_states_math(states, user=None):
     default units will be used.
     """
     # Define other units and conversion factors to use
-    if user and user.is_authenticated:
-        user_profile = UserProfile.objects.get(user=user)
-        Eunits = user_profile.energy_units
-    else:
-        Eunits = 'kcal/mol'
-    Efactor = Quantity(1, Eunits).get_conversion_factor_from_si()
+    unit_preferences = get_unit_preferences(user)
+    Eunits = unit_preferences.get_units({'Eunits': 'kcal/mol'})['Eunits']
+    Efactor = unit_preferences.get_factor(Eunits)
 
     # The string that will be returned to the template
     result = ''
@@ -171,75 +177,127 @@ def get_states_data(states, user=None):
     using Highcharts. If a `user` is specified, the user's preferred units
     will be used; otherwise default units will be used.
     """
-    import rmgpy.constants as constants
-    # Define other units and conversion factors to use
-    if user and user.is_authenticated:
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = user_profile.temperature_units
-        Eunits = user_profile.energy_units
-    else:
-        Tunits = 'K'
-        Eunits = 'kcal/mol'
-    Tfactor = Quantity(1, Tunits).get_conversion_factor_from_si()
-    Efactor = Quantity(1, Eunits).get_conversion_factor_from_si()
-    Qunits = ''
-    Qfactor = 1.0
-    rhounits = 'per cm^-1'
+    units = get_unit_preferences(user).get_units(STATES_PLOT_UNITS)
+    series = get_plot_series('states', states, units, get_states_series)
+    return mark_safe(format_plot_variables(series))
+
+
+def get_states_series(states, Tunits='K', Eunits='kcal/mol'):
+    """
+    Return the partition function, density of states and hindered rotor
+    potentials of `states` for plotting as a dictionary of series, using
+    the given temperature and energy units.
+    """
+    Tfactor = get_conversion_factor(Tunits)
+    Efactor = get_conversion_factor(Eunits)
     rhofactor = constants.h * constants.c * 100 * constants.Na
-    phiunits = 'rad'
-    phifactor = 1.0
-    Vunits = Eunits
-    Vfactor = Efactor
-
-    # Generate data to use for plots
-    Tdata = []
-    Qdata = []
-    for T in np.arange(10, 2001, 10):
-        Tdata.append(T * Tfactor)
-        Qdata.append(states.get_partition_function(T) * Qfactor)
-
-    Edata = np.arange(0, 400001, 1000, np.float)
-    rhodata = []
+
+    # The data are evaluated in SI units once for each set of states
+    data = get_plot_series('states-data', states, {}, get_states_arrays)
+
+    return {
+        'Tlist': compact(np.array(data['Tlist'], float) * Tfactor),
+        'Qlist': data['Qlist'],
+        'Elist': compact(np.array(data['Elist'], float) * Efactor),
+        'rholist': compact(np.array(data['rholist'], float) * rhofactor),
+        'philist': data['philist'],
+        'Vlist': [compact(np.array(V, float) * Efactor) for V in data['Vlist']],
+        'Tunits': Tunits,
+        'Qunits': '',
+        'Eunits': Eunits,
+        'rhounits': 'per cm^-1',
+        'phiunits': 'rad',
+        'Vunits': Eunits,
+    }
+
+
+def get_states_arrays(states):
+    """
+    Return the partition function, density of states and hindered rotor
+    potentials of `states` in SI units at the temperatures, energies and
+    angles at which they are plotted.
+    """
+    rholist = []
     try:
-        rhodata = states.get_density_of_states(Edata)
+        rholist = states.get_density_of_states(STATES_ELIST)
     except Exception as e:
         logger.error("Could not calculate density of states: %s", e)
-        pass
-    Edata = list(Edata * Efactor)
-    if len(rhodata) != 0:
-        rhodata = list(rhodata * rhofactor)
 
-    phidata = np.arange(0, 2 * math.pi, math.pi / 200)
-    Vdata = []
+    return {
+        'Tlist': compact(STATES_TLIST),
+        'Qlist': compact(get_partition_function_array(states, STATES_TLIST)),
+        'Elist': compact(STATES_ELIST),
+        'rholist': compact(rholist),
+        'philist': compact(STATES_PHILIST),
+        'Vlist': [compact(get_rotor_potential_array(mode, STATES_PHILIST))
+                  for mode in states.modes if isinstance(mode, HinderedRotor)],
+    }
+
+
+def get_mode_partition_function_array(mode, Tlist):
+    """
+    Return the partition function of a single degree of freedom `mode` at
+    each temperature in the array `Tlist`. The translation, classical
+    rotation and vibration partition functions are evaluated for all of
+    the temperatures at once; other modes are evaluated one temperature at
+    a time.
+    """
+    quantum = getattr(mode, 'quantum', True)
+    if isinstance(mode, IdealGasTranslation) and not quantum:
+        qt = ((2 * math.pi * mode.mass.value_si) / (constants.h * constants.h)) ** 1.5 / 101325.
+        return qt * (constants.kB * Tlist) ** 2.5
+    elif isinstance(mode, LinearRotor) and not quantum:
+        theta = constants.h * constants.h / (8 * math.pi * math.pi * mode.inertia.value_si * constants.kB)
+        return Tlist / theta / mode.symmetry
+    elif isinstance(mode, NonlinearRotor) and not quantum:
+        theta = np.prod(constants.h * constants.h / (8 * math.pi * math.pi * mode.inertia.value_si * constants.kB))
+        return np.sqrt(math.pi * Tlist ** 3 / theta) / mode.symmetry
+    elif isinstance(mode, HarmonicOscillator):
+        x = np.outer(mode.frequencies.value_si, constants.h * constants.c * 100. / constants.kB / Tlist)
+        if quantum:
+            return np.prod(1.0 / (1.0 - np.exp(-x)), axis=0)
+        else:
+            return np.prod(1.0 / x, axis=0)
+    else:
+        return np.array([mode.get_partition_function(T) for T in Tlist])
+
+
+def get_partition_function_array(states, Tlist):
+    """
+    Return the partition function of `states` at each temperature in the
+    array `Tlist`, as the product of the partition functions of its modes.
+    The factors applied to the product as a whole, such as the spin
+    multiplicity, are found by comparing with the partition function
+    evaluated by `states` at the lowest temperature, and the result is
+    checked at the highest. If they do not agree, e.g. because of an active
+    K-rotor, the partition function is evaluated one temperature at a time.
+    """
+    Qlist = np.ones_like(Tlist)
     for mode in states.modes:
-        if isinstance(mode, HinderedRotor):
-            Vdata.append([mode.get_potential(phi) * Vfactor for phi in phidata])
-    phidata = list(phidata * phifactor)
-
-    return mark_safe("""
-Tlist = {0};
-Qlist = {1};
-Elist = {2};
-rholist = {3};
-philist = {4};
-Vlist = {5};
-Tunits = "{6}";
-Qunits = "{7}";
-Eunits = "{8}";
-rhounits = "{9}";
-phiunits = "{10}";
-Vunits = "{11}";
-    """.format(
-        Tdata,
-        Qdata,
-        Edata,
-        rhodata,
-        phidata,
-        Vdata,
-        Tunits,
-        Qunits,
-        Eunits,
-        rhounits,
-        phiunits,
-        Vunits,
-    ))
+        Qlist *= get_mode_partition_function_array(mode, Tlist)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Qlist *= states.get_partition_function(Tlist[0]) / Qlist[0]
+    if not np.all(np.isfinite(Qlist)) or not np.isclose(Qlist[-1], states.get_partition_function(Tlist[-1]),
+                                                         rtol=1e-6):
+        Qlist = np.array([states.get_partition_function(T) for T in Tlist])
+    return Qlist
+
+
+def get_rotor_potential_array(mode, philist):
+    """
+    Return the potential of the hindered rotor `mode` at each angle in the
+    array `philist`. The result is checked against the potential evaluated
+    by `mode` at one of the angles, and evaluated one angle at a time if
+    they do not agree.
+    """
+    if mode.fourier:
+        fourier = mode.fourier.value_si
+        k = np.arange(1, fourier.shape[1] + 1)
+        Vlist = np.dot(fourier[0, :], np.cos(np.outer(k, philist))) + np.dot(fourier[1, :], np.sin(np.outer(k, philist)))
+        Vlist -= np.sum(fourier[0, :])
+    else:
+        Vlist = 0.5 * mode.barrier.value_si * (1 - np.cos(mode.symmetry * philist))
+    i = len(philist) // 3
+    if not np.isclose(Vlist[i], mode.get_potential(philist[i]), rtol=1e-6, atol=1e-6):
+        Vlist = np.array([mode.get_potential(phi) for phi in philist])
+    return Vlist
@@ -36,6 +36,8 @@ from django import template
 from django.utils.safestring import mark_safe
 from rmgpy.data.statmech import *
 
+from rmgweb.main.fragments import cached_fragment
+
 # Register this module as a Django template tag library
 register = template.Library()
 
@@ -43,6 +45,7 @@ register = template.Library()
 
 
 @register.filter
+@cached_fragment
 def render_statmech_math(statmech, user=None):
     """
     Return a math representation of the given `transport` using MathJax. If a
@@ -36,19 +36,25 @@ import numpy as np
 from django import template
 from django.utils.safestring import mark_safe
 from django.urls import reverse
-from rmgpy.quantity import Quantity
+import rmgpy.constants as constants
 from rmgpy.thermo import *
 
+from rmgweb.main.fragments import cached_fragment
 from rmgweb.main.tools import getLaTeXScientificNotation
-from rmgweb.main.models import UserProfile
+from rmgweb.main.plotdata import compact, format_plot_variables, get_plot_series
+from rmgweb.main.units import get_conversion_factor, get_unit_preferences
 
 # Register this module as a Django template tag library
 register = template.Library()
 
+# Default units of the plotted thermodynamics data
+THERMO_PLOT_UNITS = {'Tunits': 'K', 'Cpunits': 'cal/(mol*K)', 'Hunits': 'kcal/mol'}
+
 ################################################################################
 
 
 @register.filter
+@cached_fragment
 def render_thermo_math(thermo, user=None):
     """
     Return a math representation of the given `thermo` using MathJax. If a
@@ -56,21 +62,14 @@ def render_thermo_math(thermo, user=None):
     default units will be used.
     """
     # Define other units and conversion factors to use
-    if user and user.is_authenticated:
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = user_profile.temperature_units
-        Cpunits = user_profile.heat_capacity_units
-        Hunits = user_profile.energy_units
-        Sunits = user_profile.heat_capacity_units
-    else:
-        Tunits = 'K'
-        Cpunits = 'cal/(mol*K)'
-        Hunits = 'kcal/mol'
-        Sunits = 'cal/(mol*K)'
-    Tfactor = Quantity(1, Tunits).get_conversion_factor_from_si()
-    Cpfactor = Quantity(1, Cpunits).get_conversion_factor_from_si()
-    Hfactor = Quantity(1, Hunits).get_conversion_factor_from_si()
-    Sfactor = Quantity(1, Sunits).get_conversion_factor_from_si()
+    unit_preferences = get_unit_preferences(user)
+    units = unit_preferences.get_units(THERMO_PLOT_UNITS)
+    Tunits, Cpunits, Hunits = units['Tunits'], units['Cpunits'], units['Hunits']
+    Sunits = Cpunits
+    Tfactor = unit_preferences.get_factor(Tunits)
+    Cpfactor = unit_preferences.get_factor(Cpunits)
+    Hfactor = unit_preferences.get_factor(Hunits)
+    Sfactor = unit_preferences.get_factor(Sunits)
 
     # The string that will be returned to the template
     result = ''
@@ -270,26 +269,51 @@ def get_thermo_data(thermo, user=None):
     if not isinstance(thermo, (ThermoData, Wilhoit, NASA)):
         return ''
 
-    # Define other units and conversion factors to use
-    if user and user.is_authenticated:
-        user_profile = UserProfile.objects.get(user=user)
-        Tunits = user_profile.temperature_units
-        Cpunits = user_profile.heat_capacity_units
-        Hunits = user_profile.energy_units
-        Sunits = user_profile.heat_capacity_units
-        Gunits = user_profile.energy_units
-    else:
-        Tunits = 'K'
-        Cpunits = 'cal/(mol*K)'
-        Hunits = 'kcal/mol'
-        Sunits = 'cal/(mol*K)'
-        Gunits = 'kcal/mol'
-    Tfactor = Quantity(1, Tunits).get_conversion_factor_from_si()
-    Cpfactor = Quantity(1, Cpunits).get_conversion_factor_from_si()
-    Hfactor = Quantity(1, Hunits).get_conversion_factor_from_si()
-    Sfactor = Quantity(1, Sunits).get_conversion_factor_from_si()
-    Gfactor = Quantity(1, Gunits).get_conversion_factor_from_si()
+    units = get_unit_preferences(user).get_units(THERMO_PLOT_UNITS)
+    series = get_plot_series('thermo', thermo, units, get_thermo_series)
+    if not series:
+        return ''
+    return mark_safe(format_plot_variables(series))
+
+
+def get_thermo_series(thermo, Tunits='K', Cpunits='cal/(mol*K)', Hunits='kcal/mol'):
+    """
+    Return the heat capacity, enthalpy, entropy and free energy of `thermo`
+    for plotting as a dictionary of series, using the given temperature,
+    heat capacity (and entropy) and energy units. The dictionary is empty if
+    the thermo data are incomplete.
+    """
+    Sunits = Cpunits
+    Gunits = Hunits
+    Tfactor = get_conversion_factor(Tunits)
+    Cpfactor = get_conversion_factor(Cpunits)
+    Hfactor = get_conversion_factor(Hunits)
+    Sfactor = get_conversion_factor(Sunits)
+    Gfactor = get_conversion_factor(Gunits)
 
+    # The data are evaluated in SI units once for each thermo model
+    data = get_plot_series('thermo-data', thermo, {}, get_thermo_arrays)
+    if not data:
+        return {}
+
+    return {
+        'Tlist': compact(np.array(data['Tlist']) * Tfactor),
+        'Cplist': compact(np.array(data['Cplist']) * Cpfactor),
+        'Hlist': compact(np.array(data['Hlist']) * Hfactor),
+        'Slist': compact(np.array(data['Slist']) * Sfactor),
+        'Glist': compact(np.array(data['Glist']) * Gfactor),
+        'Tunits': Tunits,
+        'Cpunits': Cpunits,
+        'Hunits': Hunits,
+        'Sunits': Sunits,
+        'Gunits': Gunits,
+    }
+
+
+def get_thermo_temperatures(thermo):
+    """
+    Return the array of temperatures in K at which `thermo` is plotted.
+    """
     if thermo.Tmin is not None and thermo.Tmax is not None:
         Tmin = thermo.Tmin.value_si
         Tmax = thermo.Tmax.value_si
@@ -299,46 +323,125 @@ def get_thermo_data(thermo, user=None):
     else:
         Tmin = 300
         Tmax = 2000
-    Tdata = []
-    Cpdata = []
-    Hdata = []
-    Sdata = []
-    Gdata = []
+    return np.arange(Tmin, Tmax+1, 10, dtype=float)
 
+
+def get_thermo_arrays(thermo):
+    """
+    Return the heat capacity, enthalpy, entropy and free energy of `thermo`
+    in SI units at the temperatures at which they are plotted. NASA
+    polynomials are evaluated for all of the temperatures at once. For other
+    models the heat capacity is evaluated at once on a finer grid and
+    integrated from the enthalpy and entropy at the lowest temperature.
+    The result is checked against the values evaluated by `thermo`, and
+    evaluated one temperature at a time if they do not agree. The
+    dictionary is empty if the thermo data are incomplete.
+    """
+    Tlist = get_thermo_temperatures(thermo)
     try:
-        for T in np.arange(Tmin, Tmax+1, 10):
-            Tdata.append(T * Tfactor)
-            Cpdata.append(thermo.get_heat_capacity(T) * Cpfactor)
-            Hdata.append(thermo.get_enthalpy(T) * Hfactor)
-            Sdata.append(thermo.get_entropy(T) * Sfactor)
-            Gdata.append(thermo.get_free_energy(T) * Gfactor)
-
-        return mark_safe("""
-    Tlist = {0};
-    Cplist = {1};
-    Hlist = {2};
-    Slist = {3};
-    Glist = {4};
-    Tunits = "{5!s}";
-    Cpunits = "{6!s}";
-    Hunits = "{7!s}";
-    Sunits = "{8!s}";
-    Gunits = "{9!s}";
-        """.format(
-            Tdata,
-            Cpdata,
-            Hdata,
-            Sdata,
-            Gdata,
-            Tunits,
-            Cpunits,
-            Hunits,
-            Sunits,
-            Gunits,
-            ))
+        try:
+            if isinstance(thermo, NASA):
+                Cplist, Hlist, Slist = get_nasa_arrays(thermo, Tlist)
+            else:
+                Cplist, Hlist, Slist = get_integrated_thermo_arrays(thermo, Tlist)
+            check_thermo_arrays(thermo, Tlist, Cplist, Hlist, Slist)
+        except (ValueError, AttributeError, ZeroDivisionError):
+            Cplist = np.array([thermo.get_heat_capacity(T) for T in Tlist])
+            Hlist = np.array([thermo.get_enthalpy(T) for T in Tlist])
+            Slist = np.array([thermo.get_entropy(T) for T in Tlist])
     except:
         # don't fail completely if thermo data is incomplete
-        return ''
+        return {}
+
+    return {
+        'Tlist': compact(Tlist),
+        'Cplist': compact(Cplist),
+        'Hlist': compact(Hlist),
+        'Slist': compact(Slist),
+        'Glist': compact(Hlist - Tlist * Slist),
+    }
+
+
+def get_heat_capacity_array(thermo, Tlist):
+    """
+    Return the heat capacity of the `thermo` data or Wilhoit model at each
+    temperature in the array `Tlist`. The heat capacity of thermo data is
+    interpolated linearly between the data points and kept constant above
+    the highest one.
+    """
+    if isinstance(thermo, Wilhoit):
+        cp0 = thermo.Cp0.value_si
+        cpInf = thermo.CpInf.value_si
+        y = Tlist / (Tlist + thermo.B.value_si)
+        return cp0 + (cpInf - cp0) * y * y * (1 + (y - 1) * (thermo.a0 + y * (thermo.a1 + y * (thermo.a2 + y * thermo.a3))))
+    elif isinstance(thermo, ThermoData):
+        if thermo.Tdata is None or thermo.Cpdata is None:
+            raise ValueError('Heat capacity data are missing.')
+        if Tlist[0] < thermo.Tdata.value_si[0]:
+            raise ValueError('Temperature {0:g} K is below the heat capacity data.'.format(Tlist[0]))
+        return np.interp(Tlist, thermo.Tdata.value_si, thermo.Cpdata.value_si)
+    raise ValueError('Unexpected thermo model {0}.'.format(thermo.__class__.__name__))
+
+
+def get_integrated_thermo_arrays(thermo, Tlist, steps=10):
+    """
+    Return the heat capacity, enthalpy and entropy of the `thermo` data or
+    Wilhoit model at each temperature in the evenly spaced array `Tlist`.
+    The enthalpy and entropy are integrated from their values at the first
+    temperature using the trapezoidal rule, with `steps` intervals between
+    each pair of temperatures.
+    """
+    if len(Tlist) < 2:
+        raise ValueError('At least two temperatures are needed.')
+    Tfine = np.linspace(Tlist[0], Tlist[-1], (len(Tlist) - 1) * steps + 1)
+    Cpfine = get_heat_capacity_array(thermo, Tfine)
+    dT = np.diff(Tfine)
+    Hfine = np.concatenate(([0.0], np.cumsum(0.5 * dT * (Cpfine[1:] + Cpfine[:-1]))))
+    CpTfine = Cpfine / Tfine
+    Sfine = np.concatenate(([0.0], np.cumsum(0.5 * dT * (CpTfine[1:] + CpTfine[:-1]))))
+    Hfine += thermo.get_enthalpy(Tlist[0])
+    Sfine += thermo.get_entropy(Tlist[0])
+    return Cpfine[::steps], Hfine[::steps], Sfine[::steps]
+
+
+def get_nasa_arrays(thermo, Tlist):
+    """
+    Return the heat capacity, enthalpy and entropy of the NASA polynomials
+    `thermo` at each temperature in the array `Tlist`, using the first
+    polynomial valid at each temperature.
+    """
+    R = constants.R
+    Cplist = np.full_like(Tlist, np.nan)
+    Hlist = np.full_like(Tlist, np.nan)
+    Slist = np.full_like(Tlist, np.nan)
+    for poly in thermo.polynomials:
+        valid = np.isnan(Cplist) & (Tlist >= poly.Tmin.value_si) & (Tlist <= poly.Tmax.value_si)
+        T = Tlist[valid]
+        T2 = T * T
+        T4 = T2 * T2
+        Cplist[valid] = ((poly.c0 + T * (poly.c1 + T * (poly.c2 + T * (poly.c3 + poly.c4 * T))))
+                         + poly.cm2 / T2 + poly.cm1 / T) * R
+        Hlist[valid] = ((-poly.cm2 / T + poly.cm1 * np.log(T)) / T + poly.c0 + poly.c1 * T / 2.
+                        + poly.c2 * T2 / 3. + poly.c3 * T2 * T / 4. + poly.c4 * T4 / 5. + poly.c5 / T) * R * T
+        Slist[valid] = ((-poly.cm2 / T / 2. - poly.cm1) / T + poly.c0 * np.log(T) + poly.c1 * T
+                        + poly.c2 * T2 / 2. + poly.c3 * T2 * T / 3. + poly.c4 * T4 / 4. + poly.c6) * R
+    if np.any(np.isnan(Cplist)):
+        raise ValueError('No NASA polynomial is valid at some of the temperatures.')
+    return Cplist, Hlist, Slist
+
+
+def check_thermo_arrays(thermo, Tlist, Cplist, Hlist, Slist):
+    """
+    Raise a :class:`ValueError` unless the heat capacity, enthalpy and
+    entropy arrays agree with the values evaluated by `thermo` in the middle
+    and at the end of the array of temperatures `Tlist`.
+    """
+    for i in [len(Tlist) // 2, -1]:
+        T = Tlist[i]
+        if not (np.isclose(Cplist[i], thermo.get_heat_capacity(T), rtol=1e-5, atol=1e-3)
+                and np.isclose(Hlist[i], thermo.get_enthalpy(T), rtol=1e-5, atol=1.0)
+                and np.isclose(Slist[i], thermo.get_entropy(T), rtol=1e-5, atol=1e-3)):
+            raise ValueError('Thermo arrays do not agree with the model at {0:g} K.'.format(T))
 
 ################################################################################
 
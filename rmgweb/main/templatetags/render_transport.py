@@ -37,6 +37,8 @@ from django.utils.safestring import mark_safe
 from rmgpy.transport import *
 from rmgpy.data.transport import *
 
+from rmgweb.main.fragments import cached_fragment
+
 # Register this module as a Django template tag library
 register = template.Library()
 
@@ -44,6 +46,7 @@ register = template.Library()
 
 
 @register.filter
+@cached_fragment
 def render_transport_math(transport, user=None):
     """
     Return a math representation of the given `transport` using MathJax. If a
@@ -42,6 +42,8 @@ from rmgpy.molecule.group import Group
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.species import Species
 
+from rmgweb.main.imagecache import get_image_url, image_cache
+
 ################################################################################
 
 
@@ -61,8 +63,9 @@ def moleculeToInfo(molecule):
     Creates an html rendering which includes molecule structure image but
     also allows you to click on it to enter a molecule info page.
     """
-    href = reverse('database:molecule-entry', kwargs={'adjlist': molecule.to_adjacency_list()})
-    structure_markup = getStructureMarkup(molecule)
+    adjlist = molecule.to_adjacency_list()
+    href = reverse('database:molecule-entry', kwargs={'adjlist': adjlist})
+    structure_markup = getImageMarkup('molecule', adjlist, adjlist)
     markup = '<a href="' + href + '">' + structure_markup + '</a>'
     return markup
 
@@ -95,8 +98,9 @@ def groupToInfo(group):
     Creates an html rendering which includes group structure image but
     also allows you to click on it to enter a group info page.
     """
-    href = reverse('database:group-entry', kwargs={'adjlist': group.to_adjacency_list()})
-    structure_markup = getStructureMarkup(group)
+    adjlist = group.to_adjacency_list()
+    href = reverse('database:group-entry', kwargs={'adjlist': adjlist})
+    structure_markup = getImageMarkup('group', adjlist, adjlist)
     markup = '<a href="' + href + '">' + structure_markup + '</a>'
     return markup
 
@@ -135,6 +139,29 @@ def getStructureInfo(object):
         return str(object)
     else:
         return ''
+
+
+def getItemStructures(item):
+    """
+    Yield the ``(kind, adjlist)`` of each structure drawn for the `item` of
+    a database entry, with the adjacency lists used in the image URLs.
+    """
+    from rmgpy.reaction import Reaction
+
+    if isinstance(item, Molecule):
+        yield 'molecule', item.to_adjacency_list(remove_h=False)
+    elif isinstance(item, Species):
+        if len(item.molecule) > 0:
+            yield 'molecule', item.molecule[0].to_adjacency_list(remove_h=False)
+    elif isinstance(item, Group):
+        yield 'group', item.to_adjacency_list()
+    elif isinstance(item, Reaction):
+        for species in item.reactants + item.products:
+            yield from getItemStructures(species)
+    elif isinstance(item, (list, tuple)):
+        for subitem in item:
+            yield from getItemStructures(subitem)
+
 ################################################################################
 
 
@@ -157,6 +184,21 @@ def getLaTeXScientificNotation(value):
 ################################################################################
 
 
+def getImageMarkup(kind, adjlist, title):
+    """
+    Return an ``<img>`` tag for the image of a structure of the given `kind`
+    (``'molecule'`` or ``'group'``) with the adjacency list `adjlist`. The
+    image is not loaded by the browser itself: the page fetches the images of
+    all of its structures in one request to the ``draw-structures`` endpoint,
+    falling back to the URL of the single image in ``data-src``. Without
+    JavaScript, the image is loaded from that URL by a ``<noscript>`` copy.
+    """
+    src = get_image_url(kind, adjlist) or reverse('draw-' + kind, kwargs={'adjlist': urllib.parse.quote(adjlist)})
+    key = image_cache.add_structure(kind, adjlist)
+    return ('<img data-src="{0}" data-structure="{1}" alt="{2}" title="{2}"/>'
+            '<noscript><img src="{0}" alt="{2}" title="{2}"/></noscript>'.format(src, key, title))
+
+
 def getStructureMarkup(item):
     """
     Return the HTML used to markup structure information for the given `item`.
@@ -167,21 +209,18 @@ def getStructureMarkup(item):
     if isinstance(item, Molecule):
         # We can draw Molecule objects, so use that instead of an adjacency list
         adjlist = item.to_adjacency_list(remove_h=False)
-        url = urllib.parse.quote(adjlist)
-        structure = '<img src="{0}" alt="{1}" title="{1}"/>'.format(reverse('draw-molecule', kwargs={'adjlist': url}), adjlist)
+        structure = getImageMarkup('molecule', adjlist, adjlist)
     elif isinstance(item, Species) and len(item.molecule) > 0:
         # We can draw Species objects, so use that instead of an adjacency list
         adjlist = item.molecule[0].to_adjacency_list(remove_h=False)
-        url = urllib.parse.quote(adjlist)
-        structure = '<img src="{0}" alt="{1}" title="{1}"/>'.format(reverse('draw-molecule', kwargs={'adjlist': url}), item.label)
+        structure = getImageMarkup('molecule', adjlist, item.label)
     elif isinstance(item, Species) and len(item.molecule) == 0:
         # We can draw Species objects, so use that instead of an adjacency list
         structure = item.label
     elif isinstance(item, Group):
         # We can draw Group objects, so use that instead of an adjacency list
         adjlist = item.to_adjacency_list()
-        url = urllib.parse.quote(adjlist)
-        structure = '<img src="{0}" alt="{1}" title="{1}" />'.format(reverse('draw-group', kwargs={'adjlist': url}), adjlist)
+        structure = getImageMarkup('group', adjlist, adjlist)
         # structure += '<pre style="font-size:small;" class="adjacancy_list">{0}</pre>'.format(adjlist)
     elif isinstance(item, str) or isinstance(item, str):
         structure = item
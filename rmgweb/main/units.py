@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+"""
+This module contains the unit preferences used to render quantities. They
+are looked up from the user profile at most once per request and shared by
+all of the template filters rendering the request.
+"""
+
+import functools
+
+from django.utils.functional import SimpleLazyObject
+from rmgpy.quantity import Quantity
+
+from rmgweb.main.models import UserProfile
+
+# The user profile field holding the preferred units of each kind
+UNIT_FIELDS = {
+    'Tunits': 'temperature_units',
+    'Punits': 'pressure_units',
+    'Eunits': 'energy_units',
+    'Hunits': 'energy_units',
+    'Cpunits': 'heat_capacity_units',
+    'rate_units': 'rate_coefficient_units',
+}
+
+
+@functools.lru_cache(maxsize=256)
+def get_conversion_factor(units):
+    """
+    Return the factor converting from SI to the given `units`. Only a few
+    dozen different units are ever rendered, so the factors are memoized.
+    """
+    return Quantity(1, units).get_conversion_factor_from_si()
+
+
+class UnitPreferences(object):
+    """
+    The units in which a user prefers to see quantities, taken from their
+    :class:`UserProfile`. Without a `user_profile` there are no preferences,
+    and the default units of each filter are used.
+    """
+
+    def __init__(self, user_profile=None):
+        self.preferences = {}
+        if user_profile is not None:
+            for field in set(UNIT_FIELDS.values()):
+                self.preferences[field] = getattr(user_profile, field)
+
+    @property
+    def key(self):
+        """
+        Get a hashable key identifying these unit preferences.
+        """
+        return tuple(sorted(self.preferences.items()))
+
+    def get_units(self, defaults):
+        """
+        Return the preferred units for each kind of units in `defaults`,
+        which holds the units to use for kinds without a preference.
+        """
+        return {name: self.preferences.get(UNIT_FIELDS[name], default) for name, default in defaults.items()}
+
+    def get_factor(self, units):
+        """
+        Return the factor converting from SI to the given `units`.
+        """
+        return get_conversion_factor(units)
+
+
+def get_unit_preferences(user):
+    """
+    Return the :class:`UnitPreferences` of a `user`, which may also be unit
+    preferences already. The profile of a logged in user is looked up when
+    first needed and the preferences kept on the user object, which lasts
+    for a single request.
+    """
+    if isinstance(user, UnitPreferences):
+        return user
+    if not (user and user.is_authenticated):
+        return UnitPreferences()
+    unit_preferences = getattr(user, '_unit_preferences', None)
+    if unit_preferences is None:
+        unit_preferences = UnitPreferences(UserProfile.objects.get(user=user))
+        user._unit_preferences = unit_preferences
+    return unit_preferences
+
+
+class UnitPreferencesMiddleware(object):
+    """
+    Middleware setting ``request.units`` to the :class:`UnitPreferences` of
+    the user making the request, looked up when first used.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.units = SimpleLazyObject(lambda: get_unit_preferences(request.user))
+        return self.get_response(request)
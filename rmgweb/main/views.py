@@ -28,6 +28,7 @@
 #                                                                             #
 ###############################################################################
 
+import json
 import logging
 import os
 import re
@@ -38,7 +39,8 @@ from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import HttpResponse, HttpResponseRedirect, HttpResponseNotFound, HttpResponseServerError
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed, HttpResponseNotFound, \
+                        HttpResponseRedirect, HttpResponseServerError, JsonResponse
 from django.shortcuts import render
 from django.template import loader
 from django.templatetags.static import static
@@ -51,6 +53,9 @@ from rmgpy.molecule.adjlist import InvalidAdjacencyListError
 from rmgpy.molecule.atomtype import allElements as SUPPORTED_ELEMENTS
 
 from rmgweb.main.forms import *
+from rmgweb.main.groupimages import group_drawing_pool
+from rmgweb.main.imagecache import IMAGE_BATCH_SIZE, IMAGE_CONTENT_TYPES, get_image_key, get_structure_images, \
+                                   image_cache, image_response, is_image_key, render_molecule_image
 
 logger = logging.getLogger(__name__)
 
@@ -329,59 +334,77 @@ def cactusResolver(request, query):
 def drawMolecule(request, adjlist, format='png'):
     """
     Returns an image of the provided adjacency list `adjlist` for a molecule.
-    urllib is used to quote/unquote the adjacency list.
+    urllib is used to quote/unquote the adjacency list. Images are cached by
+    the content of the adjacency list, and browsers may keep them forever.
+    Only the images of structures shown on pages of the site are stored on
+    disk; the others are just kept in memory.
     """
-    import io
     from rmgpy.molecule import Molecule
-    from rmgpy.molecule.draw import MoleculeDrawer
-    from rmgpy.molecule.adjlist import InvalidAdjacencyListError
 
     adjlist = urllib.parse.unquote(adjlist)
 
+    if format not in IMAGE_CONTENT_TYPES:
+        return HttpResponse('Image format not implemented.', status=501)
+
+    def render_image():
+        return render_molecule_image(Molecule().from_adjacency_list(adjlist), format)
+
     try:
-        molecule = Molecule().from_adjacency_list(adjlist)
+        response = image_response(request, get_image_key('molecule', adjlist, format), format, render_image,
+                                  persist=image_cache.is_registered('molecule', adjlist))
     except (InvalidAdjacencyListError, ValueError):
         response = HttpResponseRedirect(static('img/invalid_icon.png'))
-    else:
-        if format == 'png':
-            response = HttpResponse(content_type="image/png")
-            surface, _, _ = MoleculeDrawer().draw(molecule, file_format='png')
-            response.write(surface.write_to_png())
-        elif format == 'svg':
-            response = HttpResponse(content_type="image/svg+xml")
-            svg_data = io.BytesIO()
-            MoleculeDrawer().draw(molecule, file_format='svg', target=svg_data)
-            response.write(svg_data.getvalue())
-        else:
-            response = HttpResponse('Image format not implemented.', status=501)
 
     return response
 
 
+@csrf_exempt
+def drawStructures(request):
+    """
+    Returns the SVG images of many structures as JSON. The request body is a
+    JSON object whose ``keys`` are the ``data-structure`` keys of the images
+    on a page. The response maps each key to its image, leaving out those
+    that have to be requested separately.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        keys = json.loads(request.body)['keys']
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest('Invalid request body.')
+    if not isinstance(keys, list) or len(keys) > IMAGE_BATCH_SIZE or not all(is_image_key(key) for key in keys):
+        return HttpResponseBadRequest('Expected a list of at most {0:d} image keys.'.format(IMAGE_BATCH_SIZE))
+    images = {}
+    for key, data in get_structure_images(keys).items():
+        try:
+            images[key] = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Not an SVG image, so leave it to be requested separately
+            continue
+    return JsonResponse({'images': images})
+
+
 def drawGroup(request, adjlist, format='png'):
     """
     Returns an image of the provided adjacency list `adjlist` for a molecular
-    group.  urllib is used to quote/unquote the adjacency list.
+    group.  urllib is used to quote/unquote the adjacency list. Images are
+    cached like those of molecules, and drawn in batches by a pool of
+    worker processes.
     """
 
     adjlist = urllib.parse.unquote(adjlist)
 
+    if format not in IMAGE_CONTENT_TYPES:
+        return HttpResponse('Image format not implemented.', status=501)
+
+    def render_image():
+        return group_drawing_pool.draw(adjlist, format)
+
     try:
-        group = Group().from_adjacency_list(adjlist)
+        response = image_response(request, get_image_key('group', adjlist, format), format, render_image,
+                                  persist=image_cache.is_registered('group', adjlist))
     except (InvalidAdjacencyListError, ValueError):
         response = HttpResponseRedirect(static('img/invalid_icon.png'))
-    else:
-        if format == 'png':
-            response = HttpResponse(content_type="image/png")
-            response.write(group.draw('png'))
-        elif format == 'svg':
-            response = HttpResponse(content_type="image/svg+xml")
-            svg_data = group.draw('svg')
-            # Remove the scale and rotate transformations applied by pydot
-            svg_data = re.sub(r'scale\(0\.722222 0\.722222\) rotate\(0\) ', '', svg_data)
-            response.write(svg_data)
-        else:
-            response = HttpResponse('Image format not implemented.', status=501)
 
     return response
 #    return HttpResponse(content_type="image/svg+xml")
@@ -79,6 +79,11 @@ MEDIA_ROOT = os.path.join(PROJECT_PATH, 'media')
 # Examples: "http://example.com/media/", "http://media.example.com/"
 MEDIA_URL = '/media/'
 
+# Absolute filesystem path to the directory holding the cache of rendered
+# molecule and group structure images, and the URL serving it
+STRUCTURE_IMAGE_ROOT = os.path.join(MEDIA_ROOT, 'structures')
+STRUCTURE_IMAGE_URL = MEDIA_URL + 'structures/'
+
 # Absolute path to the directory static files should be collected to.
 # Example: "/var/www/example.com/static/"
 STATIC_ROOT = os.path.join(os.path.dirname(PROJECT_PATH), 'static')
@@ -122,6 +127,7 @@ TEMPLATES = [
                 # Custom context processors
                 'rmgweb.main.context.get_commits',  # gets git commit hashes
                 'rmgweb.main.context.get_announcement',  # get announcement message
+                'rmgweb.main.context.get_units',  # gets the user's unit preferences
             ],
             'loaders': [
                 # insert your TEMPLATE_LOADERS here
@@ -141,6 +147,7 @@ MIDDLEWARE = (
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'rmgweb.main.units.UnitPreferencesMiddleware',
 )
 
 
@@ -166,6 +173,23 @@ INSTALLED_APPS = (
     'rmgweb.rmg',
 )
 
+# Caches of rendered pages, fragments, plot data and database trees. Their
+# keys include the version of the database they were rendered from, so they
+# never have to be invalidated. The in-memory cache needs no external
+# service; to share one cache between the server processes, use
+# 'django.core.cache.backends.filebased.FileBasedCache' with a directory as
+# the LOCATION instead.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'rmgweb',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
+}
+
 # Settings relating to user account management
 LOGIN_URL = '/login'
 LOGIN_REDIRECT_URL = '/'
@@ -0,0 +1,61 @@
+///////////////////////////////////////////////////////////////////////////////
+//
+//  autocomplete.js - Autocompletion of species identifiers
+//
+//  Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu) and the
+//  RMG Team (rmg_dev@mit.edu)
+//
+//  Permission is hereby granted, free of charge, to any person obtaining a
+//  copy of this software and associated documentation files (the 'Software'),
+//  to deal in the Software without restriction, including without limitation
+//  the rights to use, copy, modify, merge, publish, distribute, sublicense,
+//  and/or sell copies of the Software, and to permit persons to whom the
+//  Software is furnished to do so, subject to the following conditions:
+//
+//  The above copyright notice and this permission notice shall be included in
+//  all copies or substantial portions of the Software.
+//
+//  THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+//  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+//  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+//  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+//  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+//  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+//  DEALINGS IN THE SOFTWARE.
+//
+
+// Adjacency lists of the labels suggested so far, by label
+var autocompleteAdjlists = {};
+
+/**
+ * Suggest labels of database entries and species for the identifier field
+ * `input` as the user types, using the autocomplete endpoint at `url`. The
+ * suggestions are shown in a datalist attached to the field.
+ */
+function attachAutocomplete(input, url) {
+    input = $(input);
+    var list = $('<datalist></datalist>').attr('id', input.attr('id') + '_suggestions');
+    input.attr('list', list.attr('id')).attr('autocomplete', 'off').after(list);
+    var request = null;
+    input.on('input', function () {
+        var query = $.trim(input.val());
+        if (query.length < 2) { return; }
+        if (request) { request.abort(); }
+        request = $.getJSON(url, {q: query, limit: 10}, function (data) {
+            list.empty();
+            $.each(data.entries, function (i, entry) {
+                autocompleteAdjlists[entry.label] = entry.adjlist;
+                list.append($('<option></option>').attr('value', entry.label));
+            });
+        });
+    });
+}
+
+/**
+ * Return the adjacency list of a suggested label, or null if `identifier` is
+ * not one of the suggestions and must be resolved some other way.
+ */
+function autocompleteAdjlist(identifier) {
+    identifier = $.trim(identifier);
+    return autocompleteAdjlists.hasOwnProperty(identifier) ? autocompleteAdjlists[identifier] : null;
+}
@@ -0,0 +1,181 @@
+///////////////////////////////////////////////////////////////////////////////
+//
+//  databaseTable.js - Paged loading of database tables
+//
+//  Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu) and the
+//  RMG Team (rmg_dev@mit.edu)
+//
+//  Permission is hereby granted, free of charge, to any person obtaining a
+//  copy of this software and associated documentation files (the 'Software'),
+//  to deal in the Software without restriction, including without limitation
+//  the rights to use, copy, modify, merge, publish, distribute, sublicense,
+//  and/or sell copies of the Software, and to permit persons to whom the
+//  Software is furnished to do so, subject to the following conditions:
+//
+//  The above copyright notice and this permission notice shall be included in
+//  all copies or substantial portions of the Software.
+//
+//  THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+//  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+//  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+//  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+//  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+//  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+//  DEALINGS IN THE SOFTWARE.
+//
+
+/**
+ * Escape the special HTML characters in a string.
+ */
+function escapeHTML(value) {
+    return $('<div></div>').text(value).html();
+}
+
+/**
+ * A table of database entries that is loaded from the server one page at a
+ * time. The `container` holds the table and its controls: a text input with
+ * class "tableFilter", "tablePrevious" and "tableNext" buttons, an element
+ * with class "tableStatus", and header cells with a "data-sort" attribute
+ * naming the column they sort by. `url` returns pages of entries as JSON,
+ * and `columns` is a list of {render: function(entry), className: string}
+ * objects describing the cells of each row. The first page is rendered by
+ * the server and described by `first`, which gives its `next` cursor, the
+ * `total` number of entries and the `limit` on entries per page. The
+ * first page is sorted and filtered by the "sort", "order" and "q"
+ * parameters of the page URL, if they are given.
+ */
+function DatabaseTable(container, url, columns, first) {
+    this.container = $(container);
+    this.url = url;
+    this.columns = columns;
+    this.limit = first.limit;
+    this.total = first.total;
+    // Start from the sorting and filter the server used for the first page
+    var params = new URLSearchParams(window.location.search);
+    this.sort = params.get('sort') || 'index';
+    this.order = (params.get('order') == 'desc') ? 'desc' : 'asc';
+    this.query = params.get('q') || '';
+    this.container.find('.tableFilter').val(this.query);
+    // Cursors of the pages visited so far, so that we can go back
+    this.cursors = [''];
+    this.cursors.push(first.next);
+    this.page = 0;
+    this.count = this.container.find('tbody tr').length;
+    this.request = null;
+
+    var table = this;
+    var timer = null;
+    this.container.find('.tableFilter').on('input', function () {
+        var query = $(this).val();
+        clearTimeout(timer);
+        timer = setTimeout(function () { table.filter(query); }, 300);
+    });
+    this.container.find('th[data-sort]').css('cursor', 'pointer').click(function () {
+        table.sortBy($(this).attr('data-sort'));
+    });
+    this.container.find('.tablePrevious').click(function () { table.previous(); });
+    this.container.find('.tableNext').click(function () { table.next(); });
+    this.updateControls();
+}
+
+DatabaseTable.prototype.filter = function (query) {
+    this.query = query;
+    this.reload();
+};
+
+DatabaseTable.prototype.sortBy = function (sort) {
+    if (this.sort == sort) {
+        this.order = (this.order == 'asc') ? 'desc' : 'asc';
+    }
+    else {
+        this.sort = sort;
+        this.order = 'asc';
+    }
+    this.reload();
+};
+
+DatabaseTable.prototype.reload = function () {
+    this.cursors = [''];
+    this.page = 0;
+    this.load();
+};
+
+DatabaseTable.prototype.previous = function () {
+    if (this.page > 0) {
+        this.page -= 1;
+        this.load();
+    }
+};
+
+DatabaseTable.prototype.next = function () {
+    if (this.cursors[this.page + 1]) {
+        this.page += 1;
+        this.load();
+    }
+};
+
+/**
+ * Fetch the current page from the server and replace the rows of the table.
+ */
+DatabaseTable.prototype.load = function () {
+    var table = this;
+    if (this.request !== null) {
+        this.request.abort();
+    }
+    this.container.find('.tableStatus').text('Loading...');
+    this.request = $.getJSON(this.url, {
+        sort: this.sort,
+        order: this.order,
+        q: this.query,
+        cursor: this.cursors[this.page],
+        limit: this.limit
+    }, function (data) {
+        table.request = null;
+        table.render(data.entries);
+        table.total = data.total;
+        table.count = data.entries.length;
+        table.cursors.length = table.page + 1;
+        table.cursors.push(data.next);
+        table.updateControls();
+    }).fail(function (xhr, status) {
+        if (status != 'abort') {
+            table.request = null;
+            table.container.find('.tableStatus').text('Unable to load entries.');
+        }
+    });
+};
+
+DatabaseTable.prototype.render = function (entries) {
+    var body = this.container.find('tbody');
+    var columns = this.columns;
+    body.empty();
+    $.each(entries, function (i, entry) {
+        var row = $('<tr></tr>');
+        $.each(columns, function (j, column) {
+            var cell = $('<td></td>').html(column.render(entry));
+            if (column.className) {
+                cell.addClass(column.className);
+            }
+            row.append(cell);
+        });
+        body.append(row);
+    });
+    loadStructures(body, structuresUrl);
+};
+
+DatabaseTable.prototype.updateControls = function () {
+    var start = this.page * this.limit;
+    var status;
+    if (this.count == 0) {
+        status = 'No matching entries';
+    }
+    else {
+        status = 'Entries ' + (start + 1) + '-' + (start + this.count) + ' of ' + this.total;
+    }
+    this.container.find('.tableStatus').text(status);
+    this.container.find('.tablePrevious').prop('disabled', this.page == 0);
+    this.container.find('.tableNext').prop('disabled', !this.cursors[this.page + 1]);
+    this.container.find('th[data-sort] .sortIndicator').remove();
+    this.container.find('th[data-sort="' + this.sort + '"]').append(
+        '<span class="sortIndicator">' + (this.order == 'asc' ? ' &#9650;' : ' &#9660;') + '</span>');
+};
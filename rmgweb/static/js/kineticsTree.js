@@ -0,0 +1,100 @@
+///////////////////////////////////////////////////////////////////////////////
+//
+//  kineticsTree.js - Lazy expansion of kinetics group trees
+//
+//  Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu) and the
+//  RMG Team (rmg_dev@mit.edu)
+//
+//  Permission is hereby granted, free of charge, to any person obtaining a
+//  copy of this software and associated documentation files (the 'Software'),
+//  to deal in the Software without restriction, including without limitation
+//  the rights to use, copy, modify, merge, publish, distribute, sublicense,
+//  and/or sell copies of the Software, and to permit persons to whom the
+//  Software is furnished to do so, subject to the following conditions:
+//
+//  The above copyright notice and this permission notice shall be included in
+//  all copies or substantial portions of the Software.
+//
+//  THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+//  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+//  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+//  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+//  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+//  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+//  DEALINGS IN THE SOFTWARE.
+
+/**
+ * A kinetics group tree whose nodes are loaded from the server as they are
+ * expanded. The tree is drawn as nested lists within `container`. `url`
+ * returns the children of the node given by the "node" query parameter as
+ * JSON, and `version` identifies the loaded version of the database so that
+ * the responses can be cached by the browser. `images` gives the URLs of
+ * the "expand", "collapse" and "blank" tree button images.
+ */
+function KineticsTree(container, url, version, images) {
+    this.container = $(container);
+    this.url = url;
+    this.version = version;
+    this.images = images;
+    var list = $('<ul class="kineticsTree"></ul>');
+    this.container.append(list);
+    this.load('', list);
+}
+
+/**
+ * Fetch the children of the node with the given `index` and append them to
+ * the (empty) list `list`.
+ */
+KineticsTree.prototype.load = function (index, list) {
+    var tree = this;
+    var status = $('<li class="kineticsEntry">Loading...</li>');
+    list.append(status);
+    $.getJSON(this.url, {node: index, v: this.version}, function (data) {
+        status.remove();
+        $.each(data.nodes, function (i, node) {
+            list.append(tree.render(node));
+        });
+    }).fail(function () {
+        status.text('Unable to load the tree.');
+    });
+};
+
+/**
+ * Return the list item drawing a single `node` of the tree, whose children
+ * are loaded when its button is first clicked.
+ */
+KineticsTree.prototype.render = function (node) {
+    var tree = this;
+    var item = $('<li class="kineticsEntry"></li>');
+    var label = $('<div class="kineticsLabel"></div>');
+    var button = $('<img class="treeButton"/>');
+    label.append(button);
+    label.append($('<a></a>').attr('href', node.url).text(node.index + '. ' + node.label));
+    var data = $('<div class="kineticsData"></div>');
+    $.each(node.data, function (i, log_k) {
+        // Rate coefficients without a finite logarithm are left blank
+        data.append('<span class="kineticsDatum">' + (log_k === null ? '' : log_k.toFixed(2)) + '</span> ');
+    });
+    label.append(data);
+    item.append(label);
+
+    if (node.children > 0) {
+        button.attr('src', this.images.expand);
+        var children = null;
+        button.click(function () {
+            if (children === null) {
+                children = $('<ul class="kineticsSubTree"></ul>');
+                item.append(children);
+                tree.load(node.index, children);
+            }
+            else {
+                children.toggle();
+            }
+            button.attr('src', children.is(':visible') ? tree.images.collapse : tree.images.expand);
+        });
+    }
+    else {
+        button.attr('src', this.images.blank);
+    }
+    return item;
+};
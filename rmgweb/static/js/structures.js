@@ -0,0 +1,70 @@
+///////////////////////////////////////////////////////////////////////////////
+//
+//  structures.js - Batched loading of structure images
+//
+//  Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu) and the
+//  RMG Team (rmg_dev@mit.edu)
+//
+//  Permission is hereby granted, free of charge, to any person obtaining a
+//  copy of this software and associated documentation files (the 'Software'),
+//  to deal in the Software without restriction, including without limitation
+//  the rights to use, copy, modify, merge, publish, distribute, sublicense,
+//  and/or sell copies of the Software, and to permit persons to whom the
+//  Software is furnished to do so, subject to the following conditions:
+//
+//  The above copyright notice and this permission notice shall be included in
+//  all copies or substantial portions of the Software.
+//
+//  THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+//  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+//  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+//  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+//  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+//  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+//  DEALINGS IN THE SOFTWARE.
+//
+
+// Largest number of images requested at a time
+var STRUCTURE_BATCH_SIZE = 500;
+
+/**
+ * Load the structure images within `container`, which are ``<img>`` tags
+ * with a "data-structure" key and no source. The SVG images of all of the
+ * structures are fetched from the endpoint at `url` in as few requests as
+ * possible and inlined as data URLs; images the endpoint does not return
+ * are loaded separately from the URL in their "data-src" attribute.
+ */
+function loadStructures(container, url) {
+    var images = {};
+    $(container).find('img[data-structure]:not([src])').each(function () {
+        var key = $(this).attr('data-structure');
+        if (!(key in images)) {
+            images[key] = [];
+        }
+        images[key].push(this);
+    });
+    var keys = Object.keys(images);
+    var show = function (keys, data) {
+        $.each(keys, function (i, key) {
+            var svg = data[key];
+            $.each(images[key], function (j, image) {
+                image.src = svg ? 'data:image/svg+xml;charset=utf-8,' + encodeURIComponent(svg) : $(image).attr('data-src');
+            });
+        });
+    };
+    for (var start = 0; start < keys.length; start += STRUCTURE_BATCH_SIZE) {
+        (function (batch) {
+            $.ajax({
+                url: url,
+                type: 'POST',
+                contentType: 'application/json',
+                data: JSON.stringify({keys: batch}),
+                dataType: 'json'
+            }).done(function (data) {
+                show(batch, data.images);
+            }).fail(function () {
+                show(batch, {});
+            });
+        })(keys.slice(start, start + STRUCTURE_BATCH_SIZE));
+    }
+}
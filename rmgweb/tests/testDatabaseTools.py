@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+from rmgpy.data.base import Database, Entry
+from rmgpy.molecule import Molecule
+from rmgpy.reaction import Reaction
+from rmgpy.species import Species
+
+from rmgweb.database.tools import DATABASE_CHECK_INTERVAL, RMGWebDatabase, get_reaction_key, get_species_key, get_table_page
+from rmgweb.main.imagecache import get_image_key, image_cache
+
+
+class SpeciesKeyTest(TestCase):
+
+    def test_resonance_structures(self):
+        """
+        Test that resonance structures of a species share a key
+        """
+        species = Species().from_smiles('C=C[CH2]')
+        species.generate_resonance_structures()
+        self.assertEqual(len(species.molecule), 2)
+        self.assertEqual(get_species_key(species.molecule[0]), get_species_key(species.molecule[1]))
+
+    def test_different_species(self):
+        """
+        Test that different species have different keys
+        """
+        self.assertNotEqual(get_species_key(Species().from_smiles('CCO')),
+                            get_species_key(Species().from_smiles('COC')))
+        self.assertNotEqual(get_species_key(Species().from_smiles('[CH2]')),
+                            get_species_key(Species().from_smiles('C')))
+
+
+class ReactionKeyTest(TestCase):
+
+    def test_reaction_key(self):
+        """
+        Test that the reaction key ignores species order but not direction
+        """
+        ch3 = Species().from_smiles('[CH3]')
+        h = Species().from_smiles('[H]')
+        ch4 = Species().from_smiles('C')
+        forward = Reaction(reactants=[ch3, h], products=[ch4])
+        swapped = Reaction(reactants=[h, ch3], products=[ch4])
+        reverse = Reaction(reactants=[ch4], products=[ch3, h])
+
+        self.assertEqual(get_reaction_key(forward), get_reaction_key(swapped))
+        self.assertNotEqual(get_reaction_key(forward), get_reaction_key(reverse))
+        self.assertEqual(frozenset(get_reaction_key(forward)), frozenset(get_reaction_key(reverse)))
+
+
+class EntryIndexTest(TestCase):
+
+    def setUp(self):
+        self.web_database = RMGWebDatabase()
+        self.db = Database()
+        for index in range(1, 6):
+            self.db.entries['entry{0}'.format(index)] = Entry(index=index, label='entry{0}'.format(index))
+        self.db.entries['averaged'] = [Entry(index=6, label='averaged'), Entry(index=7, label='averaged')]
+
+    def test_get_entry(self):
+        """
+        Test looking up entries, including those stored in lists
+        """
+        self.assertEqual(self.web_database.get_entry(self.db, 3).label, 'entry3')
+        self.assertIs(self.web_database.get_entry(self.db, 7), self.db.entries['averaged'][1])
+        self.assertIsNone(self.web_database.get_entry(self.db, 8))
+
+    def test_modified_entries(self):
+        """
+        Test that entries added or renumbered after the first lookup are found
+        """
+        self.web_database.get_entry(self.db, 1)
+        self.db.entries['entry8'] = Entry(index=8, label='entry8')
+        self.assertEqual(self.web_database.get_entry(self.db, 8).label, 'entry8')
+        self.db.entries['entry2'].index = 0
+        self.assertIsNone(self.web_database.get_entry(self.db, 2))
+        self.assertEqual(self.web_database.get_entry(self.db, 0).label, 'entry2')
+
+
+class NASAStringTest(TestCase):
+
+    def setUp(self):
+        self.web_database = RMGWebDatabase()
+
+    def test_dangling_link(self):
+        """
+        Test that an entry linking to missing data gives an empty string
+        """
+        entry = Entry(index=1, label='CC', item=Molecule().from_smiles('CC'), data='missing')
+        self.assertEqual(self.web_database.get_thermo_nasa_string('libraries', 'test', entry), '')
+        self.assertIsNone(self.web_database.get_thermo_nasa_string(
+            'libraries', 'test', Entry(index=2, label='group', item=None, data='missing')))
+
+
+class StructureInfoTest(TestCase):
+
+    def setUp(self):
+        self.web_database = RMGWebDatabase()
+        self.library = Database(label='test')
+        for index, smiles in enumerate(['C', 'CC', 'CCO'], 1):
+            self.library.entries[smiles] = Entry(index=index, label=smiles, item=Molecule().from_smiles(smiles))
+        self.web_database.index_structures('thermo', 'libraries', {'test': self.library})
+
+    def test_library_items(self):
+        """
+        Test that the markup of library items is rendered in advance
+        """
+        entry = self.library.entries['CC']
+        markup = self.web_database.get_structure_info(entry.item)
+        self.assertIs(self.web_database.get_structure_info(entry), markup)
+        self.assertIn('data-structure=', markup)
+
+    def test_manifest_change(self):
+        """
+        Test that the markup links to images pre-rendered after it was rendered
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        item = self.library.entries['CC'].item
+        key = get_image_key('molecule', item.to_adjacency_list(remove_h=False), 'png')
+        with override_settings(STRUCTURE_IMAGE_ROOT=root, STRUCTURE_IMAGE_URL='/media/structures/'):
+            image_cache.manifest_checked = 0
+            self.web_database.index_structures('thermo', 'libraries', {'test': self.library})
+            self.assertNotIn('/media/structures/', self.web_database.get_structure_info(item))
+            image_cache.write_manifest({key: image_cache.get_path(key, 'png')})
+            self.assertIn('/media/structures/', self.web_database.get_structure_info(item))
+        image_cache.manifest_checked = 0
+
+    def test_other_items(self):
+        """
+        Test that the markup of other items is rendered on request
+        """
+        molecule = Molecule().from_smiles('CC')
+        self.assertEqual(self.web_database.get_structure_info(molecule),
+                         self.web_database.get_structure_info(self.library.entries['CC'].item))
+
+
+class SpeciesIndexTest(TestCase):
+
+    def setUp(self):
+        self.web_database = RMGWebDatabase()
+        library = Database(label='test')
+        for index, smiles in enumerate(['C', 'CC', 'C=C[CH2]', '[CH2]C=C', 'CCO'], 1):
+            library.entries[smiles] = Entry(index=index, label=smiles, item=Molecule().from_smiles(smiles))
+        self.web_database.index_species('thermo', 'libraries', {'test': library})
+
+    def test_find_species_entries(self):
+        """
+        Test that every entry for a species is found, including resonance structures
+        """
+        species = Species().from_smiles('C=C[CH2]')
+        species.generate_resonance_structures()
+        entries = self.web_database.find_species_entries(species)
+        self.assertEqual([entry.index for component, section, subsection, entry in entries], [3, 4])
+        self.assertEqual(entries[0][:3], ('thermo', 'libraries', 'test'))
+
+        self.assertEqual(self.web_database.find_species_entries(Species().from_smiles('COC')), [])
+
+    def test_non_strict_candidates(self):
+        """
+        Test that non-strict candidates include other electronic states
+        """
+        library = Database(label='carbene')
+        library.entries['CH2'] = Entry(index=1, label='CH2', item=Molecule().from_smiles('[CH2]'))
+        self.web_database.index_species('thermo', 'depository', {'carbene': library})
+        singlet = Species().from_adjacency_list("""
+multiplicity 1
+1 C u0 p1 c0 {2,S} {3,S}
+2 H u0 p0 c0 {1,S}
+3 H u0 p0 c0 {1,S}
+""")
+        self.assertEqual(self.web_database.get_species_candidates(singlet, 'thermo', 'depository'), {})
+        candidates = self.web_database.get_species_candidates(singlet, 'thermo', 'depository', strict=False)
+        self.assertEqual([entry.label for entry in candidates['carbene']], ['CH2'])
+        self.assertTrue(singlet.is_isomorphic(candidates['carbene'][0].item, strict=False))
+
+
+class ModificationCheckTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        with open(os.path.join(self.root, 'library.py'), 'w') as f:
+            f.write('name = "test"\n')
+        self.web_database = RMGWebDatabase()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_check_interval(self):
+        """
+        Test that a directory found up to date is not checked again for a while
+        """
+        self.assertTrue(self.web_database.is_dir_modified(self.root))
+        self.web_database.reset_dir_timestamps(self.root)
+        self.assertFalse(self.web_database.is_dir_modified(self.root))
+        with open(os.path.join(self.root, 'other.py'), 'w') as f:
+            f.write('name = "other"\n')
+        self.assertFalse(self.web_database.is_dir_modified(self.root))
+        self.web_database.dir_checked[self.root] -= DATABASE_CHECK_INTERVAL
+        self.assertTrue(self.web_database.is_dir_modified(self.root))
+
+
+class TablePageTest(TestCase):
+
+    def setUp(self):
+        self.rows = [{'index': i, 'label': 'species{0}'.format(i), 'dataFormat': 'NASA' if i % 2 else 'Wilhoit'}
+                     for i in range(1, 26)]
+
+    def test_pages(self):
+        """
+        Test that following the cursors visits every row once in order
+        """
+        indices = []
+        cursor = ''
+        while True:
+            page, cursor, total = get_table_page(self.rows, cursor=cursor, limit=10)
+            self.assertEqual(total, 25)
+            self.assertLessEqual(len(page), 10)
+            indices.extend(row['index'] for row in page)
+            if not cursor:
+                break
+        self.assertEqual(indices, list(range(1, 26)))
+
+    def test_descending(self):
+        """
+        Test sorting in descending order across pages
+        """
+        page1, cursor, total = get_table_page(self.rows, sort='label', descending=True, limit=5)
+        page2, cursor, total = get_table_page(self.rows, sort='label', descending=True, cursor=cursor, limit=5)
+        labels = [row['label'] for row in page1 + page2]
+        self.assertEqual(labels, sorted([row['label'] for row in self.rows], reverse=True)[:10])
+
+    def test_query(self):
+        """
+        Test filtering rows by label or data format
+        """
+        page, cursor, total = get_table_page(self.rows, query='wilhoit', limit=50)
+        self.assertEqual(total, 12)
+        self.assertEqual(cursor, '')
+        page, cursor, total = get_table_page(self.rows, query='Species2', limit=50)
+        self.assertEqual([row['index'] for row in page], [2, 20, 21, 22, 23, 24, 25])
+
+    def test_invalid(self):
+        """
+        Test that invalid parameters raise ValueError
+        """
+        self.assertRaises(ValueError, get_table_page, self.rows, sort='structure')
+        self.assertRaises(ValueError, get_table_page, self.rows, limit=0)
+        self.assertRaises(ValueError, get_table_page, self.rows, limit=10000)
+        self.assertRaises(ValueError, get_table_page, self.rows, cursor='not a cursor')
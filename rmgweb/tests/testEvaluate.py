@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+import math
+
+import numpy as np
+from django.test import TestCase
+from rmgpy.kinetics import Arrhenius, MultiArrhenius, PDepArrhenius
+
+from rmgweb.main.evaluate import evaluate_log_rate_coefficients, evaluate_rate_coefficients
+
+
+class EvaluateRateCoefficientsTest(TestCase):
+
+    def setUp(self):
+        self.arrhenius = Arrhenius(A=(1.5e6, 'cm^3/(mol*s)'), n=1.8, Ea=(3.2, 'kcal/mol'), T0=(1, 'K'))
+        self.arrhenius2 = Arrhenius(A=(2.0e12, 'cm^3/(mol*s)'), n=0, Ea=(-0.5, 'kcal/mol'), T0=(300, 'K'))
+        self.Tdata = [300, 400, 500, 600, 800, 1000, 1500, 2000]
+
+    def test_arrhenius_matches_scalar(self):
+        """
+        Test that vectorized Arrhenius rates match RMG-Py's scalar evaluation
+        """
+        kdata = evaluate_rate_coefficients([self.arrhenius, self.arrhenius2], self.Tdata)
+
+        self.assertEqual(kdata.shape, (2, len(self.Tdata)))
+        for kinetics, row in zip([self.arrhenius, self.arrhenius2], kdata):
+            expected = [kinetics.get_rate_coefficient(T) for T in self.Tdata]
+            np.testing.assert_allclose(row, expected, rtol=1e-10)
+
+    def test_multi_arrhenius_matches_scalar(self):
+        """
+        Test that a MultiArrhenius is evaluated as the sum of its terms
+        """
+        kinetics = MultiArrhenius(arrhenius=[self.arrhenius, self.arrhenius2])
+
+        kdata = evaluate_rate_coefficients([kinetics], self.Tdata)
+
+        expected = [kinetics.get_rate_coefficient(T) for T in self.Tdata]
+        np.testing.assert_allclose(kdata[0], expected, rtol=1e-10)
+
+    def test_scalar_fallback(self):
+        """
+        Test that models without a vectorized form fall back to RMG-Py
+        """
+        kinetics = PDepArrhenius(pressures=([0.1, 10.0], 'bar'), arrhenius=[self.arrhenius, self.arrhenius2])
+
+        kdata = evaluate_rate_coefficients([kinetics, self.arrhenius], self.Tdata, P=1e5)
+
+        expected = [kinetics.get_rate_coefficient(T, 1e5) for T in self.Tdata]
+        np.testing.assert_allclose(kdata[0], expected, rtol=1e-10)
+
+    def test_log_rate_coefficients(self):
+        """
+        Test that rate coefficients that are not positive have no logarithm
+        """
+        negative = Arrhenius(A=(-1.5e6, 'cm^3/(mol*s)'), n=1.8, Ea=(3.2, 'kcal/mol'), T0=(1, 'K'))
+
+        log_kdata = evaluate_log_rate_coefficients([self.arrhenius, negative], self.Tdata)
+
+        expected = [math.log10(self.arrhenius.get_rate_coefficient(T)) for T in self.Tdata]
+        np.testing.assert_allclose(log_kdata[0], expected, rtol=1e-10)
+        self.assertTrue(np.all(np.isnan(log_kdata[1])))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+from django.core.cache import cache
+from django.test import TestCase
+from rmgpy.kinetics import Arrhenius
+
+from rmgweb.main.fragments import get_fragment, get_fragment_identity
+from rmgweb.main.imagecache import image_cache
+from rmgweb.main.templatetags.render_kinetics import render_kinetics_math
+from rmgweb.main.units import UnitPreferences
+
+
+class FragmentCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fragment_identity(self):
+        """
+        Test that objects without a proper representation are not identified
+        """
+        kinetics = Arrhenius(A=(1e6, 's^-1'), n=0.5, Ea=(10, 'kJ/mol'), T0=(1, 'K'))
+        self.assertEqual(get_fragment_identity(kinetics), repr(kinetics))
+        self.assertIsNone(get_fragment_identity(object()))
+
+    def test_get_fragment(self):
+        """
+        Test that fragments are rendered once for each set of unit preferences
+        """
+        calls = []
+
+        def render(obj, unit_preferences):
+            calls.append(obj)
+            return '<p>{0}</p>'.format(obj)
+
+        unit_preferences = UnitPreferences()
+        self.assertEqual(get_fragment('test', 1.5, unit_preferences, render), '<p>1.5</p>')
+        self.assertEqual(get_fragment('test', 1.5, unit_preferences, render), '<p>1.5</p>')
+        self.assertEqual(len(calls), 1)
+        unit_preferences.preferences['energy_units'] = 'kJ/mol'
+        get_fragment('test', 1.5, unit_preferences, render)
+        self.assertEqual(len(calls), 2)
+
+    def test_cached_fragment_structures(self):
+        """
+        Test that using a cached fragment remembers the structures it shows
+        """
+        def render(obj, unit_preferences):
+            key = image_cache.add_structure('molecule', obj)
+            return '<img data-structure="{0}"/>'.format(key)
+
+        adjlist = '1 C u0 p0 c0'
+        fragment = get_fragment('test', adjlist, UnitPreferences(), render)
+        key = image_cache.add_structure('molecule', adjlist)
+        with image_cache.lock:
+            del image_cache.structures[key]
+        self.assertEqual(get_fragment('test', adjlist, UnitPreferences(), render), fragment)
+        self.assertEqual(image_cache.structures[key], ('molecule', adjlist))
+
+    def test_render_kinetics_math(self):
+        """
+        Test that the cached kinetics markup matches the rendered markup
+        """
+        kinetics = Arrhenius(A=(1e6, 's^-1'), n=0.5, Ea=(10, 'kJ/mol'), T0=(1, 'K'))
+        result = render_kinetics_math(kinetics)
+        self.assertIn('k(T)', result)
+        self.assertEqual(render_kinetics_math(kinetics), result)
+        self.assertEqual(render_kinetics_math.__wrapped__(kinetics), result)
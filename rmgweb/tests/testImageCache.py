@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import json
+import shutil
+import tempfile
+import urllib
+
+from django.test import TestCase, override_settings
+
+from rmgpy.molecule.molecule import Molecule
+from rmgpy.reaction import Reaction
+from rmgpy.species import Species
+
+from rmgweb.main.groupimages import clean_group_svg
+from rmgweb.main.imagecache import ImageCache, get_image_key, get_image_url, image_cache, normalize_adjlist
+from rmgweb.main.tools import getItemStructures, getStructureMarkup
+
+ETHANE = """
+1 C u0 p0 c0 {2,S} {3,S} {4,S} {5,S}
+2 C u0 p0 c0 {1,S} {6,S} {7,S} {8,S}
+3 H u0 p0 c0 {1,S}
+4 H u0 p0 c0 {1,S}
+5 H u0 p0 c0 {1,S}
+6 H u0 p0 c0 {2,S}
+7 H u0 p0 c0 {2,S}
+8 H u0 p0 c0 {2,S}
+"""
+
+
+class ImageCacheTest(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_image_key(self):
+        """
+        Test that adjacency lists differing only in whitespace share a key
+        """
+        self.assertEqual(normalize_adjlist('\n1  C u0 {2,S}\n\n2 C u0   {1,S}  \n'), '1 C u0 {2,S}\n2 C u0 {1,S}')
+        self.assertEqual(get_image_key('molecule', ETHANE, 'png'),
+                         get_image_key('molecule', ETHANE.replace(' ', '  '), 'png'))
+        self.assertNotEqual(get_image_key('molecule', ETHANE, 'png'), get_image_key('molecule', ETHANE, 'svg'))
+        self.assertNotEqual(get_image_key('molecule', ETHANE, 'png'), get_image_key('group', ETHANE, 'png'))
+
+    def test_get_and_set(self):
+        """
+        Test that images are found in memory, then on disk once evicted
+        """
+        cache = ImageCache(root=self.root, memory_size=1)
+        self.assertIsNone(cache.get('aa01', 'png'))
+        cache.set('aa01', 'png', b'first')
+        cache.set('bb02', 'png', b'second')
+        self.assertEqual(list(cache.memory), ['bb02'])
+        self.assertEqual(cache.get('bb02', 'png'), b'second')
+        self.assertEqual(cache.get('aa01', 'png'), b'first')
+        self.assertEqual((cache.memory_hits, cache.file_hits, cache.misses), (1, 1, 1))
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+    def test_shared_structures(self):
+        """
+        Test that structures shown by one process can be drawn by another
+        """
+        key = ImageCache(root=self.root).add_structure('group', '1 *1 C u0')
+        cache = ImageCache(root=self.root)
+        self.assertEqual(cache.get_structure(key), ('group', '1 *1 C u0'))
+        self.assertIsNone(cache.get_structure('unknown'))
+
+    def test_manifest(self):
+        """
+        Test that images listed in the manifest are linked to directly
+        """
+        key = get_image_key('molecule', ETHANE, 'png')
+        with override_settings(STRUCTURE_IMAGE_ROOT=self.root, STRUCTURE_IMAGE_URL='/media/structures/'):
+            image_cache.manifest_checked = 0
+            self.assertIsNone(get_image_url('molecule', ETHANE))
+            image_cache.write_manifest({key: image_cache.get_path(key, 'png')})
+            self.assertEqual(get_image_url('molecule', ETHANE), '/media/structures/{0}/{1}.png'.format(key[:2], key))
+        image_cache.manifest_checked = 0
+
+    def test_item_structures(self):
+        """
+        Test collecting the structures drawn for a reaction
+        """
+        ethane = Molecule().from_adjacency_list(ETHANE)
+        methyl = Species(label='CH3', molecule=[Molecule(smiles='[CH3]')])
+        reaction = Reaction(reactants=[ethane], products=[methyl, methyl])
+        structures = list(getItemStructures(reaction))
+        self.assertEqual(len(structures), 3)
+        self.assertEqual(structures[0], ('molecule', ethane.to_adjacency_list(remove_h=False)))
+        self.assertEqual(len(set(structures)), 2)
+
+    def test_draw_molecule(self):
+        """
+        Test that molecule images are served with a strong ETag
+        """
+        image_cache.memory.clear()
+        image_cache.structures.clear()
+        url = '/molecule/' + urllib.parse.quote(ETHANE) + '/svg'
+        with override_settings(STRUCTURE_IMAGE_ROOT=self.root):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/svg+xml')
+            self.assertIn('immutable', response['Cache-Control'])
+            etag = response['ETag']
+            self.assertEqual(etag, '"{0}"'.format(get_image_key('molecule', ETHANE, 'svg')))
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            # The molecule is not shown on any page, so its image is not stored
+            self.assertFalse(ImageCache(root=self.root).contains(get_image_key('molecule', ETHANE, 'svg'), 'svg'))
+
+    def test_draw_group(self):
+        """
+        Test that group images drawn by the worker pool are cached
+        """
+        adjlist = '1 *1 C u0 {2,S}\n2 *2 O u0 {1,S}'
+        url = '/group/' + urllib.parse.quote(adjlist) + '/svg'
+        with override_settings(STRUCTURE_IMAGE_ROOT=self.root):
+            image_cache.add_structure('group', adjlist)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'<svg', response.content)
+            key = get_image_key('group', adjlist, 'svg')
+            self.assertTrue(ImageCache(root=self.root).contains(key, 'svg'))
+        self.assertEqual(clean_group_svg('<g transform="scale(0.722222 0.722222) rotate(0) translate(4 4)">'),
+                         b'<g transform="translate(4 4)">')
+
+    def test_draw_structures(self):
+        """
+        Test that the images of structures shown on a page are returned together
+        """
+        key = get_image_key('molecule', Molecule().from_adjacency_list(ETHANE).to_adjacency_list(), 'svg')
+        with override_settings(STRUCTURE_IMAGE_ROOT=self.root):
+            markup = getStructureMarkup(Molecule().from_adjacency_list(ETHANE))
+            self.assertIn('data-structure="{0}"'.format(key), markup)
+            self.assertIn('<img data-src="/molecule/', markup)
+            self.assertIn('<noscript><img src="/molecule/', markup)
+            response = self.client.post('/structures', json.dumps({'keys': [key, '0' * 40]}),
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            images = json.loads(response.content)['images']
+            self.assertEqual(list(images), [key])
+            self.assertIn('<svg', images[key])
+            for invalid in ['../../etc/passwd', '/etc/foo', key + '\n', 1]:
+                response = self.client.post('/structures', json.dumps({'keys': [invalid]}),
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/structures').status_code, 405)
+
+    def test_invalid_keys(self):
+        """
+        Test that keys which could name files outside the cache are rejected
+        """
+        cache = ImageCache(root=self.root)
+        self.assertIsNone(cache.get('../../x', 'svg'))
+        self.assertIsNone(cache.get_structure('/etc/foo'))
+        with self.assertRaises(ValueError):
+            cache.set('../x', 'svg', b'<svg/>')
+
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import json
+
+from django.test import TestCase
+from rmgpy.data.base import Entry
+from rmgpy.kinetics import Arrhenius
+
+from rmgweb.database.views import KINETICS_TREE_TEMPERATURES, getKineticsTreeNodes
+
+
+class KineticsTreeNodesTest(TestCase):
+
+    def setUp(self):
+        self.top = Entry(index=1, label='Root', data=None)
+        self.child = Entry(index=2, label='Child', data=Arrhenius(A=(1e6, 'cm^3/(mol*s)'), n=0, Ea=(0, 'kJ/mol'),
+                                                                   T0=(1, 'K')))
+        self.leaf = Entry(index=3, label='Leaf', data=None)
+        self.top.children = [self.child]
+        self.child.parent = self.top
+        self.child.children = [self.leaf]
+        self.leaf.parent = self.child
+
+    def test_tree_nodes(self):
+        """
+        Test that the children of each node are summarized
+        """
+        tree = getKineticsTreeNodes(None, 'families', 'H_Abstraction/groups', [self.top])
+        self.assertEqual(sorted(tree.keys()), ['', '1', '2'])
+        self.assertEqual([node['label'] for node in tree['']], ['Root'])
+        self.assertEqual(tree[''][0]['children'], 1)
+        self.assertEqual(tree[''][0]['data'], [])
+
+        child = tree['1'][0]
+        self.assertEqual(child['index'], 2)
+        self.assertEqual(child['url'], '/database/kinetics/families/H_Abstraction/groups/2/')
+        self.assertEqual(child['data'], [0.0] * len(KINETICS_TREE_TEMPERATURES))
+        self.assertEqual(tree['2'][0]['children'], 0)
+
+    def test_non_positive_rate_coefficients(self):
+        """
+        Test that rate coefficients without a finite logarithm are given as None
+        """
+        self.leaf.data = Arrhenius(A=(0, 'cm^3/(mol*s)'), n=0, Ea=(0, 'kJ/mol'), T0=(1, 'K'))
+        tree = getKineticsTreeNodes(None, 'families', 'H_Abstraction/groups', [self.top])
+        self.assertEqual(tree['2'][0]['data'], [None] * len(KINETICS_TREE_TEMPERATURES))
+        json.dumps(tree, allow_nan=False)
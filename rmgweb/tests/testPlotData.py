@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import json
+
+import numpy as np
+from django.test import RequestFactory, TestCase
+
+from rmgweb.main.plotdata import PLOT_DATA_MAX_AGE, compact, format_plot_variables, get_plot_series, \
+                                 get_request_plot_units, plot_data_response
+
+
+class PlotDataTest(TestCase):
+
+    def test_compact(self):
+        """
+        Test rounding plot data to plain floats
+        """
+        self.assertEqual(compact(np.array([[1.23456789, 2e-20], [np.nan, np.inf]])), [[1.23457, 2e-20], [None, None]])
+        self.assertEqual(json.dumps(compact([np.float64(300.0)])), '[300.0]')
+
+    def test_format_plot_variables(self):
+        """
+        Test writing plot data as JavaScript variables
+        """
+        self.assertEqual(format_plot_variables({'Tlist': [300.0, 400.0], 'Tunits': 'K'}),
+                         'Tlist = [300.0,400.0];\nTunits = "K";\n')
+
+    def test_plot_series_identity(self):
+        """
+        Test that models without a proper representation are not cached
+        """
+        calls = []
+
+        def generate(model):
+            calls.append(model)
+            return {'Tlist': [300.0]}
+
+        model = object()
+        get_plot_series('test', model, {}, generate)
+        get_plot_series('test', model, {}, generate)
+        self.assertEqual(len(calls), 2)
+
+    def test_request_plot_units(self):
+        """
+        Test reading plot units from query parameters
+        """
+        factory = RequestFactory()
+        defaults = {'Tunits': 'K', 'Punits': 'Pa'}
+        self.assertEqual(get_request_plot_units(factory.get('/', {'Punits': 'bar'}), defaults),
+                         {'Tunits': 'K', 'Punits': 'bar'})
+        self.assertIsNone(get_request_plot_units(factory.get('/', {'Punits': 'psi'}), defaults))
+
+    def test_plot_data_response(self):
+        """
+        Test the caching headers of plot data responses
+        """
+        factory = RequestFactory()
+        series = {'Tlist': [300.0], 'Tunits': 'K'}
+
+        response = plot_data_response(factory.get('/', {'v': 'abc'}), series, 'abc')
+        self.assertEqual(json.loads(response.content), series)
+        self.assertEqual(response['Cache-Control'], 'public, max-age={0}'.format(PLOT_DATA_MAX_AGE))
+
+        response = plot_data_response(factory.get('/', {'v': 'old'}, HTTP_IF_NONE_MATCH=response['ETag']),
+                                      series, 'abc')
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('max-age=0', response['Cache-Control'])
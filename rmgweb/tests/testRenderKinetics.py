@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import numpy as np
+from django.test import TestCase
+from rmgpy.kinetics import Arrhenius, Chebyshev, MultiArrhenius, PDepArrhenius
+
+from rmgweb.main.templatetags.render_kinetics import getRateCoefficientUnits, get_rate_coefficient_array, \
+                                                     reconstruct_rate_units
+
+
+class RateCoefficientArrayTest(TestCase):
+
+    def setUp(self):
+        self.Tlist = np.array([300.0, 500.0, 1000.0, 1500.0, 2000.0])
+        self.Plist = np.array([1e3, 1e4, 1e5, 1e6, 1e7])
+
+    def check_grid(self, kinetics):
+        """
+        Check the vectorized rate coefficients against point by point evaluation
+        """
+        kdata = get_rate_coefficient_array(kinetics, self.Tlist, self.Plist)
+        self.assertEqual(kdata.shape, (len(self.Plist), len(self.Tlist)))
+        for i, P in enumerate(self.Plist):
+            for j, T in enumerate(self.Tlist):
+                self.assertAlmostEqual(kdata[i, j] / kinetics.get_rate_coefficient(T, P), 1.0, 6)
+
+    def test_arrhenius(self):
+        """
+        Test vectorized evaluation of Arrhenius and MultiArrhenius kinetics
+        """
+        arrhenius = Arrhenius(A=(1.0e6, 'cm^3/(mol*s)'), n=1.5, Ea=(10.0, 'kJ/mol'), T0=(1, 'K'))
+        other = Arrhenius(A=(2.0e12, 'cm^3/(mol*s)'), n=0.0, Ea=(40.0, 'kJ/mol'), T0=(1, 'K'))
+        for kinetics in [arrhenius, MultiArrhenius(arrhenius=[arrhenius, other])]:
+            kdata = get_rate_coefficient_array(kinetics, self.Tlist)
+            for k, T in zip(kdata, self.Tlist):
+                self.assertAlmostEqual(k / kinetics.get_rate_coefficient(T), 1.0, 6)
+
+    def test_pdep_arrhenius(self):
+        """
+        Test vectorized evaluation of PDepArrhenius kinetics
+        """
+        kinetics = PDepArrhenius(
+            pressures=([0.1, 10.0], 'bar'),
+            arrhenius=[
+                Arrhenius(A=(1.0e6, 's^-1'), n=1.0, Ea=(10.0, 'kJ/mol'), T0=(1, 'K')),
+                Arrhenius(A=(1.0e8, 's^-1'), n=0.5, Ea=(15.0, 'kJ/mol'), T0=(1, 'K')),
+            ],
+        )
+        self.check_grid(kinetics)
+
+    def test_chebyshev(self):
+        """
+        Test vectorized evaluation of Chebyshev kinetics
+        """
+        kinetics = Chebyshev(
+            coeffs=[[11.67, 0.3, -0.02], [-0.55, 0.28, 0.01], [-0.1, 0.05, 0.002]],
+            kunits='cm^3/(mol*s)',
+            Tmin=(300, 'K'), Tmax=(2000, 'K'), Pmin=(0.01, 'bar'), Pmax=(100, 'bar'),
+        )
+        self.check_grid(kinetics)
+
+
+class RateUnitsTest(TestCase):
+
+    def test_reconstruct_rate_units(self):
+        """
+        Test reconstructing rate coefficient units in other base units
+        """
+        self.assertEqual(reconstruct_rate_units('m^6/(mol^2*s)', 'cm^3,molecule,s'), 'cm^6/(molecule^2*s)')
+        self.assertEqual(reconstruct_rate_units('s^-1', 'cm^3,mol,s', add_conc_dim=True), 'cm^3/(mol*s)')
+        # Memoized results are returned for repeated arguments
+        hits = reconstruct_rate_units.cache_info().hits
+        reconstruct_rate_units('s^-1', 'cm^3,mol,s', add_conc_dim=True)
+        self.assertEqual(reconstruct_rate_units.cache_info().hits, hits + 1)
+
+    def test_pdep_rate_units(self):
+        """
+        Test that pressure dependent kinetics are given in the desired units
+        """
+        arrhenius = Arrhenius(A=(1.0e6, 'm^3/(mol*s)'), n=0, Ea=(0, 'kJ/mol'), T0=(1, 'K'))
+        kinetics = PDepArrhenius(pressures=([0.1, 10.0], 'bar'), arrhenius=[arrhenius, arrhenius])
+        self.assertEqual(getRateCoefficientUnits(kinetics, desired_units='cm^3,mol,s'),
+                         getRateCoefficientUnits(arrhenius, desired_units='cm^3,mol,s'))
+        self.assertEqual(getRateCoefficientUnits(kinetics, desired_units='cm^3,mol,s')[0], 'cm^3/(mol*s)')
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import numpy as np
+from django.test import TestCase
+from rmgpy.statmech import Conformer, HarmonicOscillator, HinderedRotor, IdealGasTranslation, NonlinearRotor
+
+from rmgweb.main.templatetags.render_states import STATES_PHILIST, STATES_TLIST, get_partition_function_array, \
+                                                   get_rotor_potential_array, get_states_series
+
+
+class StatesArrayTest(TestCase):
+
+    def setUp(self):
+        self.cosine_rotor = HinderedRotor(inertia=(1.56764, 'amu*angstrom^2'), symmetry=3, barrier=(11.373, 'kJ/mol'),
+                                          semiclassical=True)
+        self.fourier_rotor = HinderedRotor(inertia=(1.56764, 'amu*angstrom^2'), symmetry=3,
+                                           fourier=([[-0.5, 1.0, -2.0], [0.1, 0.0, -0.3]], 'kJ/mol'))
+        self.conformer = Conformer(
+            E0=(0, 'kJ/mol'),
+            modes=[
+                IdealGasTranslation(mass=(30.0469, 'amu')),
+                NonlinearRotor(inertia=([6.27, 25.4, 25.4], 'amu*angstrom^2'), symmetry=6),
+                HarmonicOscillator(frequencies=([821, 1102, 1380, 1388, 2897, 2969, 3002], 'cm^-1')),
+                self.cosine_rotor,
+            ],
+            spin_multiplicity=2,
+            optical_isomers=1,
+        )
+
+    def test_partition_function(self):
+        """
+        Test that the partition function matches evaluation at each temperature
+        """
+        Qlist = get_partition_function_array(self.conformer, STATES_TLIST)
+        expected = [self.conformer.get_partition_function(T) for T in STATES_TLIST]
+        self.assertTrue(np.allclose(Qlist, expected, rtol=1e-6))
+
+    def test_rotor_potential(self):
+        """
+        Test that rotor potentials match evaluation at each angle
+        """
+        for rotor in [self.cosine_rotor, self.fourier_rotor]:
+            Vlist = get_rotor_potential_array(rotor, STATES_PHILIST)
+            expected = [rotor.get_potential(phi) for phi in STATES_PHILIST]
+            self.assertTrue(np.allclose(Vlist, expected, rtol=1e-6, atol=1e-6))
+
+    def test_states_series(self):
+        """
+        Test converting the states data to other units
+        """
+        series = get_states_series(self.conformer, Tunits='K', Eunits='kJ/mol')
+        self.assertEqual(len(series['Tlist']), len(STATES_TLIST))
+        self.assertEqual(len(series['Vlist']), 1)
+        self.assertAlmostEqual(max(series['Vlist'][0]), 11.373, 3)
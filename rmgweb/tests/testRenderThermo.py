@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import numpy as np
+from django.test import TestCase
+from rmgpy.thermo import NASA, NASAPolynomial, ThermoData, Wilhoit
+
+from rmgweb.main.templatetags.render_thermo import get_thermo_arrays, get_thermo_series, get_thermo_temperatures
+
+
+class ThermoArrayTest(TestCase):
+
+    def setUp(self):
+        self.thermo_data = ThermoData(
+            Tdata=([300, 400, 500, 600, 800, 1000, 1500], 'K'),
+            Cpdata=([3.4, 3.9, 4.5, 5.1, 6.0, 6.6, 7.5], 'cal/(mol*K)'),
+            H298=(-2.3, 'kcal/mol'),
+            S298=(50.2, 'cal/(mol*K)'),
+        )
+        self.wilhoit = Wilhoit(
+            Cp0=(4.0 * 8.314472, 'J/(mol*K)'), CpInf=(21.5 * 8.314472, 'J/(mol*K)'),
+            a0=0.0977518, a1=-16.3067, a2=26.2524, a3=-12.7586, B=(1068.68, 'K'),
+            H0=(-94088.8, 'J/mol'), S0=(-118.535, 'J/(mol*K)'),
+        )
+        self.nasa = NASA(
+            polynomials=[
+                NASAPolynomial(coeffs=[4.03055, -0.00214171, 4.90611e-05, -5.99027e-08, 2.38945e-11, -11257.6, 3.5613],
+                               Tmin=(100, 'K'), Tmax=(1000, 'K')),
+                NASAPolynomial(coeffs=[-0.307954, 0.0245269, -1.2413e-05, 3.07724e-09, -3.01467e-13, -10693, 22.628],
+                               Tmin=(1000, 'K'), Tmax=(3000, 'K')),
+            ],
+            Tmin=(300, 'K'),
+            Tmax=(3000, 'K'),
+        )
+
+    def test_thermo_arrays(self):
+        """
+        Test that the thermo arrays match evaluation at each temperature
+        """
+        for thermo in [self.thermo_data, self.wilhoit, self.nasa]:
+            data = get_thermo_arrays(thermo)
+            Tlist = get_thermo_temperatures(thermo)
+            self.assertEqual(data['Tlist'], list(Tlist))
+            for name, method in [('Cplist', thermo.get_heat_capacity), ('Hlist', thermo.get_enthalpy),
+                                 ('Slist', thermo.get_entropy), ('Glist', thermo.get_free_energy)]:
+                expected = [method(T) for T in Tlist]
+                self.assertTrue(np.allclose(data[name], expected, rtol=1e-5, atol=1.0), name)
+
+    def test_thermo_series(self):
+        """
+        Test converting the thermo data to other units
+        """
+        series = get_thermo_series(self.nasa, Tunits='K', Cpunits='J/(mol*K)', Hunits='kJ/mol')
+        self.assertEqual(series['Gunits'], 'kJ/mol')
+        self.assertAlmostEqual(series['Hlist'][0], self.nasa.get_enthalpy(300) / 1000., 3)
+        self.assertAlmostEqual(series['Cplist'][-1], self.nasa.get_heat_capacity(3000), 2)
+
+    def test_incomplete_thermo(self):
+        """
+        Test that incomplete thermo data give no series
+        """
+        self.assertEqual(get_thermo_series(ThermoData(H298=(-2.3, 'kcal/mol'))), {})
@@ -28,7 +28,13 @@
 #                                                                             #
 ###############################################################################
 
+import numpy as np
 from django.test import TestCase
+from rmgpy.molecule import Group, Molecule
+
+from rmgweb.database.search import LABEL_SECTIONS, LabelIndex, get_atomtype_element, get_fingerprint, \
+                                   get_group_features, get_molecule_features, get_similarity_fingerprint, popcount
+from rmgweb.database.tools import database
 
 
 class KineticsTest(TestCase):
@@ -206,3 +212,76 @@ multiplicity 2
                                                                    'product2': product2})
 
         self.assertEqual(response.status_code, 302)
+
+
+class SubstructureFingerprintTest(TestCase):
+
+    def test_atomtype_element(self):
+        """
+        Test getting the element of group atom types
+        """
+        self.assertEqual(get_atomtype_element('Cd'), 'C')
+        self.assertEqual(get_atomtype_element('Cs'), 'C')
+        self.assertEqual(get_atomtype_element('Cl1s'), 'Cl')
+        self.assertEqual(get_atomtype_element('O2s'), 'O')
+        self.assertIsNone(get_atomtype_element('R!H'))
+        self.assertIsNone(get_atomtype_element('Val4'))
+
+    def test_group_features(self):
+        """
+        Test that molecules containing a group have all of its fingerprint bits
+        """
+        group = Group().from_adjacency_list("""
+1 * C u0 {2,D} {3,S}
+2   O u0 {1,D}
+3   R!H u0 {1,S}
+""")
+        query = get_fingerprint(get_group_features(group))
+        for smiles in ['CC=O', 'CC(=O)O', 'CC(=O)C']:
+            fingerprint = get_fingerprint(get_molecule_features(Molecule().from_smiles(smiles)))
+            self.assertTrue(((fingerprint & query) == query).all())
+        self.assertFalse(get_group_features(group) <= get_molecule_features(Molecule().from_smiles('CCO')))
+
+
+class SimilarityFingerprintTest(TestCase):
+
+    def test_similarity_fingerprint(self):
+        """
+        Test that similar molecules share more fingerprint bits than dissimilar ones
+        """
+        ethanol = get_similarity_fingerprint(Molecule().from_smiles('CCO'))
+        propanol = get_similarity_fingerprint(Molecule().from_smiles('CCCO'))
+        benzene = get_similarity_fingerprint(Molecule().from_smiles('c1ccccc1'))
+        fingerprints = np.array([ethanol, propanol, benzene])
+
+        common = popcount(fingerprints & ethanol)
+        self.assertEqual(common[0], popcount(fingerprints)[0])
+        self.assertGreater(common[1], common[2])
+
+
+class LabelIndexTest(TestCase):
+
+    def test_complete(self):
+        """
+        Test that label completion matches prefixes and ranks exact and common labels first
+        """
+        methane = Molecule().from_smiles('C')
+        ethane = Molecule().from_smiles('CC')
+        methanol = Molecule().from_smiles('CO')
+        labels = {
+            LABEL_SECTIONS[0]: {'CH4': [1, methane], 'CH3OH': [1, methanol], 'C2H6': [1, ethane]},
+            LABEL_SECTIONS[3]: {'CH3OH': [3, methanol], 'ch4': [1, methane]},
+        }
+        index = LabelIndex()
+        for component, section in LABEL_SECTIONS:
+            token = database.get_section_token(component, section)
+            index.parts[(component, section)] = (token, labels.get((component, section), {}))
+        index.merge()
+
+        results = index.complete('ch')
+        self.assertEqual([label for label, adjlist, count in results], ['CH3OH', 'CH4', 'ch4'])
+        self.assertEqual(results[0][2], 4)
+        self.assertTrue(Molecule().from_adjacency_list(results[0][1]).is_isomorphic(methanol))
+        self.assertEqual([label for label, adjlist, count in index.complete('CH4 ')], ['CH4', 'ch4'])
+        self.assertEqual([label for label, adjlist, count in index.complete('c2', limit=1)], ['C2H6'])
+        self.assertEqual(index.complete('N'), [])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+from unittest import mock
+
+from django.test import TestCase
+
+from rmgweb.database.views import _solvation_estimator_batch
+
+
+def get_response(result):
+    """
+    Return a mock response of the solvation service with the JSON `result`.
+    """
+    response = mock.Mock()
+    response.json.return_value = result
+    return response
+
+
+class SolvationEstimatorBatchTest(TestCase):
+
+    def setUp(self):
+        self.pairs = [['O', 'CCO'], ['O', 'invalid'], ['CCCCCC', 'CCO']]
+
+    @mock.patch('rmgweb.database.views.requests.post')
+    def test_all_pairs(self, post):
+        """
+        Test mapping a prediction for every pair back to the pairs
+        """
+        post.return_value = get_response({'avg_pred': [-5.0, None, -3.0], 'epi_unc': [0.1, None, 0.2],
+                                          'valid_indices': [0, 2]})
+        estimates = _solvation_estimator_batch('dGsolv', self.pairs + [['O', 'CCO']])
+        self.assertEqual(post.call_count, 1)
+        self.assertTrue(post.call_args[0][0].endswith('/dGsolv_estimator_batch'))
+        self.assertEqual(post.call_args[1]['json'], {'pairs': [('O', 'CCO'), ('O', 'invalid'), ('CCCCCC', 'CCO')]})
+        self.assertEqual(estimates, {('O', 'CCO'): (-5.0, 0.1), ('CCCCCC', 'CCO'): (-3.0, 0.2)})
+
+    @mock.patch('rmgweb.database.views.requests.post')
+    def test_valid_pairs(self, post):
+        """
+        Test mapping predictions for the valid pairs only back through their indices
+        """
+        post.return_value = get_response({'avg_pred': [-5.0, -3.0], 'epi_unc': [0.1, 0.2], 'valid_indices': [0, 2]})
+        estimates = _solvation_estimator_batch('dHsolv', self.pairs)
+        self.assertTrue(post.call_args[0][0].endswith('/dHsolv_estimator_batch'))
+        self.assertEqual(estimates, {('O', 'CCO'): (-5.0, 0.1), ('CCCCCC', 'CCO'): (-3.0, 0.2)})
+
+    @mock.patch('rmgweb.database.views.requests.post')
+    def test_fallback(self, post):
+        """
+        Test falling back to one request per pair when the batch request fails
+        """
+        def respond(url, json):
+            if url.endswith('_batch'):
+                raise ValueError('Batch requests are not supported.')
+            if json['solute_smiles'] == 'invalid':
+                return get_response({'avg_pred': [], 'epi_unc': [], 'valid_indices': []})
+            return get_response({'avg_pred': [len(json['solvent_smiles']) * -1.0], 'epi_unc': [0.1],
+                                 'valid_indices': [0]})
+
+        post.side_effect = respond
+        estimates = _solvation_estimator_batch('dGsolv', self.pairs)
+        self.assertEqual(post.call_count, 4)
+        self.assertEqual(estimates, {('O', 'CCO'): (-1.0, 0.1), ('CCCCCC', 'CCO'): (-6.0, 0.1)})
+
+    def test_no_pairs(self):
+        """
+        Test that no request is made without any pairs
+        """
+        with mock.patch('rmgweb.database.views.requests.post') as post:
+            self.assertEqual(_solvation_estimator_batch('dGsolv', []), {})
+            post.assert_not_called()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+###############################################################################
+#                                                                             #
+# RMG Website - A Django-powered website for Reaction Mechanism Generator     #
+#                                                                             #
+# Copyright (c) 2011-2018 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.test import TestCase
+
+from rmgweb.main.models import UserProfile
+from rmgweb.main.units import UnitPreferences, get_unit_preferences
+
+
+class UnitPreferencesTest(TestCase):
+
+    def test_anonymous_user(self):
+        """
+        Test that anonymous users get the default units
+        """
+        unit_preferences = get_unit_preferences(AnonymousUser())
+        self.assertEqual(unit_preferences.get_units({'Tunits': 'K', 'Eunits': 'J/mol'}),
+                         {'Tunits': 'K', 'Eunits': 'J/mol'})
+        self.assertAlmostEqual(unit_preferences.get_factor('kJ/mol'), 0.001)
+
+    def test_logged_in_user(self):
+        """
+        Test that the profile of a logged in user is only looked up once
+        """
+        user = User.objects.create_user('testuser', email='rmg_dev@mit.edu', password='12345678')
+        UserProfile.objects.create(user=user, energy_units='kJ/mol')
+        with self.assertNumQueries(1):
+            unit_preferences = get_unit_preferences(user)
+            self.assertIs(get_unit_preferences(user), unit_preferences)
+            self.assertIs(get_unit_preferences(unit_preferences), unit_preferences)
+        self.assertIsInstance(unit_preferences, UnitPreferences)
+        self.assertEqual(unit_preferences.get_units({'Hunits': 'kcal/mol', 'Punits': 'Pa'}),
+                         {'Hunits': 'kJ/mol', 'Punits': 'bar'})
@@ -106,6 +106,7 @@ urlpatterns = [
     re_path(r'^pdep/', include("rmgweb.pdep.urls")),
 
     # Molecule drawing
+    re_path(r'^structures$', rmgweb.main.views.drawStructures, name='draw-structures'),
     re_path(r'^molecule/(?P<adjlist>[\S\s]+)/(?P<format>\w+)$', rmgweb.main.views.drawMolecule, name='draw-molecule'),
     re_path(r'^molecule/(?P<adjlist>[\S\s]+)$', rmgweb.main.views.drawMolecule, name='draw-molecule'),
     re_path(r'^group/(?P<adjlist>[\S\s]+)/(?P<format>\w+)$', rmgweb.main.views.drawGroup, name='draw-group'),